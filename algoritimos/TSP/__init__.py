@@ -1,3 +1,6 @@
 from .genetic_algorithm import GeneticAlgorithm
 from .ant_colony import AntColony
-from .hill_climbing import HillClimbing
\ No newline at end of file
+from .hill_climbing import HillClimbing
+from .simulated_annealing import SimulatedAnnealing
+from .tabu_search import TabuSearch
+from .held_karp import HeldKarp
\ No newline at end of file
@@ -1,27 +1,51 @@
 import random
-from typing import List
+from typing import Iterator, List, Optional
 from util.TSP.tsp_problem import TSPProblem
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER, Profiler
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+from algoritimos.TSP.construction import construct, warm_start
+from algoritimos.TSP.local_search import repair
 
 
 class AntColony:
     def __init__(self, problem: TSPProblem, num_ants: int = 10,
                  evaporation_rate: float = 0.5, alpha: float = 1,
-                 beta: float = 2, iterations: int = 50):
+                 beta: float = 2, iterations: int = 50,
+                 initial_heuristic: Optional[str] = 'nearest_neighbor', initial_route: Optional[List[str]] = None,
+                 max_evaluations: Optional[int] = None, time_limit: Optional[float] = None,
+                 target: Optional[float] = None, profiler: Optional[Profiler] = None,
+                 gap: Optional[float] = None, lower_bound: Optional[float] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 10):
         self.problem = problem
         self.num_ants = num_ants
         self.evaporation_rate = evaporation_rate
         self.alpha = alpha
         self.beta = beta
         self.iterations = iterations
-        self.convergence_data = []
+        # Constructive tour that sets the initial best and pheromone level (None = uniform 1.0)
+        self.initial_heuristic = initial_heuristic
+        # Previous tour to warm-start from instead (repaired and improved, see construction.warm_start)
+        self.initial_route = initial_route
+        self.convergence = ConvergenceRecorder()  # (iteration, evaluations, time, best)
+        self.tracker = RunTracker(max_evaluations, time_limit, target, gap, lower_bound)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+
+        # Run state (saved in checkpoints)
+        self._iteration = 0
+        self._best_solution: Optional[List[str]] = None
+        self._best_distance = float('inf')
 
         # Initialize pheromones
-        self.pheromones = {}
-        for city1 in self.problem.cities:
-            self.pheromones[city1] = {}
-            for city2 in self.problem.cities:
-                if city1 != city2 and self.problem.get_direct_distance(city1, city2) != float('inf'):
-                    self.pheromones[city1][city2] = 1.0
+        with self.profiler.phase('init'):
+            self.pheromones = {}
+            for city1 in self.problem.cities:
+                self.pheromones[city1] = {}
+                for city2 in self.problem.cities:
+                    if city1 != city2 and self.problem.get_direct_distance(city1, city2) != float('inf'):
+                        self.pheromones[city1][city2] = 1.0
 
     def _construct_solution(self) -> List[str]:
         """Construct solution using pheromone-guided exploration"""
@@ -30,7 +54,8 @@ class AntColony:
 
         while len(visited) < len(self.problem.cities):
             current = solution[-1]
-            unvisited = set(self.problem.cities) - visited
+            # Iterate in problem order: set order depends on the hash seed
+            unvisited = [city for city in self.problem.cities if city not in visited]
             reachable = [city for city in unvisited
                          if self.problem.get_direct_distance(current, city) != float('inf')]
 
@@ -39,6 +64,7 @@ class AntColony:
                 closest = min(unvisited,
                               key=lambda x: self.problem.get_direct_distance(current, x))
                 # Reconstruct path to closest city
+                self.profiler.count('dead_ends')
                 path = self._find_path_between(current, closest)
                 solution.extend(path[1:])  # Skip first as it's current
                 visited.update(path)
@@ -48,7 +74,11 @@ class AntColony:
                 solution.append(next_city)
                 visited.add(next_city)
 
-        return solution
+        # Dead ends and the closing edge may use missing edges: fix them like construct() does
+        tour = self.problem.to_int_tour(solution)
+        if repair(tour, self.problem.int_weights, self.problem.neighbor_lists, rng=random):
+            return solution  # Still infeasible: evaluates to inf
+        return self.problem.to_city_tour(tour)
 
     def _find_path_between(self, start: str, end: str) -> List[str]:
         """Reconstruct path using shortest path matrix"""
@@ -80,7 +110,36 @@ class AntColony:
 
         return candidates[-1]
 
-    def _update_pheromones(self, solutions: List[List[str]]):
+    def _evaluate(self, route: List[str]) -> float:
+        """Evaluate a route, counting it in the run tracker"""
+        with self.profiler.phase('evaluation'):
+            distance = self.problem.path_distance(route)
+        self.tracker.count()
+        self.tracker.update(distance)
+        return distance
+
+    def _seed(self):
+        """
+        Start from a constructive (or warm-started) tour: it becomes the best
+        solution so far, sets every trail to tau0 = num_ants / C (the level the
+        colony's own deposits settle around) and deposits as much again on its
+        own edges, so the first ants are biased towards it
+        """
+        with self.profiler.phase('init'):
+            if self.initial_route is not None:
+                tour = warm_start(self.problem, self.initial_route)
+            else:
+                tour = construct(self.problem, self.initial_heuristic)
+        solution = self.problem.to_city_tour(tour)
+        distance = self._evaluate(solution)
+        tau0 = self.num_ants / distance
+        for trails in self.pheromones.values():
+            for city in trails:
+                trails[city] = tau0
+        self._deposit(solution, tau0)
+        self._best_solution, self._best_distance = solution, distance
+
+    def _update_pheromones(self, solutions: List[List[str]], distances: List[float]):
         """Update pheromone trails"""
         # Evaporation
         for city1 in self.pheromones:
@@ -88,8 +147,7 @@ class AntColony:
                 self.pheromones[city1][city2] *= (1 - self.evaporation_rate)
 
         # Add new pheromones
-        for solution in solutions:
-            distance = self.problem.path_distance(solution)
+        for solution, distance in zip(solutions, distances):
             if distance == float('inf'):
                 continue
 
@@ -100,22 +158,109 @@ class AntColony:
                 if city2 in self.pheromones[city1]:
                     self.pheromones[city1][city2] += pheromone_amount
 
+    def _deposit(self, route: List[str], amount: float):
+        for i in range(len(route)):
+            city1, city2 = route[i], route[(i + 1) % len(route)]
+            if city2 in self.pheromones[city1]:
+                self.pheromones[city1][city2] += amount
+
+    def adopt_incumbent(self, route: List[str], distance: float):
+        """
+        Best-deposit (see util/TSP/portfolio.py): lay pheromone on the received
+        tour as strongly as the whole colony would (num_ants / C) and take it as
+        the best solution if it beats the current one
+        """
+        self._deposit(route, self.num_ants / distance)
+        if distance < self._best_distance:
+            self._best_solution, self._best_distance = list(route), distance
+            self.tracker.update(distance)
+
+    def _get_state(self) -> dict:
+        return {
+            'problem': self.problem.fingerprint(),
+            'iteration': self._iteration,
+            'pheromones': self.pheromones,
+            'best_solution': self._best_solution,
+            'best_distance': self._best_distance,
+            'convergence': self.convergence.get_state(),
+            'tracker': self.tracker.get_state(),
+        }
+
+    def _set_state(self, state: dict):
+        if state['problem'] != self.problem.fingerprint():
+            raise ValueError("Checkpoint belongs to a different problem instance")
+        self._iteration = state['iteration']
+        self.pheromones = state['pheromones']
+        self._best_solution = state['best_solution']
+        self._best_distance = state['best_distance']
+        self.convergence.set_state(state['convergence'])
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path: str) -> List[str]:
+        """Continue a run from a checkpoint written by solve()"""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.result()
+
     def solve(self) -> List[str]:
-        best_solution = None
-        best_distance = float('inf')
+        for _ in self.solve_iter():
+            pass
+        return self.result()
+
+    def result(self) -> List[str]:
+        """Best tour found so far (including adopted incumbents)"""
+        return self._best_solution
+
+    def solve_iter(self, resume: Optional[str] = None) -> Iterator[dict]:
+        """
+        Run the colony yielding one snapshot per iteration (iteration, best_cost,
+        best_solution, evaluations, elapsed). Stopping the iteration stops the
+        search; `resume` continues from a checkpoint.
+        """
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self._best_solution = None
+            self._best_distance = float('inf')
+            self._iteration = 0
+            self.tracker.start()
+            # Gap-based stop: compute the lower bound unless one was given
+            if self.tracker.gap is not None and self.tracker.lower_bound is None:
+                from util.TSP.bounds import held_karp_bound  # needs scipy; only for the gap stop
+                with self.profiler.phase('bound'):
+                    self.tracker.lower_bound = held_karp_bound(self.problem)
+            if self.initial_heuristic is not None or self.initial_route is not None:
+                self._seed()
+
+        while self._iteration < self.iterations:
+            if self.tracker.should_stop():
+                break
+
+            # Re-read every iteration: adopt_incumbent may change the best between iterations
+            best_solution, best_distance = self._best_solution, self._best_distance
 
-        for _ in range(self.iterations):
             solutions = []
+            distances = []
             for _ in range(self.num_ants):
-                solution = self._construct_solution()
-                distance = self.problem.path_distance(solution)
+                with self.profiler.phase('construction'):
+                    solution = self._construct_solution()
+                distance = self._evaluate(solution)
                 solutions.append(solution)
+                distances.append(distance)
 
                 if distance < best_distance:
                     best_solution = solution
                     best_distance = distance
 
-            self._update_pheromones(solutions)
-            self.convergence_data.append(best_distance)
+            with self.profiler.phase('pheromone_update'):
+                self._update_pheromones(solutions, distances)
+            self._best_solution, self._best_distance = best_solution, best_distance
+            self._iteration += 1
+            self.convergence.record(self._iteration, self.tracker.evaluations, self.tracker.elapsed,
+                                    best_distance)
+            self.checkpointer.maybe_save(type(self).__name__, self._iteration, self._get_state)
+            yield self.tracker.snapshot(self._iteration, best_distance, best_solution)
 
-        return best_solution
\ No newline at end of file
+        self.tracker.finish()
\ No newline at end of file
@@ -0,0 +1,341 @@
+"""
+Heurísticas construtivas para rotas iniciais em grafos esparsos.
+
+Todas trabalham sobre a visão de inteiros de TSPProblem (int_weights e
+neighbor_lists), usam só as listas de vizinhos e heaps e devolvem rotas de
+inteiros começando na cidade inicial. Quando a heurística fica sem aresta
+existente para continuar, ela aceita uma aresta inválida e segue em frente;
+construct() então corrige a rota com repair() (ver local_search.py). As
+complexidades abaixo são as das heurísticas: o repair() só roda se a rota
+tiver arestas inválidas e custa de acordo com quantas são e com o grafo (em
+geral dezenas de passos por aresta).
+
+- nearest_neighbor: vizinho mais próximo não visitado, O(N·grau) (com `rng`,
+  sorteia entre os `candidates` mais próximos, para gerar rotas diversas)
+- greedy_edge: arestas em ordem crescente de peso formando caminhos, O(E log E)
+- cheapest_insertion / farthest_insertion: inserção sobre lista ligada com
+  heap de candidatos preguiçoso, O(E log E)
+- space_filling_curve: ordem da curva de Hilbert das coordenadas, O(N log N)
+
+warm_start() parte de uma rota anterior em vez de construir uma: depois de
+mudanças em algumas arestas (ver TSPProblem.set_weight/add_edge/remove_edge)
+corrige a rota e a melhora só em volta do que mudou.
+"""
+import heapq
+import random
+from typing import Callable, Dict, Iterable, List, Optional
+
+from util.TSP.tsp_problem import TSPProblem
+from algoritimos.TSP.local_search import improve, repair
+
+INF = float('inf')
+
+
+def nearest_neighbor(weights: List[Dict[int, float]], neighbors: List[List[int]], start: int,
+                     rng=None, candidates: int = 3) -> List[int]:
+    """Vizinho mais próximo; num beco sem saída volta pela rota até achar um vizinho livre"""
+    n = len(weights)
+    visited = [False] * n
+    visited[start] = True
+    tour = [start]
+    for _ in range(n - 1):
+        current = tour[-1]
+        free = [c for c in neighbors[current] if not visited[c]][:candidates if rng else 1]
+        if free:
+            city = free[rng.randrange(len(free))] if rng else free[0]
+        else:
+            # Beco sem saída: a próxima aresta será inválida
+            city = next((c for back in reversed(tour) for c in neighbors[back] if not visited[c]),
+                        None)
+            if city is None:
+                city = visited.index(False)
+        visited[city] = True
+        tour.append(city)
+    return tour
+
+
+def _tour_from_links(links: List[List[int]], start: int) -> List[int]:
+    """Percorre o ciclo descrito pelas listas de adjacência (grau 2) a partir de start"""
+    tour = [start]
+    previous, current = start, links[start][0]
+    while current != start:
+        tour.append(current)
+        a, b = links[current]
+        previous, current = current, (b if a == previous else a)
+    return tour
+
+
+def greedy_edge(weights: List[Dict[int, float]], neighbors: List[List[int]], start: int) -> List[int]:
+    """
+    Emparelhamento guloso: aceita as arestas da mais curta para a mais longa
+    quando as duas pontas têm grau < 2 e não fecham um ciclo prematuro. Os
+    caminhos que sobram são ligados pelas pontas, com arestas existentes
+    quando possível.
+    """
+    n = len(weights)
+    edges = sorted((w, a, b) for a in range(n) for b, w in weights[a].items() if a < b)
+    links: List[List[int]] = [[] for _ in range(n)]
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def link(a, b):
+        links[a].append(b)
+        links[b].append(a)
+        parent[find(a)] = find(b)
+
+    accepted = 0
+    for _, a, b in edges:
+        if len(links[a]) < 2 and len(links[b]) < 2 and find(a) != find(b):
+            link(a, b)
+            accepted += 1
+            if accepted == n - 1:
+                break
+
+    # Liga os fragmentos restantes (cidades isoladas contam como caminhos de uma cidade).
+    # As pontas (grau < 2) ficam em ordem crescente numa lista duplamente encadeada com
+    # sentinela n; uma cidade que chega a grau 2 sai dela em O(1)
+    after, before = [n] * (n + 1), [n] * (n + 1)
+    previous = n
+    for c in range(n):
+        if len(links[c]) < 2:
+            after[previous], before[c] = c, previous
+            previous = c
+    after[previous], before[n] = n, previous
+
+    while accepted < n - 1:
+        a = after[n]
+        joined = next((b for b in neighbors[a] if len(links[b]) < 2 and find(a) != find(b)), None)
+        if joined is None:
+            joined = after[a]
+            while find(joined) == find(a):
+                joined = after[joined]
+        link(a, joined)
+        for c in (a, joined):
+            if len(links[c]) == 2:
+                after[before[c]], before[after[c]] = after[c], before[c]
+        accepted += 1
+
+    a, b = [c for c in range(n) if len(links[c]) < 2]
+    links[a].append(b)
+    links[b].append(a)
+    return _tour_from_links(links, start)
+
+
+def _insertion(weights: List[Dict[int, float]], neighbors: List[List[int]], start: int,
+               farthest: bool) -> List[int]:
+    """
+    Inserção sobre lista ligada (succ/pred). Uma cidade k só pode entrar entre
+    i e succ[i] se as duas arestas existirem; o custo é w(i,k) + w(k,j) - w(i,j),
+    com w(i,j) infinito para arestas inválidas (que assim são as primeiras a
+    serem desfeitas). Candidatos velhos no heap são descartados ao sair.
+    """
+    n = len(weights)
+    inserted = [False] * n
+    succ = [start] * n
+    pred = [start] * n
+    inserted[start] = True
+    remaining = n - 1
+
+    def best_position(k):
+        """Posição mais barata para k: (custo, i) com i vizinho de k já na rota"""
+        best = (INF, -1)
+        for i in neighbors[k]:
+            if not inserted[i]:
+                continue
+            for a, b in ((i, succ[i]), (pred[i], i)):
+                if a not in weights[k] or b not in weights[k] or (a == b and a != start):
+                    continue
+                cost = weights[a][k] + weights[k][b] - weights[a].get(b, INF if a != b else 0)
+                if cost < best[0]:
+                    best = (cost, a)
+        return best
+
+    heap = []  # Inserção mais barata: (custo, k, i, succ[i]); inserção mais distante: (-distância à rota, k)
+
+    def push(k):
+        if farthest:
+            distance = min(weights[k][i] for i in neighbors[k] if inserted[i])
+            heapq.heappush(heap, (-distance, k))
+        else:
+            cost, i = best_position(k)
+            if i >= 0:
+                heapq.heappush(heap, (cost, k, i, succ[i]))
+
+    for k in neighbors[start]:
+        push(k)
+
+    while remaining:
+        if heap:
+            entry = heapq.heappop(heap)
+            k = entry[1]
+            if inserted[k]:
+                continue
+            if farthest:
+                current = min(weights[k][i] for i in neighbors[k] if inserted[i])
+                if current != -entry[0]:
+                    heapq.heappush(heap, (-current, k))
+                    continue
+                _, i = best_position(k)
+            else:
+                i = entry[2]
+                if succ[i] != entry[3]:
+                    push(k)  # A aresta (i, j) não existe mais: recalcula
+                    continue
+        else:
+            # Nenhuma inserção viável: insere uma cidade adjacente à rota depois de um vizinho
+            k = next(c for c in range(n) if not inserted[c]
+                     and any(inserted[i] for i in neighbors[c]))
+            i = -1
+        if i < 0:
+            i = next(i for i in neighbors[k] if inserted[i])
+
+        j = succ[i]
+        succ[i], pred[k], succ[k], pred[j] = k, i, j, k
+        inserted[k] = True
+        remaining -= 1
+        # Posições novas (i, k) e (k, j) só servem a vizinhos de k; as entradas
+        # que apontavam para (i, j) são recalculadas quando saírem do heap
+        for c in neighbors[k]:
+            if not inserted[c]:
+                push(c)
+
+    tour = [start]
+    city = succ[start]
+    while city != start:
+        tour.append(city)
+        city = succ[city]
+    return tour
+
+
+def cheapest_insertion(weights: List[Dict[int, float]], neighbors: List[List[int]],
+                       start: int) -> List[int]:
+    """Insere sempre a cidade (adjacente à rota) com o menor aumento de custo"""
+    return _insertion(weights, neighbors, start, farthest=False)
+
+
+def farthest_insertion(weights: List[Dict[int, float]], neighbors: List[List[int]],
+                       start: int) -> List[int]:
+    """Insere primeiro a cidade mais distante da rota, na posição mais barata"""
+    return _insertion(weights, neighbors, start, farthest=True)
+
+
+def _hilbert_index(x, y, order: int):
+    """Índice na curva de Hilbert de ordem `order` para coordenadas inteiras (vetorizado)"""
+    import numpy as np
+
+    x, y = x.copy(), y.copy()
+    side = 1 << order
+    index = np.zeros(len(x), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        index += s * s * ((3 * rx) ^ ry)
+        # Rotaciona o quadrante para manter a curva contínua
+        rotate = ~ry
+        mirror = rotate & rx
+        x[mirror] = side - 1 - x[mirror]
+        y[mirror] = side - 1 - y[mirror]
+        x[rotate], y[rotate] = y[rotate], x[rotate]
+        s >>= 1
+    return index
+
+
+def space_filling_curve(coordinates, start: int, order: int = 16) -> List[int]:
+    """Visita as cidades na ordem da curva de Hilbert sobre as coordenadas"""
+    import numpy as np
+
+    points = np.asarray(coordinates, dtype=np.float64)
+    low = points.min(axis=0)
+    span = max(float((points.max(axis=0) - low).max()), 1e-12)
+    grid = ((points - low) / span * ((1 << order) - 1)).astype(np.int64)
+    curve = np.argsort(_hilbert_index(grid[:, 0], grid[:, 1], order), kind='stable').tolist()
+    k = curve.index(start)
+    return curve[k:] + curve[:k]
+
+
+HEURISTICS: Dict[str, Callable] = {
+    'nearest_neighbor': nearest_neighbor,
+    'greedy_edge': greedy_edge,
+    'cheapest_insertion': cheapest_insertion,
+    'farthest_insertion': farthest_insertion,
+    'space_filling_curve': space_filling_curve,
+}
+
+
+def available_heuristics(problem: TSPProblem) -> List[str]:
+    """Heurísticas aplicáveis à instância (a curva de Hilbert exige coordenadas)"""
+    return [name for name in HEURISTICS
+            if name != 'space_filling_curve' or problem.coordinates is not None]
+
+
+def construct(problem: TSPProblem, method: str = 'nearest_neighbor', rng=None,
+              max_repair_moves: Optional[int] = None) -> List[int]:
+    """
+    Constrói uma rota de inteiros com a heurística `method` e corrige arestas
+    inválidas com repair(). `rng` torna o vizinho mais próximo aleatorizado.
+    Lança ValueError se a rota não puder ser corrigida.
+    """
+    if method not in HEURISTICS:
+        raise ValueError(f"Heurística desconhecida: {method} (disponíveis: {', '.join(HEURISTICS)})")
+    start = problem.city_index[problem.start_city]
+    weights, neighbors = problem.int_weights, problem.neighbor_lists
+
+    if method == 'space_filling_curve':
+        if problem.coordinates is None:
+            raise ValueError("A curva de Hilbert exige coordenadas na instância")
+        tour = space_filling_curve(problem.coordinates, start)
+    elif method == 'nearest_neighbor':
+        tour = nearest_neighbor(weights, neighbors, start, rng)
+    else:
+        tour = HEURISTICS[method](weights, neighbors, start)
+
+    if repair(tour, weights, neighbors, max_repair_moves, rng or random.Random(0)):
+        raise ValueError(f"Não foi possível construir uma rota válida com {method}")
+    return tour
+
+
+def _tour_links(tour: List[int]) -> List[tuple]:
+    """Par de vizinhos na rota de cada cidade, sem sentido: muda só se uma aresta incidente mudar"""
+    links = [()] * len(tour)
+    for i, city in enumerate(tour):
+        a, b = tour[i - 1], tour[i + 1 if i + 1 < len(tour) else 0]
+        links[city] = (a, b) if a < b else (b, a)
+    return links
+
+
+def warm_start(problem: TSPProblem, route: List[str], changed: Optional[Iterable[str]] = None,
+               rng=None, max_repair_moves: Optional[int] = None) -> List[int]:
+    """
+    Rota de inteiros a partir de uma rota anterior (por exemplo, a melhor
+    antes de uma mudança de pesos): corrige com repair() as arestas que
+    deixaram de existir e aplica improve(). Com `changed` (cidades cujas
+    arestas mudaram), a busca local só começa por elas e pelas cidades que o
+    repair() moveu, o que custa milissegundos numa rota que já era um ótimo
+    local; sem `changed`, examina a rota inteira.
+    Lança ValueError se a rota não for uma permutação das cidades ou não
+    puder ser corrigida.
+    """
+    if len(route) != len(problem.cities) or set(route) != set(problem.cities):
+        raise ValueError("A rota anterior não visita todas as cidades da instância")
+    tour = problem.to_int_tour(route)
+    k = tour.index(problem.city_index[problem.start_city])
+    tour = tour[k:] + tour[:k]
+    weights, neighbors = problem.int_weights, problem.neighbor_lists
+
+    before = _tour_links(tour)
+    if repair(tour, weights, neighbors, max_repair_moves, rng or random.Random(0)):
+        raise ValueError("Não foi possível corrigir a rota anterior")
+
+    cities = None
+    if changed is not None:
+        after = _tour_links(tour)
+        moved = [city for city in range(len(tour)) if after[city] != before[city]]
+        cities = [problem.city_index[city] for city in changed] + moved
+    improve(tour, weights, neighbors, cities=cities)
+    return tour
@@ -1,68 +1,96 @@
+import math
 import random
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Tuple, Optional, Sequence, Union
 from util.TSP.tsp_problem import TSPProblem
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER, Profiler
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+from algoritimos.TSP.moves import OPERATORS, operator_mix, positions, tour_cost
+from algoritimos.TSP.local_search import improve
+from algoritimos.TSP.construction import available_heuristics, construct, warm_start
 
 
 class GeneticAlgorithm:
     def __init__(self, problem: TSPProblem, population_size: int = 50,
-                 mutation_rate: float = 0.01, generations: int = 100):
+                 mutation_rate: float = 0.2, generations: int = 100,
+                 mutation_operators: Union[Sequence[str], Dict[str, float]] = tuple(OPERATORS),
+                 memetic_rate: float = 0.0, local_search_moves: Optional[int] = 100,
+                 seed_heuristics: Optional[Sequence[str]] = None, initial_route: Optional[List[str]] = None,
+                 max_evaluations: Optional[int] = None, time_limit: Optional[float] = None,
+                 target: Optional[float] = None, profiler: Optional[Profiler] = None,
+                 gap: Optional[float] = None, lower_bound: Optional[float] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 10):
         self.problem = problem
         self.population_size = population_size
         self.mutation_rate = mutation_rate
         self.generations = generations
-        self.convergence_data = []
+        # Mix de operadores: lista de nomes (pesos iguais) ou {nome: peso}
+        self._operator_names, self._operator_weights = operator_mix(mutation_operators)
+        # Modo memético: fração dos filhos refinada por busca local (limitada a local_search_moves movimentos)
+        self.memetic_rate = memetic_rate
+        self.local_search_moves = local_search_moves
+        # Heurísticas construtivas que semeiam a população (None = todas as aplicáveis)
+        self.seed_heuristics = (available_heuristics(problem) if seed_heuristics is None
+                                else list(seed_heuristics))
+        self.initial_route = initial_route  # Rota anterior para partida a quente (ver construction.warm_start)
+        self.convergence = ConvergenceRecorder()  # (geração, avaliações, tempo, melhor)
+        self.tracker = RunTracker(max_evaluations, time_limit, target, gap, lower_bound)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+
+        # Estado da execução (salvo nos checkpoints)
+        self._generation = 0
+        self._population: List[List[str]] = []
+        self._distances: List[float] = []
+        self._best_individual: Optional[List[str]] = None
+        self._best_distance = float('inf')
 
     def _initialize_population(self) -> List[List[str]]:
-        """Gera população inicial usando DFS aleatório para garantir rotas válidas"""
-        population = []
-        for _ in range(self.population_size):
-            route = self._generate_valid_route()
-            population.append(route)
-        return population
-
-    def _generate_valid_route(self) -> List[str]:
-        """Gera uma rota válida usando DFS com conexões diretas"""
-
-        def dfs(current: str, path: List[str], visited: set) -> List[str]:
-            if len(visited) == len(self.problem.cities):
-                if self.problem.get_direct_distance(path[-1], path[0]) != float('inf'):
-                    return path
-                return None
-
-            neighbors = [city for city in self.problem.get_neighbors(current)
-                         if city not in visited]
-            random.shuffle(neighbors)
-
-            for neighbor in neighbors:
-                result = dfs(neighbor, path + [neighbor], visited | {neighbor})
-                if result is not None:
-                    return result
-            return None
-
-        # Tenta no máximo 10 vezes
-        for _ in range(10):
-            route = dfs(self.problem.start_city, [self.problem.start_city], {self.problem.start_city})
-            if route is not None:
-                return route
-        raise ValueError("Não foi possível gerar rota válida")
-
-    def _fitness(self, individual: List[str]) -> float:
+        """
+        Semeia a população com a rota anterior (partida a quente), se houver,
+        e uma rota de cada heurística construtiva e completa com vizinho mais
+        próximo aleatorizado, para manter diversidade
+        """
+        tours = [] if self.initial_route is None else [warm_start(self.problem, self.initial_route)]
+        tours += [construct(self.problem, name)
+                  for name in self.seed_heuristics[:self.population_size - len(tours)]]
+        while len(tours) < self.population_size:
+            tours.append(construct(self.problem, 'nearest_neighbor', random))
+        return [self.problem.to_city_tour(tour) for tour in tours]
+
+    def _evaluate(self, individual: List[str]) -> float:
+        """Calcula a distância da rota contabilizando a avaliação no tracker"""
+        with self.profiler.phase('evaluation'):
+            distance = self.problem.path_distance(individual)
+        self.tracker.count()
+        self.tracker.update(distance)
+        return distance
+
+    def _register(self, distance: float):
+        """Contabiliza no tracker a avaliação de um filho cujo custo já é conhecido"""
+        self.tracker.count()
+        self.tracker.update(distance)
+
+    def _fitness(self, distance: float) -> float:
         """Função de fitness baseada na distância inversa"""
-        distance = self.problem.path_distance(individual)
         return 1.0 / (distance + 1e-10)  # Evita divisão por zero
 
     def _select_parents(self, population: List[List[str]],
                         fitnesses: List[float]) -> Tuple[List[str], List[str]]:
-        """Seleção por torneio com tamanho 3"""
-        tournament_size = 3
-        parent1 = max(random.sample(population, tournament_size),
-                      key=lambda x: self._fitness(x))
-        parent2 = max(random.sample(population, tournament_size),
-                      key=lambda x: self._fitness(x))
-        return parent1, parent2
-
-    def _crossover(self, parent1: List[str], parent2: List[str]) -> List[str]:
-        """Edge Recombination Crossover (ERX) adaptado para conexões diretas"""
+        """Seleção por torneio com tamanho 3 (usa os fitness já calculados)"""
+        tournament_size = min(3, len(population))
+        indices = range(len(population))
+        winner1 = max(random.sample(indices, tournament_size), key=lambda i: fitnesses[i])
+        winner2 = max(random.sample(indices, tournament_size), key=lambda i: fitnesses[i])
+        return population[winner1], population[winner2]
+
+    def _crossover(self, parent1: List[str], parent2: List[str]) -> Tuple[List[str], float]:
+        """
+        Edge Recombination Crossover (ERX) adaptado para conexões diretas.
+        Retorna (filho, custo), com o custo somado aresta a aresta durante a
+        construção (infinito se o filho usar uma aresta inexistente)
+        """
         # Cria mapa de adjacências combinando ambos os pais
         adjacency: Dict[str, List[str]] = {city: [] for city in self.problem.cities}
 
@@ -80,14 +108,16 @@ class GeneticAlgorithm:
 
         # Remove duplicatas e conexões inexistentes
         for city in adjacency:
-            adjacency[city] = [c for c in set(adjacency[city])
+            adjacency[city] = [c for c in dict.fromkeys(adjacency[city])
                                if c in self.problem.get_neighbors(city)]
             random.shuffle(adjacency[city])  # Para variedade
 
         # Constrói o filho
         child = [self.problem.start_city]
         current = self.problem.start_city
-        available = set(self.problem.cities) - {current}
+        cost = 0.0
+        # dict em vez de set: ordem de iteração independente da semente de hash
+        available = dict.fromkeys(city for city in self.problem.cities if city != current)
 
         while available:
             # Pega vizinhos disponíveis
@@ -102,66 +132,190 @@ class GeneticAlgorithm:
                 next_city = min(neighbors, key=lambda x: len(adjacency[x]))
 
             child.append(next_city)
-            available.remove(next_city)
+            del available[next_city]
+            cost += self.problem.get_direct_distance(current, next_city)
             current = next_city
 
-        return child
+        cost += self.problem.get_direct_distance(current, child[0])
+        return child, cost
 
-    def _mutate(self, individual: List[str]) -> List[str]:
-        """Mutação por inversão de segmento com conexões válidas"""
+    def _mutate(self, individual: List[str], distance: float) -> Tuple[List[str], float]:
+        """
+        Com probabilidade mutation_rate aplica um operador sorteado do mix
+        (inversão, Or-opt, troca, double-bridge); os operadores só escolhem
+        movimentos viáveis a partir das listas de vizinhos (ver moves.py).
+        Retorna (indivíduo, custo): o custo recebido mais o delta do operador
+        """
         if random.random() < self.mutation_rate and len(individual) > 3:
-            size = len(individual)
-            for _ in range(100):  # Tenta no máximo 100 inversões
-                i, j = sorted(random.sample(range(1, size - 1), 2))
+            name = random.choices(self._operator_names, self._operator_weights)[0]
+            tour = self.problem.to_int_tour(individual)
+            delta = OPERATORS[name](tour, positions(tour), self.problem.int_weights,
+                                    self.problem.neighbor_lists, random)
+            if delta is None:
+                self.profiler.count('rejected_mutations')
+                return individual, distance
+            self.profiler.count('mutations')
+            self.profiler.count(f'mutations_{name}')
+            if math.isfinite(distance):
+                distance += delta
+            else:
+                # Com arestas inexistentes o delta não tem sentido (inf - inf); o
+                # operador pode ter removido a aresta inválida, então recalcula
+                distance = tour_cost(tour, self.problem.int_weights)
+            return self.problem.to_city_tour(tour), distance
+
+        return individual, distance
+
+    def _improve(self, individual: List[str], distance: float) -> Tuple[List[str], float]:
+        """Passada limitada de 2-opt/Or-opt com don't-look bits (ver local_search.py); retorna (indivíduo, custo)"""
+        if not math.isfinite(distance):
+            return individual, distance  # A busca local só trabalha com rotas válidas
+        tour = self.problem.to_int_tour(individual)
+        delta, moves = improve(tour, self.problem.int_weights, self.problem.neighbor_lists,
+                               max_moves=self.local_search_moves)
+        self.profiler.count('local_search_moves', moves)
+        return self.problem.to_city_tour(tour), distance + delta
 
-                # Verifica conexões antes/depois da inversão
-                valid_inversion = (
-                        self.problem.get_direct_distance(individual[i - 1], individual[j]) != float('inf') and
-                        self.problem.get_direct_distance(individual[i], individual[(j + 1) % size]) != float('inf')
-                )
+    def adopt_incumbent(self, individual: List[str], distance: float):
+        """
+        Injeção de elite (ver util/TSP/portfolio.py): a rota recebida substitui
+        o pior indivíduo da população e, se for melhor, passa a ser a melhor
+        """
+        if not self._population:
+            return
+        worst = max(range(len(self._population)), key=lambda i: self._distances[i])
+        self._population[worst] = list(individual)
+        self._distances[worst] = distance
+        if distance < self._best_distance:
+            self._best_individual, self._best_distance = list(individual), distance
+            self.tracker.update(distance)
 
-                if valid_inversion:
-                    individual[i:j + 1] = individual[i:j + 1][::-1]
-                    break
+    def _get_state(self) -> dict:
+        return {
+            'problem': self.problem.fingerprint(),
+            'generation': self._generation,
+            'population': self._population,
+            'distances': self._distances,
+            'best_individual': self._best_individual,
+            'best_distance': self._best_distance,
+            'convergence': self.convergence.get_state(),
+            'tracker': self.tracker.get_state(),
+        }
 
-        return individual
+    def _set_state(self, state: dict):
+        if state['problem'] != self.problem.fingerprint():
+            raise ValueError("O checkpoint pertence a outra instância do problema")
+        self._generation = state['generation']
+        self._population = state['population']
+        self._distances = state['distances']
+        self._best_individual = state['best_individual']
+        self._best_distance = state['best_distance']
+        self.convergence.set_state(state['convergence'])
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path: str) -> List[str]:
+        """Continua uma execução a partir de um checkpoint gravado por solve()"""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.result()
 
     def solve(self) -> List[str]:
-        population = self._initialize_population()
-        best_individual = min(population, key=lambda x: self.problem.path_distance(x))
-        best_distance = self.problem.path_distance(best_individual)
-        self.convergence_data.append(best_distance)
+        for _ in self.solve_iter():
+            pass
+        return self.result()
+
+    def result(self) -> List[str]:
+        """Melhor rota encontrada até agora (incluindo as adotadas do portfólio)"""
+        return self._best_individual
+
+    def solve_iter(self, resume: Optional[str] = None) -> Iterator[dict]:
+        """
+        Executa o GA produzindo um snapshot por geração (iteration, best_cost,
+        best_solution, evaluations, elapsed). Parar de consumir o iterador
+        interrompe a evolução; `resume` continua a partir de um checkpoint.
+        """
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self.tracker.start()
+            # Parada por gap: calcula o limite inferior se não foi fornecido
+            if self.tracker.gap is not None and self.tracker.lower_bound is None:
+                from util.TSP.bounds import held_karp_bound  # scipy, só quando há parada por gap
+                with self.profiler.phase('bound'):
+                    self.tracker.lower_bound = held_karp_bound(self.problem)
+            with self.profiler.phase('init'):
+                self._population = self._initialize_population()
+            self._distances = [self._evaluate(ind) for ind in self._population]
+            best_index = min(range(len(self._population)), key=lambda i: self._distances[i])
+            self._best_individual = self._population[best_index]
+            self._best_distance = self._distances[best_index]
+            self.convergence.record(0, self.tracker.evaluations, self.tracker.elapsed, self._best_distance)
+            self._generation = 0
+
+        while self._generation < self.generations:
+            if self.tracker.should_stop():
+                break
 
-        for _ in range(self.generations):
-            fitnesses = [self._fitness(ind) for ind in population]
+            # Relido a cada geração: adopt_incumbent pode alterar o estado entre gerações
+            population, distances = self._population, self._distances
+            best_individual, best_distance = self._best_individual, self._best_distance
+
+            fitnesses = [self._fitness(d) for d in distances]
             new_population = []
+            new_distances = []
 
             for _ in range(self.population_size // 2):
-                parent1, parent2 = self._select_parents(population, fitnesses)
-                child1 = self._crossover(parent1, parent2)
-                child2 = self._crossover(parent2, parent1)
-                child1 = self._mutate(child1)
-                child2 = self._mutate(child2)
-
-                # Garante que os filhos são válidos
-                if self.problem.is_valid_route(child1):
-                    new_population.append(child1)
-                if self.problem.is_valid_route(child2):
-                    new_population.append(child2)
+                with self.profiler.phase('selection'):
+                    parent1, parent2 = self._select_parents(population, fitnesses)
+                with self.profiler.phase('variation'):
+                    # O custo vem do crossover e é atualizado pelos deltas da mutação
+                    # e da busca local, sem reavaliar a rota inteira
+                    child1, distance1 = self._crossover(parent1, parent2)
+                    child2, distance2 = self._crossover(parent2, parent1)
+                    child1, distance1 = self._mutate(child1, distance1)
+                    child2, distance2 = self._mutate(child2, distance2)
+
+                if self.memetic_rate > 0:
+                    with self.profiler.phase('local_search'):
+                        if random.random() < self.memetic_rate:
+                            child1, distance1 = self._improve(child1, distance1)
+                        if random.random() < self.memetic_rate:
+                            child2, distance2 = self._improve(child2, distance2)
+
+                # Garante que os filhos são válidos (o crossover sempre gera
+                # uma permutação a partir da cidade inicial; basta checar o custo)
+                for child, child_distance in ((child1, distance1), (child2, distance2)):
+                    self._register(child_distance)
+                    if child_distance != float('inf'):
+                        new_population.append(child)
+                        new_distances.append(child_distance)
+                    else:
+                        self.profiler.count('invalid_children')
 
             # Elitismo: mantém a melhor solução
-            population = sorted(
-                new_population + [best_individual],
-                key=lambda x: self.problem.path_distance(x)
-            )[:self.population_size]
+            with self.profiler.phase('replacement'):
+                ranked = sorted(
+                    zip(new_population + [best_individual], new_distances + [best_distance]),
+                    key=lambda x: x[1]
+                )[:self.population_size]
+                population = [ind for ind, _ in ranked]
+                distances = [d for _, d in ranked]
 
             # Atualiza melhor solução
             current_best = population[0]
-            current_dist = self.problem.path_distance(current_best)
+            current_dist = distances[0]
             if current_dist < best_distance:
                 best_individual = current_best
                 best_distance = current_dist
 
-            self.convergence_data.append(best_distance)
+            self._population, self._distances = population, distances
+            self._best_individual, self._best_distance = best_individual, best_distance
+            self._generation += 1
+            self.convergence.record(self._generation, self.tracker.evaluations, self.tracker.elapsed,
+                                    best_distance)
+            self.checkpointer.maybe_save(type(self).__name__, self._generation, self._get_state)
+            yield self.tracker.snapshot(self._generation, best_distance, best_individual)
 
-        return best_individual
\ No newline at end of file
+        self.tracker.finish()
\ No newline at end of file
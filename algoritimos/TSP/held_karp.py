@@ -0,0 +1,217 @@
+from math import comb
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from util.TSP.tsp_problem import TSPProblem
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER, Profiler
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+from algoritimos.TSP.construction import construct
+
+
+class HeldKarp:
+    """
+    Solver exato por programação dinâmica de Held-Karp sobre subconjuntos
+    (O(2^N · N²) tempo, O(2^N · N) memória), vetorizado em NumPy por camadas
+    de subconjuntos do mesmo tamanho. Arestas inexistentes valem infinito.
+
+    Cada camada da DP é uma iteração: os critérios de parada são verificados
+    e os checkpoints gravados entre camadas, e cada extensão de caminho
+    parcial (subconjunto, última cidade, predecessor) conta como uma
+    avaliação. Uma camada que passaria de `max_evaluations` não é calculada
+    (o orçamento nunca é ultrapassado); o tempo só é verificado entre
+    camadas, então `time_limit` pode ser excedido em até uma camada. Até a
+    DP terminar, a melhor rota é a do vizinho mais próximo
+    (ver construction.py); se a execução parar antes, é ela que é devolvida.
+
+    Recusa (ValueError) instâncias com mais de `max_cities` cidades ou cuja
+    estimativa de memória passe de `max_memory_mb`.
+    """
+
+    def __init__(self, problem: TSPProblem, max_cities: int = 20, max_memory_mb: float = 1024,
+                 max_evaluations: Optional[int] = None, time_limit: Optional[float] = None,
+                 target: Optional[float] = None, profiler: Optional[Profiler] = None,
+                 gap: Optional[float] = None, lower_bound: Optional[float] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 1):
+        num_cities = len(problem.cities)
+        if num_cities > max_cities:
+            raise ValueError(f"Held-Karp limitado a {max_cities} cidades (a instância tem {num_cities})")
+        estimate = self.memory_estimate(num_cities) / 2 ** 20
+        if estimate > max_memory_mb:
+            raise ValueError(f"Held-Karp precisaria de ~{estimate:.0f} MB (limite: {max_memory_mb:.0f} MB)")
+
+        self.problem = problem
+        self.max_cities = max_cities
+        self.convergence = ConvergenceRecorder()  # (camada, avaliações, tempo, melhor) a cada camada
+        self.tracker = RunTracker(max_evaluations, time_limit, target, gap, lower_bound)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+        self.optimal_distance = float('inf')  # Só é preenchido se a DP terminar
+
+        # Estado da execução (salvo nos checkpoints)
+        self._layer = 2  # Próxima camada (tamanho de subconjunto) a calcular
+        self._cost: Optional[np.ndarray] = None
+        self._parent: Optional[np.ndarray] = None
+        self._solution: Optional[List[str]] = None
+        self._distance = float('inf')
+
+    @staticmethod
+    def memory_estimate(num_cities: int) -> int:
+        """Bytes das tabelas da DP: custos float64 e predecessores int8, mais a maior camada temporária"""
+        k = max(num_cities - 1, 1)
+        table = (1 << k) * k * (8 + 1)
+        largest_layer = (1 << k) // 2 * k * 8 * 2  # candidatos (subconjuntos x predecessores) de uma cidade
+        return table + largest_layer
+
+    @staticmethod
+    def supports(problem: TSPProblem, max_cities: int = 20) -> bool:
+        return len(problem.cities) <= max_cities
+
+    def _distance_matrix(self) -> np.ndarray:
+        n = len(self.problem.cities)
+        matrix = np.full((n, n), np.inf)
+        for i, weights in enumerate(self.problem.int_weights):
+            for j, distance in weights.items():
+                matrix[i, j] = distance
+        return matrix
+
+    def _record(self, iteration: int):
+        self.convergence.record(iteration, self.tracker.evaluations, self.tracker.elapsed, self._distance)
+
+    def _initial_solution(self):
+        """Rota do vizinho mais próximo como melhor provisória (nenhuma, se a heurística falhar)"""
+        try:
+            route = self.problem.to_city_tour(construct(self.problem, 'nearest_neighbor'))
+        except ValueError:
+            return
+        with self.profiler.phase('evaluation'):
+            self._distance = self.problem.path_distance(route)
+        self._solution = route
+        self.tracker.count()
+        self.tracker.update(self._distance)
+
+    def _get_state(self) -> dict:
+        return {
+            'problem': self.problem.fingerprint(),
+            'layer': self._layer,
+            'cost': self._cost,
+            'parent': self._parent,
+            'solution': self._solution,
+            'distance': self._distance,
+            'convergence': self.convergence.get_state(),
+            'tracker': self.tracker.get_state(),
+        }
+
+    def _set_state(self, state: dict):
+        if state['problem'] != self.problem.fingerprint():
+            raise ValueError("O checkpoint pertence a outra instância do problema")
+        self._layer = state['layer']
+        self._cost = state['cost']
+        self._parent = state['parent']
+        self._solution = state['solution']
+        self._distance = state['distance']
+        self.convergence.set_state(state['convergence'])
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path: str) -> List[str]:
+        """Continua uma execução a partir de um checkpoint gravado por solve()"""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.result()
+
+    def solve(self) -> List[str]:
+        for _ in self.solve_iter():
+            pass
+        return self.result()
+
+    def result(self) -> List[str]:
+        """Rota ótima, ou a provisória se a DP parou antes de terminar"""
+        if self._solution is None:
+            raise ValueError("A execução parou antes de encontrar uma rota válida")
+        return self._solution
+
+    def solve_iter(self, resume: Optional[str] = None) -> Iterator[dict]:
+        """
+        Executa a DP produzindo um snapshot por camada (com a melhor rota
+        provisória) e um último com a rota ótima. Parar de consumir o
+        iterador interrompe a DP; `resume` continua a partir de um checkpoint.
+        """
+        full = self._distance_matrix()
+        start = self.problem.city_index[self.problem.start_city]
+        # Cidades que não são a inicial, reindexadas de 0 a k-1 (bit i = others[i])
+        others = [i for i in range(len(self.problem.cities)) if i != start]
+        k = len(others)
+        size = 1 << k
+
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self.tracker.start()
+            self._initial_solution()
+            with self.profiler.phase('init'):
+                # cost[mask, j]: menor caminho que sai da inicial, visita `mask` e termina em j
+                self._cost = np.full((size, k), np.inf)
+                self._parent = np.full((size, k), -1, dtype=np.int8)
+                from_start = full[start, others]
+                for j in range(k):
+                    self._cost[1 << j, j] = from_start[j]
+            self._layer = 2
+            self._record(0)
+
+        with self.profiler.phase('init'):
+            dist = full[np.ix_(others, others)]
+            masks = np.arange(size)
+            popcount = np.zeros(size, dtype=np.int8)
+            for j in range(k):
+                popcount += (masks >> j) & 1
+
+        cost, parent = self._cost, self._parent
+        while self._layer <= k:
+            # Extensões da camada: subconjuntos de tamanho `layer`, última cidade e predecessor
+            if self.tracker.should_stop(comb(k, self._layer) * self._layer * k):
+                break
+
+            with self.profiler.phase('dp'):
+                layer_masks = masks[popcount == self._layer]
+                for j in range(k):
+                    with_j = layer_masks[(layer_masks >> j) & 1 == 1]
+                    previous = with_j ^ (1 << j)
+                    candidates = cost[previous] + dist[:, j]
+                    best = candidates.argmin(axis=1)
+                    cost[with_j, j] = candidates[np.arange(len(with_j)), best]
+                    parent[with_j, j] = best
+                    self.tracker.count(candidates.size)
+
+            iteration = self._layer - 1  # Camadas calculadas
+            self._layer += 1
+            self._record(iteration)
+            self.checkpointer.maybe_save(type(self).__name__, iteration, self._get_state)
+            yield self.tracker.snapshot(iteration, self._distance, self._solution)
+
+        if self._layer > k:
+            with self.profiler.phase('reconstruction'):
+                totals = cost[size - 1] + full[others, start]
+                last = int(totals.argmin())
+                if not np.isfinite(totals[last]):
+                    raise ValueError("A instância não tem ciclo hamiltoniano")
+
+                order = []
+                mask = size - 1
+                while last >= 0:
+                    order.append(others[last])
+                    last, mask = int(parent[mask, last]), mask ^ (1 << last)
+                tour = [start] + order[::-1]
+
+            self._solution = self.problem.to_city_tour(tour)
+            with self.profiler.phase('evaluation'):
+                self._distance = self.optimal_distance = self.problem.path_distance(self._solution)
+            self.tracker.count()
+            self.tracker.update(self._distance)
+            self._record(self._layer - 1)
+            yield self.tracker.snapshot(self._layer - 1, self._distance, self._solution)
+
+        self.tracker.finish()
@@ -1,78 +1,184 @@
 import random
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from util.TSP.tsp_problem import TSPProblem
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER, Profiler
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+from algoritimos.TSP.construction import construct, warm_start
+from algoritimos.TSP.tour import Tour, make_tour
 
 
 class HillClimbing:
-    def __init__(self, problem: TSPProblem, max_iterations: int = 1000):
+    def __init__(self, problem: TSPProblem, max_iterations: int = 1000,
+                 initial_heuristic: str = 'nearest_neighbor', initial_route: Optional[List[str]] = None,
+                 max_evaluations: Optional[int] = None, time_limit: Optional[float] = None,
+                 target: Optional[float] = None, profiler: Optional[Profiler] = None,
+                 gap: Optional[float] = None, lower_bound: Optional[float] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 100):
         self.problem = problem
         self.max_iterations = max_iterations
-        self.convergence_data = []
-
-    def _generate_valid_route(self) -> List[str]:
-        """Gera uma rota válida usando Depth-First Search (DFS)"""
-
-        def dfs(current: str, path: List[str], visited: set) -> Optional[List[str]]:
-            if len(visited) == len(self.problem.cities):
-                if self.problem.get_direct_distance(path[-1], path[0]) != float('inf'):
-                    return path
-                return None
-
-            neighbors = [city for city in self.problem.get_neighbors(current)
-                         if city not in visited]
-            random.shuffle(neighbors)
-
-            for neighbor in neighbors:
-                result = dfs(neighbor, path + [neighbor], visited | {neighbor})
-                if result is not None:
-                    return result
-            return None
-
-        # Tenta no máximo 10 vezes gerar uma rota válida
-        for _ in range(10):
-            route = dfs(self.problem.start_city, [self.problem.start_city], {self.problem.start_city})
-            if route is not None:
-                return route
-        raise ValueError("Não foi possível gerar rota inicial válida")
-
-    def _get_valid_neighbor(self, current: List[str]) -> Optional[List[str]]:
-        """Gera um vizinho válido através de inversões de segmentos conectados"""
-        size = len(current)
+        self.initial_heuristic = initial_heuristic  # Heurística construtiva da rota inicial (ver construction.py)
+        self.initial_route = initial_route  # Rota anterior para partida a quente (ver construction.warm_start)
+        self.convergence = ConvergenceRecorder()  # (iteração, avaliações, tempo, melhor) a cada iteração
+        self.tracker = RunTracker(max_evaluations, time_limit, target, gap, lower_bound)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+
+        # Estado da execução (salvo nos checkpoints)
+        self._iteration = 0
+        self._tour: Optional[Tour] = None  # Rota corrente na estrutura de busca local (ver tour.py)
+        self._current_distance = float('inf')
+        # A mesma rota em nomes de cidades, convertida só quando pedida (ver _current_solution)
+        self._solution_cache: Optional[List[str]] = None
+
+    def _evaluate(self, route: List[str]) -> float:
+        """Avalia a rota contabilizando a avaliação no tracker"""
+        with self.profiler.phase('evaluation'):
+            distance = self.problem.path_distance(route)
+        self.tracker.count()
+        self.tracker.update(distance)
+        return distance
+
+    def _evaluate_move(self, delta: float) -> float:
+        """Avalia o vizinho pelo delta de custo em O(1), contabilizando a avaliação no tracker"""
+        with self.profiler.phase('evaluation'):
+            distance = self._current_distance + delta
+        self.tracker.count()
+        self.tracker.update(distance)
+        return distance
+
+    def _initial_route(self) -> List[str]:
+        """Rota anterior corrigida e melhorada (partida a quente), se houver, ou a da heurística construtiva"""
+        if self.initial_route is not None:
+            return self.problem.to_city_tour(warm_start(self.problem, self.initial_route))
+        return self.problem.to_city_tour(construct(self.problem, self.initial_heuristic))
+
+    def _get_valid_neighbor(self) -> Optional[Tuple[float, tuple]]:
+        """
+        Sorteia uma inversão de segmento (2-opt) que mantém a rota válida: a
+        aresta nova (a, c) vem da lista de vizinhos de a e só a outra, (b, d),
+        precisa ser verificada. Retorna (delta de custo, (a, b, c, d)) ou None
+        """
+        tour = self._tour
+        weights = self.problem.int_weights
+        neighbors = self.problem.neighbor_lists
+        n = len(tour)
 
         for _ in range(100):  # Tenta no máximo 100 inversões diferentes
-            i, j = sorted(random.sample(range(1, size - 1), 2))
-
-            # Verifica se a inversão mantém as conexões
-            valid_inversion = (
-                # Conexão antes do segmento
-                    self.problem.get_direct_distance(current[i - 1], current[j]) != float('inf') and
-                    # Conexão depois do segmento
-                    self.problem.get_direct_distance(current[i], current[(j + 1) % size]) != float('inf')
-            )
-
-            if valid_inversion:
-                neighbor = current.copy()
-                neighbor[i:j + 1] = neighbor[i:j + 1][::-1]  # Inverte o segmento
-                return neighbor
+            a = random.randrange(n)
+            candidates = neighbors[a]
+            c = candidates[random.randrange(len(candidates))]
+            b, d = tour.next(a), tour.next(c)
+            if c != b and d != a:
+                w_bd = weights[b].get(d)
+                if w_bd is not None:
+                    return weights[a][c] + w_bd - weights[a][b] - weights[c][d], (a, b, c, d)
+            self.profiler.count('rejected_inversions')
 
         return None  # Não encontrou vizinho válido
 
-    def solve(self) -> List[str]:
-        current_solution = self._generate_valid_route()
-        current_distance = self.problem.path_distance(current_solution)
-        self.convergence_data.append(current_distance)
-
-        for _ in range(self.max_iterations):
-            neighbor = self._get_valid_neighbor(current_solution)
+    def _current_solution(self) -> List[str]:
+        """Rota corrente em nomes de cidades, a partir da cidade inicial (convertida uma vez por melhoria)"""
+        if self._solution_cache is None:
+            start = self.problem.city_index[self.problem.start_city]
+            self._solution_cache = self.problem.to_city_tour(self._tour.to_list(start))
+        return self._solution_cache
+
+    def _set_tour(self, route: List[str]):
+        self._tour = make_tour(self.problem.to_int_tour(route))
+        self._solution_cache = list(route)
+
+    def _record(self):
+        self.convergence.record(self._iteration, self.tracker.evaluations, self.tracker.elapsed,
+                                self._current_distance)
+
+    def adopt_incumbent(self, route: List[str], distance: float):
+        """Recomeça da rota recebida (ver util/TSP/portfolio.py) se ela for melhor que a corrente"""
+        if distance < self._current_distance:
+            self._set_tour(route)
+            self._current_distance = distance
+            self.tracker.update(distance)
+
+    def _get_state(self) -> dict:
+        return {
+            'problem': self.problem.fingerprint(),
+            'iteration': self._iteration,
+            'current_solution': self._current_solution(),
+            'current_distance': self._current_distance,
+            'convergence': self.convergence.get_state(),
+            'tracker': self.tracker.get_state(),
+        }
+
+    def _set_state(self, state: dict):
+        if state['problem'] != self.problem.fingerprint():
+            raise ValueError("O checkpoint pertence a outra instância do problema")
+        self._iteration = state['iteration']
+        self._set_tour(state['current_solution'])
+        self._current_distance = state['current_distance']
+        self.convergence.set_state(state['convergence'])
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path: str) -> List[str]:
+        """Continua uma execução a partir de um checkpoint gravado por solve()"""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.result()
 
-            if neighbor is None:
-                continue  # Não encontrou vizinhos válidos
-
-            neighbor_distance = self.problem.path_distance(neighbor)
-
-            if neighbor_distance < current_distance:
-                current_solution = neighbor
-                current_distance = neighbor_distance
-                self.convergence_data.append(current_distance)
-
-        return current_solution
\ No newline at end of file
+    def solve(self) -> List[str]:
+        for _ in self.solve_iter():
+            pass
+        return self.result()
+
+    def result(self) -> List[str]:
+        """Rota corrente, a melhor até agora (incluindo as adotadas do portfólio)"""
+        return self._current_solution()
+
+    def solve_iter(self, resume: Optional[str] = None) -> Iterator[dict]:
+        """
+        Executa a busca produzindo um snapshot por iteração (iteration, best_cost,
+        best_solution, evaluations, elapsed). Parar de consumir o iterador
+        interrompe a busca; `resume` continua a partir de um checkpoint.
+        """
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self.tracker.start()
+            # Parada por gap: calcula o limite inferior se não foi fornecido
+            if self.tracker.gap is not None and self.tracker.lower_bound is None:
+                from util.TSP.bounds import held_karp_bound  # scipy, só quando há parada por gap
+                with self.profiler.phase('bound'):
+                    self.tracker.lower_bound = held_karp_bound(self.problem)
+            with self.profiler.phase('init'):
+                self._set_tour(self._initial_route())
+            self._current_distance = self._evaluate(self._current_solution())
+            self._iteration = 0
+            self._record()
+
+        while self._iteration < self.max_iterations:
+            if self.tracker.should_stop():
+                break
+
+            with self.profiler.phase('variation'):
+                move = self._get_valid_neighbor()
+
+            # move é None quando não encontrou vizinhos válidos
+            if move is not None:
+                delta, edges = move
+                neighbor_distance = self._evaluate_move(delta)
+
+                if neighbor_distance < self._current_distance:
+                    with self.profiler.phase('variation'):
+                        self._tour.two_opt_move(*edges)
+                    self._solution_cache = None
+                    self._current_distance = neighbor_distance
+
+            self._iteration += 1
+            self._record()
+            self.checkpointer.maybe_save(type(self).__name__, self._iteration, self._get_state)
+            # A rota só é convertida para nomes de cidades se quem consome o snapshot a ler
+            yield self.tracker.snapshot(self._iteration, self._current_distance, self._current_solution)
+
+        self.tracker.finish()
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""
+Busca local 2-opt + Or-opt com listas de vizinhos e don't-look bits.
+
+Opera sobre rotas válidas de inteiros (ver moves.py) e avalia cada movimento
+pelo delta de custo em O(1). Uma cidade só é reexaminada depois que uma
+aresta incidente a ela muda, então cada passada custa proporcionalmente ao
+número de movimentos aplicados. Os movimentos são aplicados numa estrutura
+de rota (ver tour.py): lista com índice de posições em rotas pequenas e
+lista de dois níveis, com inversões em O(√N), nas grandes.
+
+repair() faz o caminho inverso para rotas com arestas inexistentes: aplica
+movimentos que reduzem o número de arestas inválidas até a rota ser viável.
+"""
+import random
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from algoritimos.TSP.tour import Tour, make_tour
+
+EPSILON = 1e-9
+# repair(): probabilidade de escolher o movimento lateral mais barato (e não um
+# sorteado) e passos sem progresso após os quais passa a sortear sempre
+SIDEWAYS_GREED = 0.95
+STALL_LIMIT = 50
+# repair(): passos sem progresso após os quais, em grafos de diâmetro grande,
+# os movimentos laterais passam a ser guiados pela distância em arestas
+GUIDED_AFTER = 5
+
+
+def _two_opt(tour: Tour, weights, neighbors, a) -> Optional[Tuple[float, tuple]]:
+    """Primeiro 2-opt de melhoria envolvendo uma aresta incidente a `a`"""
+    weights_a = weights[a]
+
+    # Sucessor: (a, b), (c, d) -> (a, c), (b, d)
+    b = tour.next(a)
+    w_ab = weights_a[b]
+    for c in neighbors[a]:
+        w_ac = weights_a[c]
+        if w_ac >= w_ab:
+            break
+        d = tour.next(c)
+        if c == b or d == a:
+            continue
+        w_bd = weights[b].get(d)
+        if w_bd is None:
+            continue
+        delta = w_ac + w_bd - w_ab - weights[c][d]
+        if delta < -EPSILON:
+            tour.two_opt_move(a, b, c, d)
+            return delta, (a, b, c, d)
+
+    # Predecessor: (p, a), (e, c) -> (p, e), (a, c)
+    p = tour.prev(a)
+    w_pa = weights[p][a]
+    for c in neighbors[a]:
+        w_ac = weights_a[c]
+        if w_ac >= w_pa:
+            break
+        e = tour.prev(c)
+        if c == p or e == a:
+            continue
+        w_pe = weights[p].get(e)
+        if w_pe is None:
+            continue
+        delta = w_ac + w_pe - w_pa - weights[e][c]
+        if delta < -EPSILON:
+            tour.two_opt_move(p, a, e, c)
+            return delta, (p, a, e, c)
+    return None
+
+
+def _or_opt(tour: Tour, weights, neighbors, a, max_segment) -> Optional[Tuple[float, tuple]]:
+    """Primeira realocação de melhoria de um segmento que começa em `a`"""
+    p, first, last = tour.prev(a), a, a
+    for length in range(1, min(max_segment, len(tour) - 3) + 1):
+        if length > 1:
+            last = tour.next(last)
+        nxt = tour.next(last)
+        w_pn = weights[p].get(nxt)
+        if w_pn is None:
+            continue
+        removal_gain = weights[p][first] + weights[last][nxt] - w_pn
+
+        # c passa a preceder o segmento: c -> first ... last -> d
+        for c in neighbors[first]:
+            w_cf = weights[first][c]
+            if w_cf >= removal_gain:
+                break
+            if tour.between(p, c, last):  # c é o predecessor (nada muda) ou está no segmento
+                continue
+            d = tour.next(c)
+            w_ld = weights[last].get(d)
+            if w_ld is None:
+                continue
+            delta = w_cf + w_ld - weights[c][d] - removal_gain
+            if delta < -EPSILON:
+                tour.move_segment(first, last, c, d)
+                return delta, (p, nxt, first, last, c, d)
+
+        # c passa a suceder o segmento: e -> first ... last -> c
+        for c in neighbors[last]:
+            w_lc = weights[last][c]
+            if w_lc >= removal_gain:
+                break
+            e = tour.prev(c)
+            if tour.between(p, e, last):
+                continue
+            w_ef = weights[e].get(first)
+            if w_ef is None:
+                continue
+            delta = w_ef + w_lc - weights[e][c] - removal_gain
+            if delta < -EPSILON:
+                tour.move_segment(first, last, e, c)
+                return delta, (p, nxt, first, last, e, c)
+    return None
+
+
+def _hop_distances(neighbors, source: int) -> Dict[int, int]:
+    """Número de arestas de `source` até cada cidade alcançável (BFS)"""
+    distances = {source: 0}
+    frontier = [source]
+    while frontier:
+        following = []
+        for u in frontier:
+            step = distances[u] + 1
+            for v in neighbors[u]:
+                if v not in distances:
+                    distances[v] = step
+                    following.append(v)
+        frontier = following
+    return distances
+
+
+def _missing_edges(tour: Tour, weights) -> set:
+    missing = set()
+    for a in range(len(tour)):
+        b = tour.next(a)
+        if b not in weights[a]:
+            missing.add((min(a, b), max(a, b)))
+    return missing
+
+
+def _repair_moves(tour: Tour, weights, neighbors, a, b):
+    """
+    Movimentos que removem a aresta inválida (a, b), com b = next(a), como
+    tuplas (variação no número de arestas inválidas, variação no custo das
+    arestas válidas, arestas removidas, arestas adicionadas, tipo, argumentos)
+    """
+
+    def delta(added, removed):
+        bad = cost = 0
+        for x, y in added:
+            w = weights[x].get(y)
+            bad, cost = (bad + 1, cost) if w is None else (bad, cost + w)
+        for x, y in removed:
+            w = weights[x].get(y)
+            bad, cost = (bad - 1, cost) if w is None else (bad, cost - w)
+        return bad, cost
+
+    def move(added, removed, kind, args):
+        return delta(added, removed) + (removed, added, kind, args)
+
+    # 2-opt pelo sucessor: (a, b), (c, d) -> (a, c), (b, d)
+    for c in neighbors[a]:
+        d = tour.next(c)
+        if d == a:
+            continue
+        yield move(((a, c), (b, d)), ((a, b), (c, d)), 'two_opt', (a, b, c, d))
+
+    # 2-opt pelo predecessor: (a, b), (e, c) -> (a, e), (b, c)
+    for c in neighbors[b]:
+        e = tour.prev(c)
+        if e == b:
+            continue
+        yield move(((a, e), (b, c)), ((a, b), (e, c)), 'two_opt', (a, b, e, c))
+
+    # Realocação de a ou de b para junto de um vizinho
+    for x in (a, b):
+        p, s = tour.prev(x), tour.next(x)
+        for c in neighbors[x]:
+            if c != p:  # c -> x -> d
+                d = tour.next(c)
+                yield move(((p, s), (c, x), (x, d)), ((p, x), (x, s), (c, d)), 'move', (x, c, d))
+            if c != s:  # e -> x -> c
+                e = tour.prev(c)
+                yield move(((p, s), (e, x), (x, c)), ((p, x), (x, s), (e, c)), 'move', (x, e, c))
+
+
+def repair(tour: Union[List[int], Tour], weights: List[Dict[int, float]], neighbors: List[List[int]],
+           max_moves: Optional[int] = None, rng=random) -> int:
+    """
+    Elimina arestas inexistentes de `tour`, in place (uma lista mantém a
+    cidade inicial na posição 0). A cada passo sorteia uma aresta inválida e
+    aplica o movimento (2-opt ou realocação de uma cidade, sempre criando uma
+    aresta existente) que mais reduz o número de arestas inválidas e, no
+    empate, o custo. Sem movimento que reduza, aplica um movimento lateral,
+    que só muda a aresta inválida de lugar (rotação de Pósa): em geral o mais
+    barato, mas sorteado depois de STALL_LIMIT passos sem progresso, o que
+    tira a busca de ciclos em grafos aleatórios esparsos.
+
+    Em grafos de diâmetro grande (geométricos, em que a excentricidade de
+    uma cidade passa de √N/2) as pontas de uma aresta inválida podem estar a
+    dezenas de arestas uma da outra, e o passeio sorteado leva milhares de
+    passos para aproximá-las. Nesses grafos, depois de GUIDED_AFTER passos
+    sem progresso, a busca fixa uma ponta (âncora) e escolhe o movimento
+    lateral que mais aproxima dela a outra ponta, em número de arestas (BFS
+    a partir da âncora), sorteando 10% dos movimentos para sair de mínimos
+    locais; a cada STALL_LIMIT passos sem progresso alterna esse modo com o
+    passeio sorteado, que resolve melhor as pontas já próximas. Para após
+    `max_moves` movimentos (padrão 20·N). Retorna o número de arestas
+    inválidas restantes (0 = rota viável).
+    """
+    if not isinstance(tour, Tour) and all(tour[i] in weights[tour[i - 1]] for i in range(len(tour))):
+        return 0  # Rota já viável: nada a corrigir
+    structure = tour if isinstance(tour, Tour) else make_tour(tour)
+    missing = _missing_edges(structure, weights)
+    max_moves = 20 * len(structure) if max_moves is None else max_moves
+
+    stall = 0
+    guided = None  # Decidido na primeira estagnação (custa uma BFS)
+    anchor, hops = None, None
+    for _ in range(max_moves):
+        if not missing:
+            break
+        greed = SIDEWAYS_GREED if stall < STALL_LIMIT else 0.0
+        if stall >= GUIDED_AFTER and guided is None:
+            eccentricity = max(_hop_distances(neighbors, next(iter(missing))[0]).values())
+            guided = eccentricity ** 2 > len(structure) / 4
+        # Modo guiado e passeio sorteado se alternam a cada STALL_LIMIT passos sem
+        # progresso: perto da âncora a distância em arestas deixa de ajudar
+        directed = guided and stall >= GUIDED_AFTER and (stall // STALL_LIMIT) % 2 == 0
+        if not directed:
+            anchor = None
+        # Trabalha numa aresta inválida sorteada de cada vez ou, no modo guiado,
+        # na da âncora enquanto ela existir
+        focus = next((edge for edge in missing if anchor in edge), None) if anchor is not None else None
+        if focus is None:
+            x, y = rng.choice(list(missing))
+            if directed:
+                if rng.random() < 0.5:
+                    x, y = y, x
+                anchor, hops = x, _hop_distances(neighbors, x)
+        else:
+            x, y = focus
+        a, b = (x, y) if structure.next(x) == y else (y, x)
+        moves = [move for move in _repair_moves(structure, weights, neighbors, a, b) if move[0] <= 0]
+        if not moves:
+            continue
+        best = min(moves, key=lambda move: move[:2])
+        if best[0] == 0:
+            stall += 1
+            if directed:
+                # Movimentos que mantêm a âncora na aresta inválida, pela distância da outra ponta
+                far = len(hops)
+                ranked = [(hops.get(v if u == anchor else u, far), rng.random(), move)
+                          for move in moves for u, v in move[3]
+                          if v not in weights[u] and anchor in (u, v)]
+                if ranked and rng.random() < 0.9:
+                    best = min(ranked)[2]
+                else:
+                    best = moves[rng.randrange(len(moves))]
+            elif rng.random() >= greed:
+                best = moves[rng.randrange(len(moves))]
+        else:
+            stall = 0
+            anchor = None
+
+        _, _, removed, added, kind, args = best
+        if kind == 'two_opt':
+            structure.two_opt_move(*args)
+        else:
+            city, c, d = args
+            structure.move_segment(city, city, c, d)
+        # Atualiza o conjunto de arestas inválidas só com as arestas trocadas
+        for u, v in removed:
+            missing.discard((min(u, v), max(u, v)))
+        for u, v in added:
+            if v not in weights[u]:
+                missing.add((min(u, v), max(u, v)))
+
+    if structure is not tour:
+        tour[:] = structure.to_list(tour[0])
+    return len(missing)
+
+
+def improve(tour: Union[List[int], Tour], weights: List[Dict[int, float]], neighbors: List[List[int]],
+            max_moves: Optional[int] = None, max_segment: int = 3,
+            use_or_opt: bool = True, cities: Optional[Iterable[int]] = None) -> Tuple[float, int]:
+    """
+    Aplica movimentos 2-opt/Or-opt de melhoria (first improvement) em `tour`,
+    in place (uma lista mantém a cidade inicial na posição 0), até um ótimo
+    local ou até `max_moves` movimentos. `cities` limita a fila inicial (as
+    demais começam com o don't-look bit ligado), para retomar a busca em
+    volta do que mudou numa rota que já era um ótimo local.
+    Retorna (delta total de custo, número de movimentos aplicados).
+    """
+    structure = tour if isinstance(tour, Tour) else make_tour(tour)
+    n = len(structure)
+    if cities is not None:
+        queue = deque(dict.fromkeys(cities))
+    else:
+        queue = deque(structure.to_list(0) if structure is tour else tour)
+    queued = [False] * n  # don't-look bit desligado = cidade na fila
+    for city in queue:
+        queued[city] = True
+    total = 0.0
+    moves = 0
+
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+
+        result = _two_opt(structure, weights, neighbors, a)
+        if result is None and use_or_opt:
+            result = _or_opt(structure, weights, neighbors, a, max_segment)
+        if result is None:
+            continue
+
+        delta, touched = result
+        total += delta
+        moves += 1
+        for city in (a,) + touched:
+            if not queued[city]:
+                queued[city] = True
+                queue.append(city)
+        if max_moves is not None and moves >= max_moves:
+            break
+
+    if structure is not tour:
+        tour[:] = structure.to_list(tour[0])
+    return total, moves
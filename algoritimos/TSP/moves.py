@@ -0,0 +1,176 @@
+"""
+Operadores de vizinhança sobre rotas de inteiros (índices de TSPProblem.cities).
+
+Todos os operadores mantêm a cidade inicial na posição 0, sorteiam apenas
+movimentos viáveis a partir das listas de vizinhos (a aresta nova principal é
+sempre uma aresta existente) e verificam as demais arestas e o delta de custo
+em O(1). Modificam `tour` e `pos` (posição de cada cidade na rota) in place e
+retornam o delta de custo, ou None se nenhum movimento viável foi encontrado
+em `attempts` tentativas.
+"""
+from typing import Dict, List, Optional, Sequence, Union
+
+INF = float('inf')
+
+
+def positions(tour: List[int]) -> List[int]:
+    """Índice de posição: pos[cidade] = posição da cidade na rota"""
+    pos = [0] * len(tour)
+    for i, city in enumerate(tour):
+        pos[city] = i
+    return pos
+
+
+def tour_cost(tour: List[int], weights: List[Dict[int, float]]) -> float:
+    """Custo do ciclo (infinito se usar alguma aresta inexistente)"""
+    total = 0.0
+    previous = tour[-1]
+    for city in tour:
+        total += weights[previous].get(city, INF)
+        previous = city
+    return total
+
+
+def _reverse(tour: List[int], pos: List[int], i: int, j: int):
+    """Inverte tour[i..j] (inclusive) atualizando o índice de posições"""
+    tour[i:j + 1] = tour[i:j + 1][::-1]
+    for k in range(i, j + 1):
+        pos[tour[k]] = k
+
+
+def move_segment(tour: List[int], pos: List[int], i: int, k: int, q: int):
+    """Move tour[i..k] (1 <= i <= k) para logo depois da posição q (fora do segmento)"""
+    segment = tour[i:k + 1]
+    del tour[i:k + 1]
+    insert_at = q + 1 if q < i else q + 1 - len(segment)
+    tour[insert_at:insert_at] = segment
+    for idx in range(min(i, q + 1), max(k, q) + 1):
+        pos[tour[idx]] = idx
+
+
+def inversion(tour, pos, weights, neighbors, rng, attempts: int = 10) -> Optional[float]:
+    """2-opt: troca as arestas (a, b) e (c, d) por (a, c) e (b, d) invertendo b..c"""
+    n = len(tour)
+    for _ in range(attempts):
+        i = rng.randrange(1, n)
+        a, b = tour[i - 1], tour[i]
+        candidates = neighbors[a]
+        c = candidates[rng.randrange(len(candidates))]
+        j = pos[c]
+        if j <= i:
+            continue
+        d = tour[(j + 1) % n]
+        w_bd = weights[b].get(d)
+        if w_bd is None:
+            continue
+        delta = weights[a][c] + w_bd - weights[a].get(b, INF) - weights[c].get(d, INF)
+        _reverse(tour, pos, i, j)
+        return delta
+    return None
+
+
+def or_opt(tour, pos, weights, neighbors, rng, attempts: int = 10,
+           max_segment: int = 3) -> Optional[float]:
+    """Or-opt: realoca um segmento de 1 a `max_segment` cidades para junto de um vizinho"""
+    n = len(tour)
+    for _ in range(attempts):
+        length = rng.randint(1, min(max_segment, n - 2))
+        i = rng.randrange(1, n - length + 1)
+        k = i + length - 1
+        p, first, last, nxt = tour[i - 1], tour[i], tour[k], tour[(k + 1) % n]
+        w_pn = weights[p].get(nxt)
+        if w_pn is None:
+            continue
+        candidates = neighbors[first]
+        c = candidates[rng.randrange(len(candidates))]
+        q = pos[c]
+        if i - 1 <= q <= k:  # c é o predecessor (nada muda) ou está no segmento
+            continue
+        d = tour[(q + 1) % n]
+        w_ld = weights[last].get(d)
+        if w_ld is None:
+            continue
+        delta = (w_pn + weights[c][first] + w_ld
+                 - weights[p].get(first, INF) - weights[last].get(nxt, INF) - weights[c].get(d, INF))
+        move_segment(tour, pos, i, k, q)
+        return delta
+    return None
+
+
+def swap(tour, pos, weights, neighbors, rng, attempts: int = 10) -> Optional[float]:
+    """Troca duas cidades de posição; a que entra em i é vizinha de tour[i - 1]"""
+    n = len(tour)
+    for _ in range(attempts):
+        i = rng.randrange(1, n)
+        candidates = neighbors[tour[i - 1]]
+        j = pos[candidates[rng.randrange(len(candidates))]]
+        if j == 0 or j == i:
+            continue
+
+        # Arestas afetadas, indexadas pela posição da origem: (tour[e], tour[e + 1])
+        edges = {i - 1, i % n, j - 1, j % n}
+        before = sum(weights[tour[e]].get(tour[(e + 1) % n], INF) for e in edges)
+        tour[i], tour[j] = tour[j], tour[i]
+        after = sum(weights[tour[e]].get(tour[(e + 1) % n], INF) for e in edges)
+        if after == INF:
+            tour[i], tour[j] = tour[j], tour[i]
+            continue
+        pos[tour[i]], pos[tour[j]] = i, j
+        return after - before
+    return None
+
+
+def double_bridge(tour, pos, weights, neighbors, rng, attempts: int = 10) -> Optional[float]:
+    """Double-bridge (3-opt sem inversão): A B C D -> A C B D"""
+    n = len(tour)
+    if n < 5:
+        return None
+    for _ in range(attempts):
+        p1 = rng.randrange(1, n - 1)
+        a, b = tour[p1 - 1], tour[p1]  # fim de A, início de B
+        candidates = neighbors[a]
+        p2 = pos[candidates[rng.randrange(len(candidates))]]  # início de C
+        if p2 <= p1:
+            continue
+        candidates = neighbors[b]
+        e = candidates[rng.randrange(len(candidates))]  # fim de C
+        q = pos[e]
+        if q < p2:
+            continue
+        b_end, d_start = tour[p2 - 1], tour[(q + 1) % n]
+        w_bd = weights[b_end].get(d_start)
+        if w_bd is None:
+            continue
+        c = tour[p2]
+        delta = (weights[a][c] + weights[e][b] + w_bd
+                 - weights[a].get(b, INF) - weights[b_end].get(c, INF) - weights[e].get(d_start, INF))
+        tour[p1:q + 1] = tour[p2:q + 1] + tour[p1:p2]
+        for idx in range(p1, q + 1):
+            pos[tour[idx]] = idx
+        return delta
+    return None
+
+
+OPERATORS = {
+    'inversion': inversion,
+    'or_opt': or_opt,
+    'swap': swap,
+    'double_bridge': double_bridge,
+}
+
+
+def operator_mix(operators: Union[Sequence[str], Dict[str, float]]):
+    """
+    Normaliza a seleção de operadores: lista de nomes (pesos iguais) ou
+    dicionário nome -> peso. Retorna (nomes, pesos).
+    """
+    if not isinstance(operators, dict):
+        operators = {name: 1.0 for name in operators}
+    unknown = [name for name in operators if name not in OPERATORS]
+    if unknown:
+        raise ValueError(f"Operadores desconhecidos: {', '.join(unknown)} "
+                         f"(disponíveis: {', '.join(OPERATORS)})")
+    names = [name for name, weight in operators.items() if weight > 0]
+    if not names:
+        raise ValueError("Nenhum operador de mutação selecionado")
+    return names, [operators[name] for name in names]
@@ -0,0 +1,284 @@
+import math
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from util.TSP.tsp_problem import TSPProblem
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER, Profiler
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+from algoritimos.TSP.construction import construct, warm_start
+from algoritimos.TSP.tour import Tour, make_tour
+
+
+class SimulatedAnnealing:
+    """
+    Simulated annealing sobre a mesma vizinhança do HillClimbing: inversões
+    2-opt cuja aresta nova (a, c) vem da lista de vizinhos de a, avaliadas
+    pelo delta de custo em O(1) numa estrutura de rota (ver tour.py).
+
+    Cada iteração é um patamar de temperatura com `moves_per_temperature`
+    movimentos. Os números aleatórios do patamar são sorteados em bloco pelo
+    NumPy, inclusive os limiares de aceitação -T·ln(u): um movimento com
+    delta d é aceito se d <= limiar, o que equivale a u < exp(-d / T).
+
+    Temperatura:
+    - inicial: aceita `initial_acceptance` dos movimentos de piora médios de
+      uma amostra da rota inicial
+    - resfriamento adaptativo: T *= cooling_rate ** (aceitação / target_acceptance),
+      ou seja, esfria rápido enquanto quase tudo é aceito e devagar perto do
+      congelamento (o expoente é limitado a 4)
+    - reaquecimento: após `reheat_after` patamares sem melhorar a melhor rota,
+      volta a ela com `reheat_factor` vezes a temperatura em que foi encontrada
+    """
+
+    def __init__(self, problem: TSPProblem, max_iterations: int = 200,
+                 moves_per_temperature: Optional[int] = None,
+                 initial_acceptance: float = 0.5, target_acceptance: float = 0.1,
+                 cooling_rate: float = 0.95, reheat_after: int = 20, reheat_factor: float = 3.0,
+                 initial_heuristic: str = 'nearest_neighbor', initial_route: Optional[List[str]] = None,
+                 max_evaluations: Optional[int] = None, time_limit: Optional[float] = None,
+                 target: Optional[float] = None, profiler: Optional[Profiler] = None,
+                 gap: Optional[float] = None, lower_bound: Optional[float] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 10):
+        if not 0 < initial_acceptance < 1 or not 0 < target_acceptance < 1:
+            raise ValueError("As taxas de aceitação devem estar entre 0 e 1")
+        if not 0 < cooling_rate < 1:
+            raise ValueError("A taxa de resfriamento deve estar entre 0 e 1")
+        self.problem = problem
+        self.max_iterations = max_iterations
+        # Patamares longos demais atrasam os critérios de parada, checados entre patamares
+        self.moves_per_temperature = moves_per_temperature or min(10 * len(problem.cities), 20000)
+        self.initial_acceptance = initial_acceptance
+        self.target_acceptance = target_acceptance
+        self.cooling_rate = cooling_rate
+        self.reheat_after = reheat_after
+        self.reheat_factor = reheat_factor
+        self.initial_heuristic = initial_heuristic  # Heurística construtiva da rota inicial (ver construction.py)
+        self.initial_route = initial_route  # Rota anterior para partida a quente (ver construction.warm_start)
+        self.convergence = ConvergenceRecorder()  # (iteração, avaliações, tempo, melhor) a cada patamar
+        self.tracker = RunTracker(max_evaluations, time_limit, target, gap, lower_bound)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+        self._start = problem.city_index[problem.start_city]
+
+        # Estado da execução (salvo nos checkpoints)
+        self._iteration = 0
+        self._tour: Optional[Tour] = None
+        self._current_distance = float('inf')
+        self._best_solution: Optional[List[str]] = None
+        self._best_distance = float('inf')
+        self._temperature = 0.0
+        self._best_temperature = 0.0  # Temperatura em que a melhor rota foi encontrada
+        self._stall = 0  # Patamares sem melhorar a melhor rota
+
+    def _initial_route(self) -> List[str]:
+        """Rota anterior corrigida e melhorada (partida a quente), se houver, ou a da heurística construtiva"""
+        if self.initial_route is not None:
+            return self.problem.to_city_tour(warm_start(self.problem, self.initial_route))
+        return self.problem.to_city_tour(construct(self.problem, self.initial_heuristic))
+
+    def _record(self):
+        self.convergence.record(self._iteration, self.tracker.evaluations, self.tracker.elapsed,
+                                self._best_distance)
+
+    def _initial_temperature(self, samples: int = 1000) -> float:
+        """Temperatura que aceita `initial_acceptance` dos movimentos de piora médios da rota inicial"""
+        weights = self.problem.int_weights
+        neighbors = self.problem.neighbor_lists
+        tour = self._tour
+        n = len(tour)
+        cities = np.random.randint(n, size=samples).tolist()
+        picks = np.random.random(samples).tolist()
+        uphill = []
+        for a, r in zip(cities, picks):
+            candidates = neighbors[a]
+            c = candidates[int(r * len(candidates))]
+            b, d = tour.next(a), tour.next(c)
+            if c == b or d == a or d not in weights[b]:
+                continue
+            delta = weights[a][c] + weights[b][d] - weights[a][b] - weights[c][d]
+            if delta > 0:
+                uphill.append(delta)
+        if not uphill:
+            return 1e-9
+        return -sum(uphill) / len(uphill) / math.log(self.initial_acceptance)
+
+    def _save_best(self):
+        self._best_solution = self.problem.to_city_tour(self._tour.to_list(self._start))
+
+    def _anneal(self) -> int:
+        """Um patamar de temperatura; retorna o número de movimentos aceitos"""
+        weights = self.problem.int_weights
+        neighbors = self.problem.neighbor_lists
+        tour = self._tour
+        tracker = self.tracker
+        n = len(tour)
+        moves = self.moves_per_temperature
+
+        # Sorteios do patamar inteiro de uma vez
+        cities = np.random.randint(n, size=moves).tolist()
+        picks = np.random.random(moves).tolist()
+        thresholds = (-self._temperature * np.log1p(-np.random.random(moves))).tolist()
+
+        current = self._current_distance
+        best = self._best_distance
+        pending = False  # A rota corrente é a melhor, mas ainda não foi copiada
+        accepted = rejected = counted = evaluations = 0
+        for a, r, threshold in zip(cities, picks, thresholds):
+            candidates = neighbors[a]
+            c = candidates[int(r * len(candidates))]
+            b, d = tour.next(a), tour.next(c)
+            if c == b or d == a:
+                rejected += 1
+                continue
+            w_bd = weights[b].get(d)
+            if w_bd is None:
+                rejected += 1
+                continue
+            evaluations += 1
+            delta = weights[a][c] + w_bd - weights[a][b] - weights[c][d]
+            if delta > threshold:
+                continue
+
+            if pending and delta > 0:
+                # Vai sair da melhor rota: copia antes de aplicar o movimento
+                self._save_best()
+                pending = False
+            tour.two_opt_move(a, b, c, d)
+            current += delta
+            accepted += 1
+            if current < best:
+                best = current
+                pending = True
+                tracker.count(evaluations - counted)
+                counted = evaluations
+                tracker.update(current)
+
+        tracker.count(evaluations - counted)
+        self.profiler.count('rejected_inversions', rejected)
+        if pending:
+            self._save_best()
+        if best < self._best_distance:
+            self._best_distance = best
+            self._best_temperature = self._temperature
+            self._stall = 0
+        else:
+            self._stall += 1
+        self._current_distance = current
+        return accepted
+
+    def _cool(self, accepted: int):
+        """Resfriamento guiado pela taxa de aceitação do patamar, com reaquecimento na estagnação"""
+        if self._stall >= self.reheat_after:
+            self._tour = make_tour(self.problem.to_int_tour(self._best_solution))
+            self._current_distance = self._best_distance
+            self._temperature = self.reheat_factor * self._best_temperature
+            self._stall = 0
+            self.profiler.count('reheats')
+            return
+        acceptance = accepted / self.moves_per_temperature
+        self._temperature *= self.cooling_rate ** min(acceptance / self.target_acceptance, 4.0)
+
+    def adopt_incumbent(self, route: List[str], distance: float):
+        """
+        Recomeça da rota recebida (ver util/TSP/portfolio.py) se ela for melhor
+        que a melhor, sem mudar a temperatura
+        """
+        if distance < self._best_distance:
+            self._best_solution = list(route)
+            self._best_distance = self._current_distance = distance
+            self._best_temperature = self._temperature
+            self._tour = make_tour(self.problem.to_int_tour(route))
+            self._stall = 0
+            self.tracker.update(distance)
+
+    def _get_state(self) -> dict:
+        return {
+            'problem': self.problem.fingerprint(),
+            'iteration': self._iteration,
+            'current_solution': self.problem.to_city_tour(self._tour.to_list(self._start)),
+            'current_distance': self._current_distance,
+            'best_solution': self._best_solution,
+            'best_distance': self._best_distance,
+            'temperature': self._temperature,
+            'best_temperature': self._best_temperature,
+            'stall': self._stall,
+            'convergence': self.convergence.get_state(),
+            'tracker': self.tracker.get_state(),
+        }
+
+    def _set_state(self, state: dict):
+        if state['problem'] != self.problem.fingerprint():
+            raise ValueError("O checkpoint pertence a outra instância do problema")
+        self._iteration = state['iteration']
+        self._tour = make_tour(self.problem.to_int_tour(state['current_solution']))
+        self._current_distance = state['current_distance']
+        self._best_solution = state['best_solution']
+        self._best_distance = state['best_distance']
+        self._temperature = state['temperature']
+        self._best_temperature = state['best_temperature']
+        self._stall = state['stall']
+        self.convergence.set_state(state['convergence'])
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path: str) -> List[str]:
+        """Continua uma execução a partir de um checkpoint gravado por solve()"""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.result()
+
+    def solve(self) -> List[str]:
+        for _ in self.solve_iter():
+            pass
+        return self.result()
+
+    def result(self) -> List[str]:
+        """Melhor rota encontrada até agora (incluindo as adotadas do portfólio)"""
+        return self._best_solution
+
+    def solve_iter(self, resume: Optional[str] = None) -> Iterator[dict]:
+        """
+        Executa a busca produzindo um snapshot por patamar de temperatura
+        (iteration, best_cost, best_solution, evaluations, elapsed). Parar de
+        consumir o iterador interrompe a busca; `resume` continua a partir de
+        um checkpoint.
+        """
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self.tracker.start()
+            # Parada por gap: calcula o limite inferior se não foi fornecido
+            if self.tracker.gap is not None and self.tracker.lower_bound is None:
+                from util.TSP.bounds import held_karp_bound  # scipy, só quando há parada por gap
+                with self.profiler.phase('bound'):
+                    self.tracker.lower_bound = held_karp_bound(self.problem)
+            with self.profiler.phase('init'):
+                self._best_solution = self._initial_route()
+                self._tour = make_tour(self.problem.to_int_tour(self._best_solution))
+                self._temperature = self._best_temperature = self._initial_temperature()
+            with self.profiler.phase('evaluation'):
+                self._best_distance = self._current_distance = self.problem.path_distance(self._best_solution)
+            self.tracker.count()
+            self.tracker.update(self._best_distance)
+            self._iteration = 0
+            self._stall = 0
+            self._record()
+
+        while self._iteration < self.max_iterations:
+            if self.tracker.should_stop():
+                break
+
+            with self.profiler.phase('annealing'):
+                accepted = self._anneal()
+                self._cool(accepted)
+
+            self._iteration += 1
+            self._record()
+            self.checkpointer.maybe_save(type(self).__name__, self._iteration, self._get_state)
+            yield self.tracker.snapshot(self._iteration, self._best_distance, self._best_solution)
+
+        self.tracker.finish()
@@ -0,0 +1,322 @@
+import random
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from util.TSP.tsp_problem import TSPProblem
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER, Profiler
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+from algoritimos.TSP.construction import construct, warm_start
+from algoritimos.TSP.local_search import improve
+from algoritimos.TSP.tour import Tour, make_tour
+
+EPSILON = 1e-9
+
+
+class TabuSearch:
+    """
+    Busca tabu com movimentos 2-opt sobre as listas de vizinhos, avaliados pelo
+    delta de custo em O(1) numa estrutura de rota (ver tour.py).
+
+    Atributo tabu: as arestas removidas por um movimento não podem voltar à
+    rota pelos próximos `tenure` movimentos. As validades ficam num dicionário
+    indexado pela aresta (chave min·N + max), então a consulta é O(1) sem uma
+    matriz N×N. Um movimento tabu é aceito se levar a uma rota melhor que a
+    melhor já encontrada (critério de aspiração).
+
+    A busca parte de um ótimo local de improve() (ver local_search.py). Cada
+    iteração avalia todos os 2-opt (pelo sucessor e pelo predecessor) de uma
+    lista de `candidate_size` cidades e aplica o melhor movimento admissível,
+    mesmo que piore a rota. A lista junta as pontas dos movimentos recentes,
+    onde a rota acabou de mudar, e cidades percorridas em rodízio, o que fixa
+    o custo por iteração.
+
+    Diversificação: após `diversify_after` movimentos sem melhorar a melhor
+    rota, recomeça dela com `kick_moves` inversões válidas sorteadas seguidas
+    de improve().
+    """
+
+    def __init__(self, problem: TSPProblem, max_iterations: int = 1000,
+                 candidate_size: int = 200, tenure: Optional[int] = None,
+                 diversify_after: int = 200, kick_moves: Optional[int] = None,
+                 initial_heuristic: str = 'nearest_neighbor', initial_route: Optional[List[str]] = None,
+                 max_evaluations: Optional[int] = None, time_limit: Optional[float] = None,
+                 target: Optional[float] = None, profiler: Optional[Profiler] = None,
+                 gap: Optional[float] = None, lower_bound: Optional[float] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 100):
+        n = len(problem.cities)
+        self.problem = problem
+        self.max_iterations = max_iterations
+        self.candidate_size = min(candidate_size, n)
+        self.tenure = tenure if tenure is not None else max(5, min(n // 4, 30))
+        self.diversify_after = diversify_after
+        self.kick_moves = kick_moves if kick_moves is not None else max(3, n // 50)
+        self.initial_heuristic = initial_heuristic  # Heurística construtiva da rota inicial (ver construction.py)
+        self.initial_route = initial_route  # Rota anterior para partida a quente (ver construction.warm_start)
+        self.convergence = ConvergenceRecorder()  # (iteração, avaliações, tempo, melhor) a cada iteração
+        self.tracker = RunTracker(max_evaluations, time_limit, target, gap, lower_bound)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+        self._start = problem.city_index[problem.start_city]
+
+        # Estado da execução (salvo nos checkpoints)
+        self._iteration = 0
+        self._tour: Optional[Tour] = None
+        self._current_distance = float('inf')
+        self._best_solution: Optional[List[str]] = None
+        self._best_distance = float('inf')
+        self._tabu: Dict[int, int] = {}  # Aresta -> número de movimentos até o qual ela é tabu
+        self._moves = 0  # Movimentos aplicados (o relógio das validades tabu)
+        self._cursor = 0  # Próxima cidade a examinar no rodízio
+        self._recent = deque(maxlen=self.candidate_size // 2)  # Pontas dos últimos movimentos
+        self._since_best = 0  # Movimentos desde a última melhora da melhor rota
+
+    def _initial_route(self) -> List[str]:
+        """Rota anterior corrigida e melhorada (partida a quente), se houver, ou a da heurística construtiva"""
+        if self.initial_route is not None:
+            return self.problem.to_city_tour(warm_start(self.problem, self.initial_route))
+        return self.problem.to_city_tour(construct(self.problem, self.initial_heuristic))
+
+    def _record(self):
+        self.convergence.record(self._iteration, self.tracker.evaluations, self.tracker.elapsed,
+                                self._best_distance)
+
+    def _candidates(self) -> List[int]:
+        """Pontas dos movimentos recentes (as mais novas primeiro) completadas pelo rodízio"""
+        n = len(self._tour)
+        candidates = list(dict.fromkeys(reversed(self._recent)))
+        cursor = self._cursor
+        while len(candidates) < self.candidate_size:
+            candidates.append(cursor)
+            cursor = cursor + 1 if cursor + 1 < n else 0
+        self._cursor = cursor
+        return candidates
+
+    def _scan(self, candidates: List[int]) -> Tuple[Optional[Tuple[float, int, int, int, int]], int]:
+        """
+        Avalia os 2-opt de cada cidade de `candidates`.
+        Retorna (melhor movimento admissível (delta, a, b, c, d) ou None, avaliações)
+        """
+        weights = self.problem.int_weights
+        neighbors = self.problem.neighbor_lists
+        tour, tabu, moves = self._tour, self._tabu, self._moves
+        n = len(tour)
+        aspiration = self._best_distance - self._current_distance - EPSILON
+
+        best = None
+        best_delta = float('inf')
+        evaluations = 0
+        for a in candidates:
+            weights_a = weights[a]
+
+            # Sucessor: (a, b), (c, d) -> (a, c), (b, d)
+            b = tour.next(a)
+            w_ab = weights_a[b]
+            for c in neighbors[a]:
+                d = tour.next(c)
+                if c == b or d == a:
+                    continue
+                w_bd = weights[b].get(d)
+                if w_bd is None:
+                    continue
+                evaluations += 1
+                delta = weights_a[c] + w_bd - w_ab - weights[c][d]
+                if delta < best_delta and (
+                        delta < aspiration or
+                        (tabu.get(a * n + c if a < c else c * n + a, -1) <= moves and
+                         tabu.get(b * n + d if b < d else d * n + b, -1) <= moves)):
+                    best_delta, best = delta, (delta, a, b, c, d)
+
+            # Predecessor: (p, a), (e, c) -> (p, e), (a, c)
+            p = tour.prev(a)
+            w_pa = weights[p][a]
+            for c in neighbors[a]:
+                e = tour.prev(c)
+                if c == p or e == a:
+                    continue
+                w_pe = weights[p].get(e)
+                if w_pe is None:
+                    continue
+                evaluations += 1
+                delta = weights_a[c] + w_pe - w_pa - weights[e][c]
+                if delta < best_delta and (
+                        delta < aspiration or
+                        (tabu.get(a * n + c if a < c else c * n + a, -1) <= moves and
+                         tabu.get(p * n + e if p < e else e * n + p, -1) <= moves)):
+                    best_delta, best = delta, (delta, p, a, e, c)
+        return best, evaluations
+
+    def _apply(self, move: Tuple[float, int, int, int, int]):
+        """Aplica o 2-opt (a, b), (c, d) -> (a, c), (b, d) e torna tabu a volta das arestas removidas"""
+        delta, a, b, c, d = move
+        n = len(self._tour)
+        self._tour.two_opt_move(a, b, c, d)
+        self._moves += 1
+        expiry = self._moves + self.tenure
+        self._tabu[a * n + b if a < b else b * n + a] = expiry
+        self._tabu[c * n + d if c < d else d * n + c] = expiry
+        if len(self._tabu) > 4 * n:
+            # Descarta as validades vencidas para o dicionário não crescer sem limite
+            self._tabu = {edge: until for edge, until in self._tabu.items() if until > self._moves}
+        self._recent.extend((a, b, c, d))
+        self._current_distance += delta
+        self._update_best()
+
+    def _update_best(self):
+        if self._current_distance < self._best_distance - EPSILON:
+            self._best_distance = self._current_distance
+            self._best_solution = self.problem.to_city_tour(self._tour.to_list(self._start))
+            self.tracker.update(self._best_distance)
+            self._since_best = 0
+        else:
+            self._since_best += 1
+
+    def _descend(self):
+        """Leva a rota corrente a um ótimo local de 2-opt/Or-opt"""
+        delta, moves = improve(self._tour, self.problem.int_weights, self.problem.neighbor_lists)
+        self.profiler.count('local_search_moves', moves)
+        self._current_distance += delta
+
+    def _diversify(self):
+        """Recomeça da melhor rota com `kick_moves` inversões válidas sorteadas, seguidas de improve()"""
+        weights = self.problem.int_weights
+        neighbors = self.problem.neighbor_lists
+        tour = make_tour(self.problem.to_int_tour(self._best_solution))
+        distance = self._best_distance
+        n = len(tour)
+        for _ in range(self.kick_moves):
+            for _ in range(100):  # Tenta no máximo 100 inversões diferentes
+                a = random.randrange(n)
+                c = random.choice(neighbors[a])
+                b, d = tour.next(a), tour.next(c)
+                if c != b and d != a and d in weights[b]:
+                    distance += weights[a][c] + weights[b][d] - weights[a][b] - weights[c][d]
+                    tour.two_opt_move(a, b, c, d)
+                    self._recent.extend((a, b, c, d))
+                    break
+        self._tour = tour
+        self._current_distance = distance
+        self._tabu = {}
+        self._descend()
+        self._since_best = 0
+        self._update_best()
+        self.profiler.count('diversifications')
+
+    def _step(self):
+        """Uma iteração: avalia a lista de candidatos e aplica o melhor movimento admissível"""
+        move, evaluations = self._scan(self._candidates())
+        self.tracker.count(evaluations)
+        if move is None:
+            self.profiler.count('no_admissible_move')
+            self._since_best += 1
+        else:
+            self._apply(move)
+
+        if self._since_best >= self.diversify_after:
+            self._diversify()
+
+    def adopt_incumbent(self, route: List[str], distance: float):
+        """Recomeça da rota recebida (ver util/TSP/portfolio.py) se ela for melhor que a melhor"""
+        if distance < self._best_distance:
+            self._best_solution = list(route)
+            self._best_distance = self._current_distance = distance
+            self._tour = make_tour(self.problem.to_int_tour(route))
+            self._recent.clear()
+            self._since_best = 0
+            self.tracker.update(distance)
+
+    def _get_state(self) -> dict:
+        return {
+            'problem': self.problem.fingerprint(),
+            'iteration': self._iteration,
+            'current_solution': self.problem.to_city_tour(self._tour.to_list(self._start)),
+            'current_distance': self._current_distance,
+            'best_solution': self._best_solution,
+            'best_distance': self._best_distance,
+            'tabu': dict(self._tabu),
+            'moves': self._moves,
+            'cursor': self._cursor,
+            'recent': list(self._recent),
+            'since_best': self._since_best,
+            'convergence': self.convergence.get_state(),
+            'tracker': self.tracker.get_state(),
+        }
+
+    def _set_state(self, state: dict):
+        if state['problem'] != self.problem.fingerprint():
+            raise ValueError("O checkpoint pertence a outra instância do problema")
+        self._iteration = state['iteration']
+        self._tour = make_tour(self.problem.to_int_tour(state['current_solution']))
+        self._current_distance = state['current_distance']
+        self._best_solution = state['best_solution']
+        self._best_distance = state['best_distance']
+        self._tabu = dict(state['tabu'])
+        self._moves = state['moves']
+        self._cursor = state['cursor']
+        self._recent = deque(state['recent'], maxlen=self.candidate_size // 2)
+        self._since_best = state['since_best']
+        self.convergence.set_state(state['convergence'])
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path: str) -> List[str]:
+        """Continua uma execução a partir de um checkpoint gravado por solve()"""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.result()
+
+    def solve(self) -> List[str]:
+        for _ in self.solve_iter():
+            pass
+        return self.result()
+
+    def result(self) -> List[str]:
+        """Melhor rota encontrada até agora (incluindo as adotadas do portfólio)"""
+        return self._best_solution
+
+    def solve_iter(self, resume: Optional[str] = None) -> Iterator[dict]:
+        """
+        Executa a busca produzindo um snapshot por iteração (iteration, best_cost,
+        best_solution, evaluations, elapsed). Parar de consumir o iterador
+        interrompe a busca; `resume` continua a partir de um checkpoint.
+        """
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self.tracker.start()
+            # Parada por gap: calcula o limite inferior se não foi fornecido
+            if self.tracker.gap is not None and self.tracker.lower_bound is None:
+                from util.TSP.bounds import held_karp_bound  # scipy, só quando há parada por gap
+                with self.profiler.phase('bound'):
+                    self.tracker.lower_bound = held_karp_bound(self.problem)
+            with self.profiler.phase('init'):
+                self._best_solution = self._initial_route()
+                self._tour = make_tour(self.problem.to_int_tour(self._best_solution))
+            with self.profiler.phase('evaluation'):
+                self._best_distance = self._current_distance = self.problem.path_distance(self._best_solution)
+            self.tracker.count()
+            self.tracker.update(self._best_distance)
+            with self.profiler.phase('local_search'):
+                self._descend()
+                self._update_best()
+            self._iteration = 0
+            self._tabu = {}
+            self._moves = self._cursor = self._since_best = 0
+            self._recent.clear()
+            self._record()
+
+        while self._iteration < self.max_iterations:
+            if self.tracker.should_stop():
+                break
+
+            with self.profiler.phase('search'):
+                self._step()
+
+            self._iteration += 1
+            self._record()
+            self.checkpointer.maybe_save(type(self).__name__, self._iteration, self._get_state)
+            yield self.tracker.snapshot(self._iteration, self._best_distance, self._best_solution)
+
+        self.tracker.finish()
@@ -0,0 +1,316 @@
+"""
+Representações de rota para busca local em instâncias grandes.
+
+Uma rota é um ciclo sobre as cidades 0..N-1 com um sentido de percurso.
+Todas as implementações oferecem next, prev, between e reverse; reverse(a, b)
+inverte o caminho de a até b no sentido da rota ou, se ele tiver mais da
+metade das cidades, o caminho complementar, que produz o mesmo ciclo
+percorrido no sentido oposto. Por isso os movimentos compostos
+(two_opt_move, move_segment) são descritos pelas arestas trocadas, e não por
+posições. A escolha depende só do número de cidades, então o sentido da
+rota resultante é o mesmo em todas as implementações (e numa TwoLevelTour
+reconstruída com outra divisão em segmentos, como ao retomar um checkpoint).
+
+- ArrayTour: lista + índice de posições; next/prev/between em O(1), reverse
+  em O(N) (no máximo N/2 cidades)
+- TwoLevelTour: lista duplamente encadeada em dois níveis, com ~√N segmentos
+  com bit de inversão; next/prev/between em O(1), reverse em O(√N) amortizado
+"""
+import math
+from typing import List, Optional
+
+
+class Tour:
+    """Classe base: operações primitivas implementadas pelas subclasses e movimentos compostos."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def next(self, city: int) -> int:
+        raise NotImplementedError
+
+    def prev(self, city: int) -> int:
+        raise NotImplementedError
+
+    def between(self, a: int, b: int, c: int) -> bool:
+        """Se b está no caminho que vai de a até c no sentido da rota (inclusive)"""
+        raise NotImplementedError
+
+    def reverse(self, a: int, b: int):
+        """Inverte o caminho de a até b ou, se ele passar de metade da rota, o complementar (mesmo ciclo)"""
+        raise NotImplementedError
+
+    def to_list(self, start: int) -> List[int]:
+        """Cidades na ordem da rota, começando em `start`"""
+        raise NotImplementedError
+
+    def two_opt_move(self, a: int, b: int, c: int, d: int):
+        """
+        Troca as arestas (a, b) e (c, d), percorridas no mesmo sentido
+        (b = next(a), d = next(c) ou ambas no sentido oposto), por (a, c) e (b, d)
+        """
+        if self.next(a) == b:
+            self.reverse(b, c)
+        else:
+            self.reverse(a, d)
+
+    def move_segment(self, first: int, last: int, c: int, d: int):
+        """
+        Realoca o caminho first..last (no sentido da rota) para entre c e
+        d = next(c), fora dele, ficando c -> first ... last -> d. Feito com três
+        movimentos 2-opt, cada um descrito pelas arestas atuais
+        """
+        p, nxt = self.prev(first), self.next(last)
+        # p F..L nxt ... c d  ->  p c ... nxt L..F d  ->  p nxt ... c L..F d  ->  p nxt ... c F..L d
+        self.two_opt_move(p, first, c, d)
+        self.two_opt_move(p, c, nxt, last)
+        self.two_opt_move(c, last, first, d)
+
+
+class ArrayTour(Tour):
+    """Rota em lista com índice de posições (pos[cidade] = posição na lista)"""
+
+    def __init__(self, order: List[int]):
+        self.order = list(order)
+        self.pos = [0] * len(order)
+        for i, city in enumerate(self.order):
+            self.pos[city] = i
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def next(self, city: int) -> int:
+        i = self.pos[city] + 1
+        return self.order[i if i < len(self.order) else 0]
+
+    def prev(self, city: int) -> int:
+        return self.order[self.pos[city] - 1]
+
+    def between(self, a: int, b: int, c: int) -> bool:
+        pa, pb, pc = self.pos[a], self.pos[b], self.pos[c]
+        if pa <= pc:
+            return pa <= pb <= pc
+        return pb >= pa or pb <= pc
+
+    def reverse(self, a: int, b: int):
+        order, pos = self.order, self.pos
+        n = len(order)
+        i, j = pos[a], pos[b]
+        length = (j - i) % n + 1
+        if 2 * length > n:  # Inverte o complementar, que é menor
+            i, j, length = (j + 1) % n, (i - 1) % n, n - length
+        if length < 2:
+            return
+        if i <= j:
+            order[i:j + 1] = order[i:j + 1][::-1]
+            for k in range(i, j + 1):
+                pos[order[k]] = k
+        else:
+            for k in range(length // 2):
+                x, y = (i + k) % n, (j - k) % n
+                order[x], order[y] = order[y], order[x]
+                pos[order[x]], pos[order[y]] = x, y
+
+    def to_list(self, start: int) -> List[int]:
+        i = self.pos[start]
+        return self.order[i:] + self.order[:i]
+
+
+class TwoLevelTour(Tour):
+    """
+    Lista duplamente encadeada de dois níveis: a rota é uma lista circular de
+    segmentos de ~√N/2 cidades, cada um com um bit de inversão e um rank (com
+    folgas, para inserir segmentos sem renumerar). reverse(a, b) inverte no
+    próprio segmento caminhos curtos; nos demais casos divide no máximo dois
+    segmentos para que o caminho comece e termine em fronteiras e inverte a
+    ordem e o bit dos segmentos do caminho ou do complementar, o que tiver
+    menos cidades. Quando o número de segmentos dobra, a estrutura é
+    reconstruída.
+    """
+    RANK_GAP = 1 << 16
+
+    def __init__(self, order: List[int], segment_size: Optional[int] = None):
+        n = len(order)
+        self.segment_size = segment_size or max(8, math.isqrt(n) // 2)
+        self._segment = [0] * n  # Segmento de cada cidade
+        self._index = [0] * n  # Posição da cidade na lista do seu segmento
+        self._build(list(order))
+
+    def _build(self, order: List[int]):
+        size = self.segment_size
+        self._items = [order[k:k + size] for k in range(0, len(order), size)]
+        m = len(self._items)
+        self._reversed = [False] * m
+        self._next_segment = [(s + 1) % m for s in range(m)]
+        self._prev_segment = [(s - 1) % m for s in range(m)]
+        self._rank = [s * self.RANK_GAP for s in range(m)]
+        self._max_segments = 2 * m + 2
+        for s in range(m):
+            self._place(s, 0)
+
+    def _place(self, s: int, begin: int):
+        """Atualiza segmento e índice das cidades de _items[s] a partir de `begin`"""
+        segment, index = self._segment, self._index
+        items = self._items[s]
+        for i in range(begin, len(items)):
+            city = items[i]
+            segment[city] = s
+            index[city] = i
+
+    def __len__(self) -> int:
+        return len(self._segment)
+
+    def _first(self, s: int) -> int:
+        items = self._items[s]
+        return items[-1] if self._reversed[s] else items[0]
+
+    def _last(self, s: int) -> int:
+        items = self._items[s]
+        return items[0] if self._reversed[s] else items[-1]
+
+    def _offset(self, city: int) -> int:
+        """Posição da cidade no seu segmento, no sentido da rota"""
+        s = self._segment[city]
+        i = self._index[city]
+        return len(self._items[s]) - 1 - i if self._reversed[s] else i
+
+    def next(self, city: int) -> int:
+        s = self._segment[city]
+        items = self._items[s]
+        i = self._index[city] + (-1 if self._reversed[s] else 1)
+        if 0 <= i < len(items):
+            return items[i]
+        return self._first(self._next_segment[s])
+
+    def prev(self, city: int) -> int:
+        s = self._segment[city]
+        items = self._items[s]
+        i = self._index[city] + (1 if self._reversed[s] else -1)
+        if 0 <= i < len(items):
+            return items[i]
+        return self._last(self._prev_segment[s])
+
+    def between(self, a: int, b: int, c: int) -> bool:
+        rank, segment = self._rank, self._segment
+        ka = (rank[segment[a]], self._offset(a))
+        kb = (rank[segment[b]], self._offset(b))
+        kc = (rank[segment[c]], self._offset(c))
+        if ka <= kc:
+            return ka <= kb <= kc
+        return kb >= ka or kb <= kc
+
+    def _renumber(self, s: int):
+        """Redistribui os ranks com folga, a partir do segmento s"""
+        for r in range(len(self._items)):
+            self._rank[s] = r * self.RANK_GAP
+            s = self._next_segment[s]
+
+    def _link_after(self, t: int, s: int):
+        """Encadeia o segmento novo t logo depois de s, com um rank entre os vizinhos"""
+        u = self._next_segment[s]
+        self._next_segment.append(u)
+        self._prev_segment.append(s)
+        self._next_segment[s] = self._prev_segment[u] = t
+        low, high = self._rank[s], self._rank[u]
+        if low < high:
+            if high - low < 2:
+                self._rank.append(0)
+                self._renumber(u)
+                return
+            self._rank.append((low + high) // 2)
+        else:  # Fronteira de volta da lista circular
+            self._rank.append(low + self.RANK_GAP)
+
+    def _split_before(self, city: int):
+        """Divide o segmento de `city` para que ela passe a ser a primeira de um segmento"""
+        k = self._offset(city)
+        if k == 0:
+            return
+        s = self._segment[city]
+        items = self._items[s]
+        t = len(self._items)
+        # A parte do fim da lista muda de segmento (a do começo mantém os índices)
+        if self._reversed[s]:
+            cut = len(items) - k  # Cidades antes de `city` na rota: vão para t, antes de s
+            self._items.append(items[cut:])
+            self._reversed.append(True)
+            self._link_after(t, self._prev_segment[s])
+        else:
+            cut = k  # `city` e as seguintes vão para t, depois de s
+            self._items.append(items[cut:])
+            self._reversed.append(False)
+            self._link_after(t, s)
+        del items[cut:]
+        self._place(t, 0)
+
+    def reverse(self, a: int, b: int):
+        if a == b:
+            return
+        n = len(self)
+        s = self._segment[a]
+        if (s == self._segment[b] and self._offset(a) < self._offset(b)
+                and 2 * (self._offset(b) - self._offset(a) + 1) <= n):
+            # Caminho dentro de um segmento: inverte a fatia da lista
+            i, j = sorted((self._index[a], self._index[b]))
+            items = self._items[s]
+            items[i:j + 1] = items[i:j + 1][::-1]
+            self._place(s, i)
+            return
+
+        if len(self._items) >= self._max_segments:
+            self._build(self.to_list(a))
+        self._split_before(a)
+        self._split_before(self.next(b))
+        # Depois das divisões o caminho a..b é formado por segmentos inteiros.
+        # Conta as cidades dele até passar da metade da rota, como a ArrayTour,
+        # e nesse caso inverte o complementar
+        next_segment, items = self._next_segment, self._items
+        first, last = self._segment[a], self._segment[b]
+        outside_first, outside_last = next_segment[last], self._prev_segment[first]
+        if outside_first == first:
+            return  # O caminho é a rota inteira
+        x, length = first, len(items[first])
+        while x != last and 2 * length <= n:
+            x = next_segment[x]
+            length += len(items[x])
+        if 2 * length > n:
+            first, last = outside_first, outside_last
+        self._reverse_segments(first, last)
+
+    def _reverse_segments(self, first: int, last: int):
+        """Inverte a sequência de segmentos first..last, que não é a lista inteira"""
+        next_segment, prev_segment = self._next_segment, self._prev_segment
+        before, after = prev_segment[first], next_segment[last]
+        run = [first]
+        while run[-1] != last:
+            run.append(next_segment[run[-1]])
+        ranks = [self._rank[s] for s in run]
+        for s, r in zip(reversed(run), ranks):
+            self._rank[s] = r
+            next_segment[s], prev_segment[s] = prev_segment[s], next_segment[s]
+            self._reversed[s] = not self._reversed[s]
+        next_segment[before], prev_segment[last] = last, before
+        next_segment[first], prev_segment[after] = after, first
+
+    def to_list(self, start: int) -> List[int]:
+        s = self._segment[start]
+        k = self._offset(start)
+        sequence = []
+        t = s
+        while True:
+            sequence.extend(self._items[t][::-1] if self._reversed[t] else self._items[t])
+            t = self._next_segment[t]
+            if t == s:
+                break
+        return sequence[k:] + sequence[:k]
+
+
+# A partir deste tamanho a lista de dois níveis compensa o custo de manter os segmentos
+TWO_LEVEL_THRESHOLD = 2000
+
+
+def make_tour(order: List[int]) -> Tour:
+    """ArrayTour para rotas pequenas, TwoLevelTour a partir de TWO_LEVEL_THRESHOLD cidades"""
+    if len(order) >= TWO_LEVEL_THRESHOLD:
+        return TwoLevelTour(order)
+    return ArrayTour(order)
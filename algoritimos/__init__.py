@@ -1,3 +1,6 @@
 from .TSP.hill_climbing import HillClimbing
+from .TSP.simulated_annealing import SimulatedAnnealing
+from .TSP.tabu_search import TabuSearch
 from .TSP.ant_colony import AntColony
-from .TSP.genetic_algorithm import GeneticAlgorithm
\ No newline at end of file
+from .TSP.genetic_algorithm import GeneticAlgorithm
+from .TSP.held_karp import HeldKarp
\ No newline at end of file
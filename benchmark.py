@@ -0,0 +1,266 @@
+import argparse
+import csv
+import io
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+
+from util import TSPProblem
+from util.statistics import describe
+from util.seeding import seed_everything
+from util.TSP.generator import generate_sparse_instance, generate_geometric_instance, write_instance
+from algoritimos import GeneticAlgorithm, AntColony, HillClimbing, SimulatedAnnealing, TabuSearch, HeldKarp
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHWEFEL_DIR = os.path.join(ROOT_DIR, 'schwefel_optimization')
+
+# Solver configurations benchmarked on every TSP instance
+TSP_SOLVERS = {
+    'Hill Climbing': (HillClimbing, {'max_iterations': 1000}),
+    'Simulated Annealing': (SimulatedAnnealing, {'max_iterations': 200}),
+    'Tabu Search': (TabuSearch, {'max_iterations': 1000}),
+    'Genetic Algorithm': (GeneticAlgorithm, {'population_size': 50, 'generations': 100}),
+    'Ant Colony': (AntColony, {'num_ants': 10, 'iterations': 50}),
+    'Held-Karp (exact)': (HeldKarp, {}),  # Only on instances HeldKarp.supports(), without a budget
+}
+
+# Schwefel solvers are imported inside the worker (module, class, params)
+SCHWEFEL_SOLVERS = {
+    'Genetic Algorithm': ('genetic_algorithm_schwefel', 'GeneticAlgorithmSchwefel',
+                          {'population_size': 100, 'generations': 300, 'mutation_rate': 0.1,
+                           'crossover_rate': 0.8, 'tournament_size': 5}),
+    'Ant Colony (ACO_R)': ('ant_colony_schwefel', 'AntColonySchwefel',
+                           {'num_ants': 50, 'iterations': 200, 'archive_size': 20, 'q': 0.5, 'xi': 0.85}),
+    'Hill Climbing (Restarts)': ('hill_climbing_schwefel', 'HillClimbingSchwefel',
+                                 {'max_iterations_per_climb': 150, 'num_restarts': 100, 'step_size': 5.0}),
+}
+
+METRICS = ('quality', 'time', 'evaluations', 'evals_per_second')
+
+_problems = {}
+
+
+def _load_tsp(path):
+    """Loads each instance once per worker process"""
+    if path not in _problems:
+        _problems[path] = TSPProblem(path)
+    return _problems[path]
+
+
+def run_tsp_task(task):
+    problem = _load_tsp(task['instance_path'])
+    algorithm_class, params = TSP_SOLVERS[task['solver']]
+    seed_everything(task['seed'])
+
+    start_time = time.perf_counter()
+    solver = algorithm_class(problem, **params, **task['budget'])
+    solution = solver.solve()
+    exec_time = time.perf_counter() - start_time
+    summary = solver.tracker.summary()
+
+    return {
+        'quality': problem.path_distance(solution) if solution else float('inf'),
+        'time': exec_time,
+        'evaluations': summary['evaluations'],
+        'evals_per_second': summary['evals_per_second'],
+        'stop_reason': summary['stop_reason'],
+    }
+
+
+def run_schwefel_task(task):
+    if SCHWEFEL_DIR not in sys.path:
+        sys.path.insert(0, SCHWEFEL_DIR)
+    from benchmark_functions import get_problem
+
+    module_name, class_name, params = SCHWEFEL_SOLVERS[task['solver']]
+    solver_class = getattr(__import__(module_name), class_name)
+    problem = get_problem(task['function'], task['dimensions'])
+    seed_everything(task['seed'])
+
+    solver = solver_class(problem=problem, **params, **task['budget'])
+    with redirect_stdout(io.StringIO()):  # solve() prints its own report
+        result = solver.solve()
+
+    return {
+        'quality': float(result['fitness']),
+        'precision': float(result['precision']),
+        'time': result['time'],
+        'evaluations': result['evaluations'],
+        'evals_per_second': result['evals_per_second'],
+        'stop_reason': result['stop_reason'],
+    }
+
+
+def run_task(task):
+    runner = run_tsp_task if task['suite'] == 'tsp' else run_schwefel_task
+    try:
+        result = runner(task)
+        result['error'] = None
+    except Exception as e:
+        result = {'quality': None, 'error': str(e)}
+    if result['quality'] is not None and not np.isfinite(result['quality']):
+        result['quality'] = None  # infeasible tour; keeps the JSON output standard
+    return {**task, **result}
+
+
+def prepare_tsp_instances(sizes, degree, output_dir, include_base=True, generator='sparse'):
+    """Returns {instance name: path}, generating the random sparse graphs"""
+    instances = {}
+    if include_base:
+        instances['distancias.txt'] = os.path.join(ROOT_DIR, 'distancias.txt')
+
+    instance_dir = os.path.join(output_dir, 'instances')
+    os.makedirs(instance_dir, exist_ok=True)
+    for size in sizes:
+        name = f"{generator}_n{size}_d{degree:g}"
+        path = os.path.join(instance_dir, f"{name}.txt")
+        # Fixed generator seed: the same size always gives the same instance
+        if generator == 'geometric':
+            cities, edges, start_city, _ = generate_geometric_instance(size, int(degree), seed=size)
+        else:
+            cities, edges, start_city = generate_sparse_instance(size, degree, seed=size)
+        write_instance(path, cities, edges, start_city)
+        instances[name] = path
+    return instances
+
+
+def build_tasks(args, tsp_instances):
+    budget = {'max_evaluations': args.max_evaluations, 'time_limit': args.time_limit}
+    seeds = [args.base_seed + i for i in range(args.seeds)]
+    tasks = []
+
+    for instance, path in tsp_instances.items():
+        for solver in args.tsp_solvers:
+            algorithm_class, params = TSP_SOLVERS[solver]
+            solver_budget = budget
+            if algorithm_class is HeldKarp:
+                if not HeldKarp.supports(_load_tsp(path), **params):
+                    continue
+                # A budget would cut the DP short and report the fallback tour as the exact row
+                solver_budget = dict.fromkeys(budget)
+            for seed in seeds:
+                tasks.append({'suite': 'tsp', 'instance': instance, 'instance_path': path,
+                              'solver': solver, 'seed': seed, 'budget': solver_budget})
+
+    for function in args.functions:
+        for dimensions in args.dimensions:
+            for solver in args.schwefel_solvers:
+                for seed in seeds:
+                    tasks.append({'suite': 'continuous', 'instance': f"{function}_d{dimensions}",
+                                  'function': function, 'dimensions': dimensions,
+                                  'solver': solver, 'seed': seed, 'budget': budget})
+    return tasks
+
+
+def summarize(runs):
+    """Groups runs by (suite, instance, solver) and describes each metric"""
+    groups = {}
+    for run in runs:
+        groups.setdefault((run['suite'], run['instance'], run['solver']), []).append(run)
+
+    summary = []
+    for (suite, instance, solver), group in sorted(groups.items()):
+        row = {'suite': suite, 'instance': instance, 'solver': solver, 'runs': len(group),
+               'feasible': sum(1 for r in group if r['quality'] is not None)}
+        for metric in METRICS:
+            row[metric] = describe([r.get(metric) for r in group])
+        summary.append(row)
+    return summary
+
+
+def write_results(output_dir, metadata, runs, summary):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_path = os.path.join(output_dir, f"benchmark_{timestamp}.json")
+    csv_path = os.path.join(output_dir, f"benchmark_{timestamp}.csv")
+
+    with open(json_path, 'w') as file:
+        json.dump({'metadata': metadata, 'summary': summary, 'runs': runs}, file, indent=2)
+
+    stat_keys = ('n', 'mean', 'std', 'median', 'q1', 'q3', 'iqr', 'ci95_low', 'ci95_high')
+    with open(csv_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['suite', 'instance', 'solver', 'runs', 'feasible'] +
+                        [f"{metric}_{key}" for metric in METRICS for key in stat_keys])
+        for row in summary:
+            writer.writerow([row['suite'], row['instance'], row['solver'], row['runs'], row['feasible']] +
+                            [row[metric].get(key, '') for metric in METRICS for key in stat_keys])
+    return json_path, csv_path
+
+
+def print_summary(summary):
+    print("\n{:<12} {:<24} {:<26} {:>9} {:>12} {:>12} {:>24} {:>10} {:>12}".format(
+        "Suite", "Instance", "Solver", "Feasible", "Mean", "Median", "95% CI", "Time (s)", "Evals/s"))
+    for row in summary:
+        quality = row['quality']
+        if quality['n'] == 0:
+            print("{:<12} {:<24} {:<26} {:>9}".format(
+                row['suite'], row['instance'], row['solver'], f"0/{row['runs']}"))
+            continue
+        ci = f"[{quality['ci95_low']:.2f}, {quality['ci95_high']:.2f}]"
+        print("{:<12} {:<24} {:<26} {:>9} {:>12.2f} {:>12.2f} {:>24} {:>10.2f} {:>12.0f}".format(
+            row['suite'], row['instance'], row['solver'], f"{row['feasible']}/{row['runs']}",
+            quality['mean'], quality['median'], ci,
+            row['time'].get('mean', 0.0), row['evals_per_second'].get('mean', 0.0)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seeded multi-run benchmark of the TSP and Schwefel solvers")
+    parser.add_argument('--seeds', type=int, default=10, help="independent runs per solver/instance")
+    parser.add_argument('--base-seed', type=int, default=0)
+    parser.add_argument('--tsp-sizes', type=int, nargs='*', default=[12, 16, 20],
+                        help="sizes of the generated random sparse TSP graphs")
+    parser.add_argument('--tsp-degree', type=float, default=4.0,
+                        help="extra edges per city (sparse) or nearest neighbors per city (geometric)")
+    parser.add_argument('--tsp-generator', choices=['sparse', 'geometric'], default='sparse')
+    parser.add_argument('--no-base-instance', action='store_true', help="skip distancias.txt")
+    parser.add_argument('--tsp-solvers', nargs='*', default=list(TSP_SOLVERS), choices=list(TSP_SOLVERS))
+    parser.add_argument('--functions', nargs='*', default=['schwefel'])
+    parser.add_argument('--dimensions', type=int, nargs='*', default=[5, 10, 30])
+    parser.add_argument('--schwefel-solvers', nargs='*', default=list(SCHWEFEL_SOLVERS),
+                        choices=list(SCHWEFEL_SOLVERS))
+    parser.add_argument('--max-evaluations', type=int, default=None)
+    parser.add_argument('--time-limit', type=float, default=None, help="seconds per run")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output-dir', default='benchmark_results')
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    tsp_instances = prepare_tsp_instances(args.tsp_sizes, args.tsp_degree, args.output_dir,
+                                          include_base=not args.no_base_instance,
+                                          generator=args.tsp_generator)
+    tasks = build_tasks(args, tsp_instances)
+    print(f"Running {len(tasks)} runs on {args.workers} workers...")
+
+    start_time = time.perf_counter()
+    runs = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_task, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            run = future.result()
+            runs.append(run)
+            if run['error']:
+                print(f"[{done}/{len(tasks)}] {run['solver']} on {run['instance']} failed: {run['error']}")
+
+    metadata = {
+        'timestamp': datetime.now().isoformat(),
+        'wall_time': time.perf_counter() - start_time,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'arguments': vars(args),
+    }
+    summary = summarize(runs)
+    print_summary(summary)
+    json_path, csv_path = write_results(args.output_dir, metadata, runs, summary)
+    print(f"\nResults written to {json_path} and {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
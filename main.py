@@ -1,15 +1,96 @@
 import argparse
+import ast
+import inspect
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from util import TSPProblem
-from util.TSP.visualization import plot_solution, plot_convergence, plot_comparison
-from algoritimos import GeneticAlgorithm, AntColony, HillClimbing
+from algoritimos import GeneticAlgorithm, AntColony, HillClimbing, SimulatedAnnealing, TabuSearch, HeldKarp
+from util.profiling import Profiler, NULL_PROFILER, format_profile, run_with_cprofile
+from util.seeding import seed_everything
+from util.TSP.portfolio import SharedIncumbent, run_cooperative
+from util.TSP.solution_cache import SolutionCache
+from algoritimos.TSP.construction import warm_start
 import time
 import os
 
+# Solver registry: CLI key -> (display name, class, default hyperparameters)
+SOLVERS = {
+    'hc': ('Hill Climbing', HillClimbing, {'max_iterations': 1000}),
+    'sa': ('Simulated Annealing', SimulatedAnnealing, {'max_iterations': 200}),
+    'ts': ('Tabu Search', TabuSearch, {'max_iterations': 1000}),
+    'ga': ('Genetic Algorithm', GeneticAlgorithm, {'population_size': 50, 'generations': 100}),
+    'aco': ('Ant Colony', AntColony, {'num_ants': 10, 'iterations': 50}),
+    'hk': ('Held-Karp (exact)', HeldKarp, {}),
+}
 
-def run_algorithm(problem, algorithm_class, **kwargs):
+# Problem (and portfolio incumbent) shared by every task of a worker process (set by _init_worker)
+_worker_problem = None
+_worker_incumbent = None
+
+
+def _init_worker(problem, incumbent=None):
+    """Pool initializer: receives the already-loaded problem once per worker"""
+    global _worker_problem, _worker_incumbent
+    _worker_problem = problem
+    _worker_incumbent = incumbent
+
+
+def _run_in_worker(algorithm_class, params, profile, seed, source):
+    # Forked workers inherit the parent's RNG state; reseed so solvers don't share streams
+    seed_everything(seed)
+    return run_algorithm(_worker_problem, algorithm_class, profile=profile,
+                         incumbent=_worker_incumbent, source=source, **params)
+
+
+def run_all(problem, algorithms, workers=None, profile=False, seeds=None, incumbent=None):
+    """
+    Runs every configured solver and yields (name, result) as each one finishes;
+    result is the raised exception when a solver fails. With workers > 1 the
+    solvers run concurrently on a process pool sharing one loaded problem.
+    With a SharedIncumbent (portfolio mode) every solver runs in its own
+    process and exchanges its best tour through it.
+    """
+    seeds = seeds or {}
+    if incumbent is not None:
+        workers = len(algorithms)
+    elif workers is None:
+        workers = min(len(algorithms), os.cpu_count() or 1)
+
+    if workers <= 1:
+        for name, (algo_class, params) in algorithms.items():
+            try:
+                seed_everything(seeds.get(name))
+                yield name, run_algorithm(problem, algo_class, profile=profile, **params)
+            except Exception as e:
+                yield name, e
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(problem, incumbent)) as executor:
+        futures = {executor.submit(_run_in_worker, algo_class, params, profile, seeds.get(name), source): name
+                   for source, (name, (algo_class, params)) in enumerate(algorithms.items())}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def run_algorithm(problem, algorithm_class, profile=False, resume=None, incumbent=None, source=-1, **kwargs):
+    """
+    Runs one solver; with `resume` it continues from that checkpoint file instead.
+    With a SharedIncumbent the solver trades tours with the portfolio (`source`
+    identifies it as the publisher).
+    """
+    profiler = Profiler() if profile else None
     start_time = time.time()
-    solver = algorithm_class(problem, **kwargs)
-    solution = solver.solve()
+    solver = algorithm_class(problem, profiler=profiler, **kwargs)
+    if incumbent is not None:
+        solution = run_cooperative(solver, incumbent, source, resume=resume)
+    else:
+        solution = solver.resume(resume) if resume else solver.solve()
     exec_time = time.time() - start_time
     distance = problem.path_distance(solution)
 
@@ -17,65 +98,313 @@ def run_algorithm(problem, algorithm_class, **kwargs):
         'solution': solution,
         'distance': distance,
         'time': exec_time,
-        'convergence': getattr(solver, 'convergence_data', None)
+        'convergence': solver.convergence.data,
+        'profile': profiler.report() if profiler else None,
+        **solver.tracker.summary()
     }
 
 
-def main():
+def load_problem(path, fmt='auto'):
+    """
+    Loads the instance. 'text' parses the distancias.txt format, 'binary' reads an
+    .npz file; for a text instance, 'binary' uses (and refreshes) a <path>.npz cache.
+    """
+    if fmt == 'auto':
+        fmt = 'binary' if path.endswith('.npz') else 'text'
+    if fmt == 'text' or path.endswith('.npz'):
+        return TSPProblem(path)
+
+    cache = path + '.npz'
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        return TSPProblem(cache)
+    problem = TSPProblem(path)
+    problem.save_binary(cache)
+    return problem
+
+
+def parse_params(assignments):
+    """Parses --param SOLVER.NAME=VALUE overrides into {solver: {name: value}}"""
+    overrides = {}
+    for assignment in assignments:
+        try:
+            key, raw_value = assignment.split('=', 1)
+            solver, name = key.split('.', 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected SOLVER.NAME=VALUE, got {assignment!r}")
+        if solver not in SOLVERS:
+            raise argparse.ArgumentTypeError(f"unknown solver {solver!r} in {assignment!r}")
+        try:
+            value = ast.literal_eval(raw_value)
+        except (ValueError, SyntaxError):
+            value = raw_value
+        overrides.setdefault(solver, {})[name] = value
+    return overrides
+
+
+def build_parser():
     parser = argparse.ArgumentParser(description="TSP Solver for Non-Complete Graphs")
+    parser.add_argument('instance', nargs='?', default='distancias.txt',
+                        help="instance file (distancias.txt format or .npz binary)")
+    parser.add_argument('--format', choices=['auto', 'text', 'binary'], default='auto',
+                        help="input format; 'binary' on a text file uses a <file>.npz cache")
+    parser.add_argument('--solvers', nargs='+', choices=list(SOLVERS), default=None,
+                        help="solvers to run (default: all; the exact solver only on small instances)")
+    parser.add_argument('--param', action='append', default=[], metavar='SOLVER.NAME=VALUE',
+                        help="override a solver hyperparameter, e.g. --param ga.population_size=80")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="base seed; solver i uses seed + i (runs are reproducible)")
+    parser.add_argument('--time-budget', type=float, default=None, help="seconds per solver")
+    parser.add_argument('--max-evaluations', type=int, default=None, help="evaluations per solver")
+    parser.add_argument('--target', type=float, default=None, help="stop when this distance is reached")
+    parser.add_argument('--gap', type=float, default=None,
+                        help="stop when (best - lower bound) / lower bound <= GAP, e.g. 0.01")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="solver processes to run concurrently (default: one per solver, 1 = sequential)")
+    parser.add_argument('--portfolio', action='store_true',
+                        help="run the solvers as a cooperative portfolio, one process each, sharing the best tour")
+    parser.add_argument('--checkpoint-dir', metavar='DIR', default=None,
+                        help="periodically save each solver's state to DIR/<solver>.ckpt")
+    parser.add_argument('--checkpoint-every', type=int, default=None, metavar='N',
+                        help="iterations between checkpoints (default: per-solver)")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue each solver from its checkpoint in --checkpoint-dir, if present")
+    parser.add_argument('--cache', metavar='FILE', default=None,
+                        help="SQLite file of best-known tours by instance fingerprint: solvers warm-start "
+                             "from it and improvements are written back (default: off, runs start cold)")
+    parser.add_argument('--json', metavar='FILE', default=None,
+                        help="write results as JSON to FILE ('-' for stdout) and skip plotting")
+    parser.add_argument('--no-plot', action='store_true', help="skip all plotting")
+    parser.add_argument('--sync-plot', action='store_true',
+                        help="render plots in this process instead of the background renderer")
+    parser.add_argument('--profile', action='store_true',
+                        help="print a per-phase time breakdown for each solver")
+    parser.add_argument('--cprofile', metavar='FILE', default=None,
+                        help="run under cProfile and dump pstats output to FILE")
+    return parser
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
+    try:
+        args.params = parse_params(args.param)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume requires --checkpoint-dir")
+    if args.portfolio and args.cprofile:
+        parser.error("--portfolio runs solvers in separate processes and cannot be used with --cprofile")
+
+    if args.cprofile:
+        # Solvers must run in this process for cProfile to see them
+        args.workers = 1
+        run_with_cprofile(solve_all, args, output=args.cprofile)
+    else:
+        solve_all(args)
+
+
+def _json_number(value):
+    return value if value is None or math.isfinite(value) else None
+
+
+def write_json(path, problem, args, results, errors):
+    payload = {
+        'instance': args.instance,
+        'cities': len(problem.cities),
+        'start_city': problem.start_city,
+        'seed': args.seed,
+        'lower_bound': args.lower_bound,
+        'results': {
+            name: {
+                'solution': result['solution'],
+                'distance': _json_number(result['distance']),
+                'time': result['time'],
+                'evaluations': result['evaluations'],
+                'evals_per_second': result['evals_per_second'],
+                'stop_reason': result['stop_reason'],
+                'samples': [[e, t, _json_number(b)] for e, t, b in result['samples']],
+                'convergence': [[int(i), int(e), t, _json_number(b)] for i, e, t, b in result['convergence']],
+                'profile': result['profile'],
+            }
+            for name, result in results.items()
+        },
+        'errors': errors,
+    }
+    if path == '-':
+        json.dump(payload, sys.stdout, indent=2)
+        print()
+    else:
+        with open(path, 'w') as file:
+            json.dump(payload, file, indent=2)
+
+
+def solve_all(args):
+    main_profiler = Profiler() if args.profile else NULL_PROFILER
+    plotting = not (args.no_plot or args.json)
+    # With JSON on stdout the human-readable report goes to stderr
+    out = sys.stderr if args.json == '-' else sys.stdout
+
+    def log(*values):
+        print(*values, file=out)
 
     # Load problem
     try:
-        problem = TSPProblem('distancias.txt')
+        problem = load_problem(args.instance, args.format)
     except Exception as e:
-        print(f"Error loading problem: {str(e)}")
-        return
+        log(f"Error loading problem: {str(e)}")
+        sys.exit(1)
+
+    log(f"\nSolving TSP with {len(problem.cities)} cities starting at {problem.start_city}")
+    if len(problem.cities) <= 50:
+        log(f"Cities: {', '.join(problem.cities)}")
 
-    print(f"\nSolving TSP with {len(problem.cities)} cities starting at {problem.start_city}")
-    print(f"Cities: {', '.join(problem.cities)}")
+    if args.solvers is None:
+        args.solvers = [key for key in SOLVERS
+                        if key != 'hk' or HeldKarp.supports(problem, args.params.get('hk', {}).get('max_cities', 20))]
 
     # Algorithm configurations
-    algorithms = {
-        'Hill Climbing': (HillClimbing, {'max_iterations': 1000}),
-        'Genetic Algorithm': (GeneticAlgorithm, {'population_size': 50, 'generations': 100}),
-        'Ant Colony': (AntColony, {'num_ants': 10, 'iterations': 50})
-    }
+    # Held-Karp lower bound, computed once and shared by every solver
+    args.lower_bound = None
+    if args.gap is not None:
+        from util.TSP.bounds import held_karp_bound  # needs scipy; only for the gap stop
+        with main_profiler.phase('bound'):
+            args.lower_bound = held_karp_bound(problem)
+        log(f"Lower bound: {args.lower_bound:.2f} (stopping at {100 * args.gap:.2f}% gap)")
+
+    # Best-known tour of this instance (or of one with the same cities, repaired)
+    cache = None if args.cache is None else SolutionCache(args.cache)
+    initial_route = None
+    if cache is not None:
+        with main_profiler.phase('cache'):
+            cached = cache.get(problem)
+            if cached is not None and not cached.exact:
+                try:
+                    cached = cached._replace(route=problem.to_city_tour(warm_start(problem, cached.route)))
+                except ValueError:
+                    cached = None
+        if cached is not None:
+            initial_route = cached.route
+            match = 'this instance' if cached.exact else f"{cached.instance} (same cities, repaired)"
+            log(f"Warm start from cache: {problem.path_distance(initial_route):.2f} "
+                f"(found by {cached.solver} on {match})")
+            if args.seed is not None:
+                log("Note: with a warm start, --seed only reproduces runs with the same cache contents")
+
+    budget = {'max_evaluations': args.max_evaluations, 'time_limit': args.time_budget,
+              'target': args.target, 'gap': args.gap, 'lower_bound': args.lower_bound}
+    algorithms = {}
+    seeds = {}
+    for index, key in enumerate(args.solvers):
+        name, algo_class, defaults = SOLVERS[key]
+        warm = ({'initial_route': initial_route}
+                if initial_route and 'initial_route' in inspect.signature(algo_class).parameters else {})
+        params = {**defaults, **budget, **warm, **args.params.get(key, {})}
+        if args.checkpoint_dir:
+            params['checkpoint_path'] = os.path.join(args.checkpoint_dir, f"{key}.ckpt")
+            if args.checkpoint_every:
+                params['checkpoint_every'] = args.checkpoint_every
+            if args.resume and os.path.exists(params['checkpoint_path']):
+                params['resume'] = params['checkpoint_path']
+                log(f"Resuming {name} from {params['checkpoint_path']}")
+        algorithms[name] = (algo_class, params)
+        seeds[name] = None if args.seed is None else args.seed + index
 
     results = {}
+    errors = {}
     convergence_data = {}
 
-    # Run all algorithms
-    for name, (algo_class, params) in algorithms.items():
-        print(f"\nRunning {name}...")
+    # Run all algorithms (concurrently), handling each one as it completes
+    # Plotting is imported lazily and, by default, rendered by a background process
+    plotter = None
+    if plotting:
+        with main_profiler.phase('plotting'):
+            if args.sync_plot:
+                from util.TSP import visualization as plotter
+            else:
+                from util.TSP.render_queue import PlotWorker
+                plotter = PlotWorker(problem)
+
+    incumbent = SharedIncumbent(len(problem.cities)) if args.portfolio else None
+    log(f"\nRunning {', '.join(algorithms)}{' as a portfolio' if incumbent else ''}...")
+    start_time = time.time()
+    for name, result in run_all(problem, algorithms, args.workers, args.profile, seeds, incumbent):
+        log(f"\n{name} finished")
         try:
-            result = run_algorithm(problem, algo_class, **params)
+            if isinstance(result, Exception):
+                raise result
             results[name] = result
 
-            if result['convergence']:
+            if len(result['convergence']):
                 convergence_data[name] = result['convergence']
 
-            print(f"Solution: {' -> '.join(result['solution'])} -> {result['solution'][0]}")
-            print(f"Distance: {result['distance']:.2f}")
-            print(f"Time: {result['time']:.2f}s")
+            if len(result['solution']) <= 50:
+                log(f"Solution: {' -> '.join(result['solution'])} -> {result['solution'][0]}")
+            log(f"Distance: {result['distance']:.2f}")
+            log(f"Time: {result['time']:.2f}s")
+            log(f"Evaluations: {result['evaluations']} ({result['evals_per_second']:.0f}/s)")
+            if result['profile']:
+                log(format_profile(result['profile'], f"{name} profile"))
 
-            plot_solution(problem, result['solution'], f"{name} Solution", True)
+            if plotter:
+                with main_profiler.phase('plotting'):
+                    if args.sync_plot:
+                        plotter.plot_solution(problem, result['solution'], f"{name} Solution", True)
+                    else:
+                        plotter.plot_solution(result['solution'], f"{name} Solution", True)
         except Exception as e:
-            print(f"Error running {name}: {str(e)}")
+            log(f"Error running {name}: {str(e)}")
+            errors[name] = str(e)
             continue
 
     # Show comparisons
 
-    if convergence_data:
-        plot_convergence(convergence_data, "Algorithm Convergence", save=True)
-    plot_comparison(results, save=True)
+    if plotter:
+        with main_profiler.phase('plotting'):
+            if convergence_data:
+                plotter.plot_convergence(convergence_data, "Algorithm Convergence", save=True)
+            plotter.plot_comparison(results, save=True)
 
     # Print summary
-    print("\nAlgorithm Comparison:")
-    print("{:<20} {:<15} {:<15}".format("Algorithm", "Distance", "Time (s)"))
+    log(f"\nSolve wall time: {time.time() - start_time:.2f}s")
+    log("\nAlgorithm Comparison:")
+    log("{:<20} {:<15} {:<15} {:<15} {:<15}".format("Algorithm", "Distance", "Time (s)",
+                                                   "Evaluations", "Evals/s"))
     for name, result in results.items():
-        print("{:<20} {:<15.2f} {:<15.2f}".format(name, result['distance'], result['time']))
+        log("{:<20} {:<15.2f} {:<15.2f} {:<15} {:<15.0f}".format(
+            name, result['distance'], result['time'], result['evaluations'], result['evals_per_second']))
+
+    if incumbent is not None:
+        shared = incumbent.read()
+        if shared is not None:
+            _, _, cost, source = shared
+            log(f"\nPortfolio best: {cost:.2f} (published by {list(algorithms)[source]})")
+
+    if cache is not None and results:
+        name, best = min(results.items(), key=lambda item: item[1]['distance'])
+        if math.isfinite(best['distance']) and cache.put(problem, best['solution'], best['distance'],
+                                                         name, args.instance):
+            log(f"\nCached best tour: {best['distance']:.2f} ({name})")
+
+    exact = results.get(SOLVERS['hk'][0], {})
+    # A budget-stopped Held-Karp run only returns its provisional tour
+    optimum = exact.get('distance') if exact.get('stop_reason') == 'iterations' else None
+    if optimum:
+        log(f"\nGap to the optimum ({optimum:.2f}):")
+        for name, result in results.items():
+            log("{:<20} {:.2f}%".format(name, 100 * (result['distance'] - optimum) / optimum))
+
+    if plotter and not args.sync_plot:
+        log("\nWaiting for the background renderer...")
+        with main_profiler.phase('plotting_wait'):
+            plotter.close()
+
+    if main_profiler.enabled:
+        log()
+        log(main_profiler.format_report("Main profile"))
+
+    if args.json:
+        write_json(args.json, problem, args, results, errors)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -4,47 +4,73 @@ Implementação da Otimização por Colônia de Formigas (ACO_R) para otimizaç
 Adaptado para domínios contínuos.
 """
 
+import os
+import sys
 import numpy as np
 import time
-from scipy.stats import norm
-
-# Definição da Função Schwefel (reutilizada)
-def schwefel_function(x):
-    """Calcula o valor da função Schwefel para um vetor x."""
-    n = len(x)
-    if not np.all((x >= -500) & (x <= 500)):
-        return float("inf")
-    term1 = 418.9829 * n
-    term2 = np.sum(x * np.sin(np.sqrt(np.abs(x))))
-    return term1 - term2
-
-# Mínimo global conhecido para n=5
+
+# Permite importar o pacote util da raiz do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+
+from benchmark_functions import SchwefelProblem
+
+# Mínimo global conhecido para n=5 (para outras dimensões use problem.optimum_position())
 GLOBAL_MINIMUM_VALUE = 0
-GLOBAL_MINIMUM_POS = np.array([420.9687] * 5)
+GLOBAL_MINIMUM_POS = SchwefelProblem(5).optimum_position()
 
 class AntColonySchwefel:
     """Classe para ACO_R aplicado à função Schwefel."""
     def __init__(self, dimensions=5, num_ants=50, iterations=100, 
-                 archive_size=10, q=0.1, xi=0.85):
-        self.dimensions = dimensions
+                 archive_size=10, q=0.1, xi=0.85, problem=None,
+                 max_evaluations=None, time_limit=None, target=None, profiler=None,
+                 checkpoint_path=None, checkpoint_every=10):
+        # O problema define função objetivo, limites e ótimo; Schwefel por padrão
+        self.problem = problem if problem is not None else SchwefelProblem(dimensions)
+        self.dimensions = self.problem.dimensions
         self.num_ants = num_ants
         self.iterations = iterations
         self.archive_size = archive_size # Tamanho do arquivo de soluções (k)
         self.q = q # Parâmetro de exploração vs explotação (similar a q0 em ACS)
         self.xi = xi # Velocidade de convergência (influencia a std dev)
-        self.bounds = (-500, 500)
         
         self.solution_archive = [] # Lista de tuplas (fitness, solution)
         self.best_solution = None
         self.best_fitness = float("inf")
-        self.convergence_data = [] # Armazena (iteração, melhor_fitness)
+        self.convergence = ConvergenceRecorder() # (iteração, avaliações, tempo, melhor_fitness)
+        self.tracker = RunTracker(max_evaluations, time_limit, target)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+        self._iteration = 0
+        self._start_time = None
+        self._time_offset = 0.0 # Tempo já gasto antes de um resume
+        self.results = None # Preenchido ao final de solve_iter()
+
+    def _evaluate(self, x):
+        """Avalia um vetor contabilizando a avaliação no tracker."""
+        with self.profiler.phase('evaluation'):
+            value = self.problem.evaluate(x)
+        self.tracker.count()
+        self.tracker.update(value)
+        return value
+
+    def _evaluate_batch(self, X):
+        """Avalia uma matriz de vetores contabilizando as avaliações no tracker."""
+        with self.profiler.phase('evaluation'):
+            values = self.problem.evaluate_batch(X)
+        self.tracker.count(len(values))
+        if len(values):
+            self.tracker.update(float(np.min(values)))
+        return values
 
     def _initialize_archive(self):
         """Inicializa o arquivo de soluções com formigas aleatórias."""
-        initial_solutions = np.random.uniform(self.bounds[0], self.bounds[1],
-                                              (self.num_ants, self.dimensions))
-        for sol in initial_solutions:
-            fitness = schwefel_function(sol)
+        initial_solutions = self.problem.random_solutions(self.num_ants)
+        initial_fitness = self._evaluate_batch(initial_solutions)
+        for fitness, sol in zip(initial_fitness, initial_solutions):
             self.solution_archive.append((fitness, sol))
         
         # Ordena o arquivo pela qualidade (menor fitness é melhor)
@@ -56,8 +82,8 @@ class AntColonySchwefel:
             self.best_fitness, self.best_solution = self.solution_archive[0]
         else:
              # Caso inicialização não gere soluções válidas (raro)
-             self.best_solution = np.random.uniform(self.bounds[0], self.bounds[1], self.dimensions)
-             self.best_fitness = schwefel_function(self.best_solution)
+             self.best_solution = self.problem.random_solutions(1)[0]
+             self.best_fitness = self._evaluate(self.best_solution)
 
 
     def _calculate_weights(self):
@@ -77,41 +103,99 @@ class AntColonySchwefel:
         selected_solution = self.solution_archive[selected_idx][1]
         
         # Calcula o desvio padrão para cada dimensão baseado na média das distâncias
-        std_devs = np.zeros(self.dimensions)
-        for dim in range(self.dimensions):
-            avg_dist = sum(abs(selected_solution[dim] - sol[1][dim]) for sol in self.solution_archive)
-            std_devs[dim] = self.xi * avg_dist / (len(self.solution_archive) -1 + 1e-9) # Evita divisão por zero
+        archive = np.array([sol[1] for sol in self.solution_archive])
+        avg_dist = np.sum(np.abs(archive - selected_solution), axis=0)
+        std_devs = self.xi * avg_dist / (len(self.solution_archive) - 1 + 1e-9)  # Evita divisão por zero
 
         # Gera a nova solução amostrando de uma gaussiana para cada dimensão
-        new_solution = np.zeros(self.dimensions)
-        for dim in range(self.dimensions):
-            new_solution[dim] = np.random.normal(loc=selected_solution[dim], scale=std_devs[dim])
-            
+        new_solution = np.random.normal(loc=selected_solution, scale=std_devs)
+
         # Garante que a nova solução esteja dentro dos limites
-        new_solution = np.clip(new_solution, self.bounds[0], self.bounds[1])
+        new_solution = self.problem.clip(new_solution)
         return new_solution
 
+    def _record(self, iteration, best):
+        self.convergence.record(iteration, self.tracker.evaluations, self.tracker.elapsed, best)
+
+    def _get_state(self):
+        """Estado da execução salvo nos checkpoints."""
+        return {
+            'problem': (type(self.problem).__name__, self.dimensions),
+            'iteration': self._iteration,
+            'solution_archive': self.solution_archive,
+            'best_solution': self.best_solution,
+            'best_fitness': self.best_fitness,
+            'convergence': self.convergence.get_state(),
+            'time': time.time() - self._start_time,
+            'tracker': self.tracker.get_state(),
+        }
+
+    def _set_state(self, state):
+        if state['problem'] != (type(self.problem).__name__, self.dimensions):
+            raise ValueError("O checkpoint pertence a outro problema ou dimensão")
+        self._iteration = state['iteration']
+        self.solution_archive = state['solution_archive']
+        self.best_solution = state['best_solution']
+        self.best_fitness = state['best_fitness']
+        self.convergence.set_state(state['convergence'])
+        self._time_offset = state['time']
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path):
+        """Continua uma execução a partir de um checkpoint gravado por solve()."""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.results
+
     def solve(self):
         """Executa o algoritmo ACO_R."""
-        self._initialize_archive()
-        start_time = time.time()
-
-        for iteration in range(self.iterations):
-            weights = self._calculate_weights()
+        for _ in self.solve_iter():
+            pass
+        return self.results
+
+    def solve_iter(self, resume=None):
+        """
+        Executa o algoritmo ACO_R produzindo um snapshot por iteração
+        (iteration, best_cost, best_solution, evaluations, elapsed). Os
+        resultados finais ficam em self.results quando o iterador se esgota;
+        `resume` continua a partir de um checkpoint.
+        """
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self.tracker.start()
+            with self.profiler.phase('init'):
+                self._initialize_archive()
+            self._iteration = 0
+            self._time_offset = 0.0
+
+        self._start_time = time.time() - self._time_offset
+        start_time = self._start_time
+
+        while self._iteration < self.iterations:
+            if self.tracker.should_stop():
+                break
+            iteration = self._iteration
+            with self.profiler.phase('pheromone_update'):
+                weights = self._calculate_weights()
             new_solutions = []
             
             # Gera novas soluções (posições das formigas)
             for _ in range(self.num_ants):
-                ant_solution = self._sample_solution(weights)
-                ant_fitness = schwefel_function(ant_solution)
+                with self.profiler.phase('construction'):
+                    ant_solution = self._sample_solution(weights)
+                ant_fitness = self._evaluate(ant_solution)
                 new_solutions.append((ant_fitness, ant_solution))
             
-            # Adiciona as novas soluções ao arquivo
-            self.solution_archive.extend(new_solutions)
-            
-            # Ordena e mantém o tamanho do arquivo
-            self.solution_archive.sort(key=lambda x: x[0])
-            self.solution_archive = self.solution_archive[:self.archive_size]
+            # Adiciona as novas soluções ao arquivo (equivalente à atualização de feromônio)
+            with self.profiler.phase('pheromone_update'):
+                self.solution_archive.extend(new_solutions)
+
+                # Ordena e mantém o tamanho do arquivo
+                self.solution_archive.sort(key=lambda x: x[0])
+                self.solution_archive = self.solution_archive[:self.archive_size]
             
             # Atualiza a melhor solução encontrada
             current_best_fitness, current_best_solution = self.solution_archive[0]
@@ -119,29 +203,35 @@ class AntColonySchwefel:
                 self.best_fitness = current_best_fitness
                 self.best_solution = current_best_solution.copy()
                 
-            self.convergence_data.append((iteration, self.best_fitness))
+            self._record(iteration, self.best_fitness)
+            self._iteration += 1
+            self.checkpointer.maybe_save(type(self).__name__, self._iteration, self._get_state)
+            yield self.tracker.snapshot(self._iteration, self.best_fitness, self.best_solution)
 
             # Log de progresso (opcional)
             # if (iteration + 1) % 10 == 0:
             #     print(f"Iteration {iteration+1}/{self.iterations}, Best Fitness: {self.best_fitness:.4f}")
 
         exec_time = time.time() - start_time
-        self.convergence_data.append((self.iterations, self.best_fitness))
+        self._record(self._iteration, self.best_fitness)
+        self.tracker.finish()
 
         # Calcula a precisão
-        precision = np.linalg.norm(self.best_solution - GLOBAL_MINIMUM_POS)
+        precision = self.problem.precision(self.best_solution)
 
         print(f"ACO Final Best Fitness: {self.best_fitness:.4f}")
         print(f"ACO Best Solution Found: {self.best_solution}")
         print(f"ACO Precision (Distance to Global Minimum): {precision:.4f}")
         print(f"ACO Execution Time: {exec_time:.2f}s")
+        print(f"ACO Evaluations: {self.tracker.evaluations}")
 
-        return {
+        self.results = {
             'solution': self.best_solution,
             'fitness': self.best_fitness,
             'precision': precision,
             'time': exec_time,
-            'convergence': self.convergence_data
+            'convergence': self.convergence.data,
+            **self.tracker.summary()
         }
 
 # Exemplo de uso
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Problemas de otimização contínua usados pelos solvers da pasta schwefel_optimization.
+
+Cada problema conhece seus limites por dimensão, avalia um vetor ou uma
+matriz de vetores (uma linha por indivíduo) de forma vetorizada e sabe
+gerar o ótimo global para qualquer número de dimensões.
+"""
+
+import numpy as np
+
+
+class ContinuousProblem:
+    """Classe base para funções de benchmark contínuas (minimização)."""
+    name = "base"
+    default_bounds = (-1.0, 1.0)
+
+    def __init__(self, dimensions=5, lower=None, upper=None):
+        if dimensions < 1:
+            raise ValueError("O número de dimensões deve ser positivo")
+        self.dimensions = dimensions
+        low, high = self.default_bounds
+        self.lower = np.full(dimensions, low, dtype=float) if lower is None else np.asarray(lower, dtype=float)
+        self.upper = np.full(dimensions, high, dtype=float) if upper is None else np.asarray(upper, dtype=float)
+        if self.lower.shape != (dimensions,) or self.upper.shape != (dimensions,):
+            raise ValueError("Os limites devem ter uma entrada por dimensão")
+
+    @property
+    def span(self):
+        """Amplitude do domínio em cada dimensão."""
+        return self.upper - self.lower
+
+    def _raw(self, X):
+        """Avalia uma matriz (m, D) sem checar limites. Implementada pelas subclasses."""
+        raise NotImplementedError
+
+    def evaluate_batch(self, X):
+        """Avalia uma matriz (m, D); pontos fora do domínio recebem infinito."""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        values = self._raw(X)
+        inside = np.all((X >= self.lower) & (X <= self.upper), axis=1)
+        return np.where(inside, values, np.inf)
+
+    def evaluate(self, x):
+        """Avalia um único vetor x."""
+        return float(self.evaluate_batch(x)[0])
+
+    __call__ = evaluate
+
+    def optimum_position(self):
+        """Posição do mínimo global para a dimensão atual."""
+        raise NotImplementedError
+
+    @property
+    def optimum_value(self):
+        """Valor da função no mínimo global (avaliado em optimum_position())."""
+        return self.evaluate(self.optimum_position())
+
+    def random_solutions(self, count):
+        """Amostra uniforme de `count` pontos dentro dos limites."""
+        return np.random.uniform(self.lower, self.upper, (count, self.dimensions))
+
+    def clip(self, x):
+        """Projeta x de volta para dentro do domínio."""
+        return np.clip(x, self.lower, self.upper)
+
+    def precision(self, x):
+        """Distância euclidiana de x até o mínimo global."""
+        return float(np.linalg.norm(np.asarray(x) - self.optimum_position()))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(dimensions={self.dimensions})"
+
+
+class SchwefelProblem(ContinuousProblem):
+    """Função de Schwefel, mínimo global em x_i = 420.9687."""
+    name = "schwefel"
+    default_bounds = (-500.0, 500.0)
+
+    def _raw(self, X):
+        return 418.9829 * X.shape[1] - np.sum(X * np.sin(np.sqrt(np.abs(X))), axis=1)
+
+    def optimum_position(self):
+        return np.full(self.dimensions, 420.9687)
+
+
+class RastriginProblem(ContinuousProblem):
+    """Função de Rastrigin, mínimo global na origem."""
+    name = "rastrigin"
+    default_bounds = (-5.12, 5.12)
+
+    def _raw(self, X):
+        return 10.0 * X.shape[1] + np.sum(X ** 2 - 10.0 * np.cos(2 * np.pi * X), axis=1)
+
+    def optimum_position(self):
+        return np.zeros(self.dimensions)
+
+
+class AckleyProblem(ContinuousProblem):
+    """Função de Ackley, mínimo global na origem."""
+    name = "ackley"
+    default_bounds = (-32.768, 32.768)
+
+    def _raw(self, X):
+        d = X.shape[1]
+        term1 = -20.0 * np.exp(-0.2 * np.sqrt(np.sum(X ** 2, axis=1) / d))
+        term2 = -np.exp(np.sum(np.cos(2 * np.pi * X), axis=1) / d)
+        return term1 + term2 + 20.0 + np.e
+
+    def optimum_position(self):
+        return np.zeros(self.dimensions)
+
+
+class RosenbrockProblem(ContinuousProblem):
+    """Função de Rosenbrock, mínimo global em x_i = 1."""
+    name = "rosenbrock"
+    default_bounds = (-5.0, 10.0)
+
+    def _raw(self, X):
+        if X.shape[1] < 2:
+            return (1.0 - X[:, 0]) ** 2
+        return np.sum(100.0 * (X[:, 1:] - X[:, :-1] ** 2) ** 2 + (1.0 - X[:, :-1]) ** 2, axis=1)
+
+    def optimum_position(self):
+        return np.ones(self.dimensions)
+
+
+PROBLEMS = {
+    cls.name: cls for cls in (SchwefelProblem, RastriginProblem, AckleyProblem, RosenbrockProblem)
+}
+
+
+def get_problem(name="schwefel", dimensions=5):
+    """Instancia um problema pelo nome ('schwefel', 'rastrigin', 'ackley', 'rosenbrock')."""
+    try:
+        return PROBLEMS[name.lower()](dimensions)
+    except KeyError:
+        raise ValueError(f"Função desconhecida: {name}. Opções: {', '.join(PROBLEMS)}")
+
+
+def schwefel_function(x):
+    """Calcula o valor da função Schwefel para um vetor x."""
+    return SchwefelProblem(len(x)).evaluate(x)
@@ -3,51 +3,76 @@
 Implementação do Algoritmo Genético para otimização da função Schwefel.
 """
 
+import os
+import sys
 import numpy as np
 import time
 
-# Definição da Função Schwefel
-def schwefel_function(x):
-    """Calcula o valor da função Schwefel para um vetor x."""
-    n = len(x)
-    # Verifica se os valores estão dentro do limite [-500, 500]
-    if not np.all((x >= -500) & (x <= 500)):
-        # Penalidade alta para valores fora do domínio
-        return float('inf')
-    term1 = 418.9829 * n
-    term2 = np.sum(x * np.sin(np.sqrt(np.abs(x))))
-    return term1 - term2
-
-# Mínimo global conhecido para n=5
+# Permite importar o pacote util da raiz do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+
+from benchmark_functions import SchwefelProblem
+
+# Mínimo global conhecido para n=5 (para outras dimensões use problem.optimum_position())
 GLOBAL_MINIMUM_VALUE = 0
-GLOBAL_MINIMUM_POS = np.array([420.9687] * 5)
+GLOBAL_MINIMUM_POS = SchwefelProblem(5).optimum_position()
 
 class GeneticAlgorithmSchwefel:
     """Classe para o Algoritmo Genético aplicado à função Schwefel."""
     def __init__(self, dimensions=5, population_size=100, generations=200, 
-                 mutation_rate=0.1, crossover_rate=0.8, tournament_size=5):
-        self.dimensions = dimensions
+                 mutation_rate=0.1, crossover_rate=0.8, tournament_size=5, problem=None,
+                 max_evaluations=None, time_limit=None, target=None, profiler=None,
+                 checkpoint_path=None, checkpoint_every=10):
+        # O problema define função objetivo, limites e ótimo; Schwefel por padrão
+        self.problem = problem if problem is not None else SchwefelProblem(dimensions)
+        self.dimensions = self.problem.dimensions
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.tournament_size = tournament_size
-        self.bounds = (-500, 500)
         self.population = None
         self.best_solution = None
         self.best_fitness = float('inf')
-        self.convergence_data = [] # Armazena (geração, melhor_fitness)
+        self.convergence = ConvergenceRecorder() # (geração, avaliações, tempo, melhor_fitness)
+        self.tracker = RunTracker(max_evaluations, time_limit, target)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every)
+        self._generation = 0
+        self._start_time = None
+        self._time_offset = 0.0 # Tempo já gasto antes de um resume
+        self.results = None # Preenchido ao final de solve_iter()
+
+    def _evaluate(self, x):
+        """Avalia um vetor contabilizando a avaliação no tracker."""
+        with self.profiler.phase('evaluation'):
+            value = self.problem.evaluate(x)
+        self.tracker.count()
+        self.tracker.update(value)
+        return value
+
+    def _evaluate_batch(self, X):
+        """Avalia uma matriz de vetores contabilizando as avaliações no tracker."""
+        with self.profiler.phase('evaluation'):
+            values = self.problem.evaluate_batch(X)
+        self.tracker.count(len(values))
+        if len(values):
+            self.tracker.update(float(np.min(values)))
+        return values
 
     def _initialize_population(self):
         """Inicializa a população com valores aleatórios dentro dos limites."""
-        self.population = np.random.uniform(self.bounds[0], self.bounds[1], 
-                                            (self.population_size, self.dimensions))
-        self.best_solution = self.population[0]
-        self.best_fitness = schwefel_function(self.best_solution)
+        self.population = self.problem.random_solutions(self.population_size)
+        self.best_solution = self.population[0].copy()
+        self.best_fitness = self._evaluate(self.best_solution)
 
     def _evaluate_population(self):
         """Avalia o fitness de cada indivíduo na população."""
-        fitness_values = np.array([schwefel_function(ind) for ind in self.population])
+        fitness_values = self._evaluate_batch(self.population)
         best_gen_idx = np.argmin(fitness_values)
         if fitness_values[best_gen_idx] < self.best_fitness:
             self.best_fitness = fitness_values[best_gen_idx]
@@ -68,8 +93,8 @@ class GeneticAlgorithmSchwefel:
             child1 = alpha * parent1 + (1 - alpha) * parent2
             child2 = alpha * parent2 + (1 - alpha) * parent1
             # Garante que os filhos estejam dentro dos limites
-            child1 = np.clip(child1, self.bounds[0], self.bounds[1])
-            child2 = np.clip(child2, self.bounds[0], self.bounds[1])
+            child1 = self.problem.clip(child1)
+            child2 = self.problem.clip(child2)
             return child1, child2
         return parent1.copy(), parent2.copy()
 
@@ -77,21 +102,79 @@ class GeneticAlgorithmSchwefel:
         """Aplica mutação gaussiana a um indivíduo."""
         for i in range(self.dimensions):
             if np.random.rand() < self.mutation_rate:
-                # Adiciona ruído gaussiano, escala pode ser ajustada
-                mutation_value = np.random.normal(0, (self.bounds[1] - self.bounds[0]) * 0.1) 
+                # Adiciona ruído gaussiano proporcional à amplitude da dimensão
+                mutation_value = np.random.normal(0, self.problem.span[i] * 0.1)
                 individual[i] += mutation_value
         # Garante que o indivíduo mutado esteja dentro dos limites
-        individual = np.clip(individual, self.bounds[0], self.bounds[1])
+        individual = self.problem.clip(individual)
         return individual
 
+    def _record(self, iteration, best):
+        self.convergence.record(iteration, self.tracker.evaluations, self.tracker.elapsed, best)
+
+    def _get_state(self):
+        """Estado da execução salvo nos checkpoints."""
+        return {
+            'problem': (type(self.problem).__name__, self.dimensions),
+            'generation': self._generation,
+            'population': self.population,
+            'best_solution': self.best_solution,
+            'best_fitness': self.best_fitness,
+            'convergence': self.convergence.get_state(),
+            'time': time.time() - self._start_time,
+            'tracker': self.tracker.get_state(),
+        }
+
+    def _set_state(self, state):
+        if state['problem'] != (type(self.problem).__name__, self.dimensions):
+            raise ValueError("O checkpoint pertence a outro problema ou dimensão")
+        self._generation = state['generation']
+        self.population = state['population']
+        self.best_solution = state['best_solution']
+        self.best_fitness = state['best_fitness']
+        self.convergence.set_state(state['convergence'])
+        self._time_offset = state['time']
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path):
+        """Continua uma execução a partir de um checkpoint gravado por solve()."""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.results
+
     def solve(self):
         """Executa o algoritmo genético."""
-        self._initialize_population()
-        start_time = time.time()
-
-        for generation in range(self.generations):
+        for _ in self.solve_iter():
+            pass
+        return self.results
+
+    def solve_iter(self, resume=None):
+        """
+        Executa o algoritmo genético produzindo um snapshot por geração
+        (iteration, best_cost, best_solution, evaluations, elapsed). Os
+        resultados finais ficam em self.results quando o iterador se esgota;
+        `resume` continua a partir de um checkpoint.
+        """
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self.tracker.start()
+            with self.profiler.phase('init'):
+                self._initialize_population()
+            self._generation = 0
+            self._time_offset = 0.0
+
+        self._start_time = time.time() - self._time_offset
+        start_time = self._start_time
+
+        while self._generation < self.generations:
+            if self.tracker.should_stop():
+                break
+            generation = self._generation
             fitness_values = self._evaluate_population()
-            self.convergence_data.append((generation, self.best_fitness))
+            self._record(generation, self.best_fitness)
 
             new_population = []
             # Mantém o melhor indivíduo (elitismo)
@@ -99,19 +182,24 @@ class GeneticAlgorithmSchwefel:
             new_population.append(self.population[best_idx].copy())
 
             while len(new_population) < self.population_size:
-                parent1 = self._tournament_selection(fitness_values)
-                parent2 = self._tournament_selection(fitness_values)
-                
-                child1, child2 = self._crossover(parent1, parent2)
+                with self.profiler.phase('selection'):
+                    parent1 = self._tournament_selection(fitness_values)
+                    parent2 = self._tournament_selection(fitness_values)
                 
-                mutated_child1 = self._mutate(child1)
-                mutated_child2 = self._mutate(child2)
+                with self.profiler.phase('variation'):
+                    child1, child2 = self._crossover(parent1, parent2)
+
+                    mutated_child1 = self._mutate(child1)
+                    mutated_child2 = self._mutate(child2)
                 
                 new_population.append(mutated_child1)
                 if len(new_population) < self.population_size:
                     new_population.append(mutated_child2)
             
             self.population = np.array(new_population)
+            self._generation += 1
+            self.checkpointer.maybe_save(type(self).__name__, self._generation, self._get_state)
+            yield self.tracker.snapshot(self._generation, self.best_fitness, self.best_solution)
 
             # Log de progresso (opcional)
             # if (generation + 1) % 10 == 0:
@@ -119,24 +207,27 @@ class GeneticAlgorithmSchwefel:
 
         # Avaliação final para garantir que o best_fitness reflete a população final
         final_fitness = self._evaluate_population()
-        self.convergence_data.append((self.generations, self.best_fitness))
-        
+        self._record(self._generation, self.best_fitness)
+        self.tracker.finish()
+
         exec_time = time.time() - start_time
         
         # Calcula a precisão (distância euclidiana ao mínimo global conhecido)
-        precision = np.linalg.norm(self.best_solution - GLOBAL_MINIMUM_POS)
+        precision = self.problem.precision(self.best_solution)
 
         print(f"GA Final Best Fitness: {self.best_fitness:.4f}")
         print(f"GA Best Solution Found: {self.best_solution}")
         print(f"GA Precision (Distance to Global Minimum): {precision:.4f}")
         print(f"GA Execution Time: {exec_time:.2f}s")
+        print(f"GA Evaluations: {self.tracker.evaluations}")
 
-        return {
+        self.results = {
             'solution': self.best_solution,
             'fitness': self.best_fitness,
             'precision': precision,
             'time': exec_time,
-            'convergence': self.convergence_data
+            'convergence': self.convergence.data,
+            **self.tracker.summary()
         }
 
 # Exemplo de uso (pode ser movido para um script principal depois)
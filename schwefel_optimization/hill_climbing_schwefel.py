@@ -3,52 +3,74 @@
 Implementação do Hill Climbing com Reinício Aleatório para otimização da função Schwefel.
 """
 
+import os
+import sys
 import numpy as np
 import time
 
-# Definição da Função Schwefel (reutilizada)
-def schwefel_function(x):
-    """Calcula o valor da função Schwefel para um vetor x."""
-    n = len(x)
-    if not np.all((x >= -500) & (x <= 500)):
-        return float("inf")
-    term1 = 418.9829 * n
-    term2 = np.sum(x * np.sin(np.sqrt(np.abs(x))))
-    return term1 - term2
-
-# Mínimo global conhecido para n=5
+# Permite importar o pacote util da raiz do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from util.run_tracker import RunTracker
+from util.profiling import NULL_PROFILER
+from util.checkpoint import Checkpointer, load_checkpoint, restore_rng_state
+from util.convergence import ConvergenceRecorder
+
+from benchmark_functions import SchwefelProblem
+
+# Mínimo global conhecido para n=5 (para outras dimensões use problem.optimum_position())
 GLOBAL_MINIMUM_VALUE = 0
-GLOBAL_MINIMUM_POS = np.array([420.9687] * 5)
+GLOBAL_MINIMUM_POS = SchwefelProblem(5).optimum_position()
 
 class HillClimbingSchwefel:
     """Classe para Hill Climbing com Reinício Aleatório aplicado à função Schwefel."""
     def __init__(self, dimensions=5, max_iterations_per_climb=100, 
-                 num_restarts=50, step_size=1.0):
-        self.dimensions = dimensions
+                 num_restarts=50, step_size=1.0, problem=None,
+                 max_evaluations=None, time_limit=None, target=None, profiler=None,
+                 checkpoint_path=None, checkpoint_every=10):
+        # O problema define função objetivo, limites e ótimo; Schwefel por padrão
+        self.problem = problem if problem is not None else SchwefelProblem(dimensions)
+        self.dimensions = self.problem.dimensions
         self.max_iterations_per_climb = max_iterations_per_climb
         self.num_restarts = num_restarts
         self.step_size = step_size # Tamanho do passo para gerar vizinhos
-        self.bounds = (-500, 500)
         
         self.overall_best_solution = None
         self.overall_best_fitness = float("inf")
-        self.convergence_data = [] # Armazena (restart #, melhor_fitness_restart)
+        self.convergence = ConvergenceRecorder() # (reinício, avaliações, tempo, melhor_fitness)
+        self.tracker = RunTracker(max_evaluations, time_limit, target)
+        self.profiler = profiler or NULL_PROFILER
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_every) # Checkpoints entre reinícios
+        self._restart = 0
+        self._start_time = None
+        self._time_offset = 0.0 # Tempo já gasto antes de um resume
+        self.results = None # Preenchido ao final de solve_iter()
+
+    def _evaluate(self, x):
+        """Avalia um vetor contabilizando a avaliação no tracker."""
+        with self.profiler.phase('evaluation'):
+            value = self.problem.evaluate(x)
+        self.tracker.count()
+        self.tracker.update(value)
+        return value
 
     def _generate_neighbor(self, current_solution):
         """Gera um vizinho adicionando um pequeno ruído gaussiano."""
         neighbor = current_solution + np.random.normal(0, self.step_size, self.dimensions)
         # Garante que o vizinho esteja dentro dos limites
-        neighbor = np.clip(neighbor, self.bounds[0], self.bounds[1])
+        neighbor = self.problem.clip(neighbor)
         return neighbor
 
     def _climb(self, start_solution):
         """Executa uma única subida de encosta a partir de uma solução inicial."""
         current_solution = start_solution
-        current_fitness = schwefel_function(current_solution)
+        current_fitness = self._evaluate(current_solution)
         
         for _ in range(self.max_iterations_per_climb):
-            neighbor = self._generate_neighbor(current_solution)
-            neighbor_fitness = schwefel_function(neighbor)
+            if self.tracker.should_stop():
+                break
+            with self.profiler.phase('variation'):
+                neighbor = self._generate_neighbor(current_solution)
+            neighbor_fitness = self._evaluate(neighbor)
             
             # Move para o vizinho se for melhor
             if neighbor_fitness < current_fitness:
@@ -58,13 +80,69 @@ class HillClimbingSchwefel:
             
         return current_solution, current_fitness
 
+    def _record(self, iteration, best):
+        self.convergence.record(iteration, self.tracker.evaluations, self.tracker.elapsed, best)
+
+    def _get_state(self):
+        """Estado da execução salvo nos checkpoints."""
+        return {
+            'problem': (type(self.problem).__name__, self.dimensions),
+            'restart': self._restart,
+            'overall_best_solution': self.overall_best_solution,
+            'overall_best_fitness': self.overall_best_fitness,
+            'convergence': self.convergence.get_state(),
+            'time': time.time() - self._start_time,
+            'tracker': self.tracker.get_state(),
+        }
+
+    def _set_state(self, state):
+        if state['problem'] != (type(self.problem).__name__, self.dimensions):
+            raise ValueError("O checkpoint pertence a outro problema ou dimensão")
+        self._restart = state['restart']
+        self.overall_best_solution = state['overall_best_solution']
+        self.overall_best_fitness = state['overall_best_fitness']
+        self.convergence.set_state(state['convergence'])
+        self._time_offset = state['time']
+        self.tracker.set_state(state['tracker'])
+
+    def resume(self, path):
+        """Continua uma execução a partir de um checkpoint gravado por solve()."""
+        for _ in self.solve_iter(resume=path):
+            pass
+        return self.results
+
     def solve(self):
         """Executa o Hill Climbing com múltiplos reinícios aleatórios."""
-        start_time = time.time()
+        for _ in self.solve_iter():
+            pass
+        return self.results
+
+    def solve_iter(self, resume=None):
+        """
+        Executa o Hill Climbing com múltiplos reinícios aleatórios produzindo um
+        snapshot por reinício (iteration, best_cost, best_solution, evaluations,
+        elapsed). Os resultados finais ficam em self.results quando o iterador
+        se esgota; `resume` continua a partir de um checkpoint.
+        """
+        if resume is not None:
+            payload = load_checkpoint(resume, type(self).__name__)
+            self._set_state(payload['state'])
+            restore_rng_state(payload['rng'])
+        else:
+            self.tracker.start()
+            self._restart = 0
+            self._time_offset = 0.0
+
+        self._start_time = time.time() - self._time_offset
+        start_time = self._start_time
 
-        for restart in range(self.num_restarts):
+        while self._restart < self.num_restarts:
+            if self.tracker.should_stop():
+                break
+            restart = self._restart
             # Gera uma solução inicial aleatória para este reinício
-            initial_solution = np.random.uniform(self.bounds[0], self.bounds[1], self.dimensions)
+            with self.profiler.phase('init'):
+                initial_solution = self.problem.random_solutions(1)[0]
             
             # Executa a subida de encosta
             best_solution_restart, best_fitness_restart = self._climb(initial_solution)
@@ -74,35 +152,41 @@ class HillClimbingSchwefel:
                 self.overall_best_fitness = best_fitness_restart
                 self.overall_best_solution = best_solution_restart.copy()
             
-            self.convergence_data.append((restart, self.overall_best_fitness))
+            self._record(restart, self.overall_best_fitness)
+            self._restart += 1
+            self.checkpointer.maybe_save(type(self).__name__, self._restart, self._get_state)
+            yield self.tracker.snapshot(self._restart, self.overall_best_fitness, self.overall_best_solution)
 
             # Log de progresso (opcional)
             # if (restart + 1) % 5 == 0:
             #     print(f"Restart {restart+1}/{self.num_restarts}, Current Best Fitness: {self.overall_best_fitness:.4f}")
 
         exec_time = time.time() - start_time
-        self.convergence_data.append((self.num_restarts, self.overall_best_fitness))
+        self._record(self._restart, self.overall_best_fitness)
+        self.tracker.finish()
 
         # Calcula a precisão
         if self.overall_best_solution is None:
              # Caso nenhum reinício produza uma solução válida (muito improvável)
-             self.overall_best_solution = np.random.uniform(self.bounds[0], self.bounds[1], self.dimensions)
-             self.overall_best_fitness = schwefel_function(self.overall_best_solution)
+             self.overall_best_solution = self.problem.random_solutions(1)[0]
+             self.overall_best_fitness = self._evaluate(self.overall_best_solution)
              precision = float('inf') # Ou recalcular
         else:
-            precision = np.linalg.norm(self.overall_best_solution - GLOBAL_MINIMUM_POS)
+            precision = self.problem.precision(self.overall_best_solution)
 
         print(f"HC Final Best Fitness: {self.overall_best_fitness:.4f}")
         print(f"HC Best Solution Found: {self.overall_best_solution}")
         print(f"HC Precision (Distance to Global Minimum): {precision:.4f}")
         print(f"HC Execution Time: {exec_time:.2f}s")
+        print(f"HC Evaluations: {self.tracker.evaluations}")
 
-        return {
+        self.results = {
             'solution': self.overall_best_solution,
             'fitness': self.overall_best_fitness,
             'precision': precision,
             'time': exec_time,
-            'convergence': self.convergence_data
+            'convergence': self.convergence.data,
+            **self.tracker.summary()
         }
 
 # Exemplo de uso
@@ -4,43 +4,55 @@ Script principal para executar e comparar os algoritmos de otimização
 na função Schwefel.
 """
 
-import numpy as np
+import argparse
 import time
 import os
 
 # Importa as implementações dos algoritmos
-from genetic_algorithm_schwefel import GeneticAlgorithmSchwefel, schwefel_function, GLOBAL_MINIMUM_POS
+from benchmark_functions import get_problem
+from genetic_algorithm_schwefel import GeneticAlgorithmSchwefel
 from ant_colony_schwefel import AntColonySchwefel
 from hill_climbing_schwefel import HillClimbingSchwefel
+from results_store import default_results_path, save_results
+# Os módulos dos solvers já colocam a raiz do projeto no sys.path
+from util.profiling import Profiler, run_with_cprofile
 
 # Cria diretório para gráficos se não existir
 output_dir = "schwefel_plots"
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
-def run_schwefel_optimization():
-    """Executa os algoritmos e compara os resultados."""
-    dimensions = 5
-    bounds = (-500, 500)
-    print(f"Otimizando a função Schwefel para {dimensions} dimensões.")
-    print(f"Mínimo Global Conhecido em: {GLOBAL_MINIMUM_POS}, Valor: {schwefel_function(GLOBAL_MINIMUM_POS)}")
+def run_schwefel_optimization(dimensions=5, function="schwefel", max_evaluations=None,
+                              time_limit=None, target=None, profile=False):
+    """Executa os algoritmos e compara os resultados.
+
+    max_evaluations, time_limit (s) e target são critérios de parada
+    opcionais aplicados igualmente a todos os algoritmos. Com profile=True
+    cada resultado ganha a quebra de tempo por fase em result["profile"].
+    """
+    problem = get_problem(function, dimensions)
+    optimum = problem.optimum_position()
+    print(f"Otimizando a função {problem.name.capitalize()} para {dimensions} dimensões.")
+    print(f"Mínimo Global Conhecido em: {optimum}, Valor: {problem.optimum_value}")
 
     # Configurações dos algoritmos (ajustar conforme necessário)
     configs = {
         "Genetic Algorithm": {
             "class": GeneticAlgorithmSchwefel,
-            "params": {"dimensions": dimensions, "population_size": 100, "generations": 300, "mutation_rate": 0.1, "crossover_rate": 0.8, "tournament_size": 5}
+            "params": {"problem": problem, "population_size": 100, "generations": 300, "mutation_rate": 0.1, "crossover_rate": 0.8, "tournament_size": 5}
         },
         "Ant Colony (ACO_R)": {
             "class": AntColonySchwefel,
-            "params": {"dimensions": dimensions, "num_ants": 50, "iterations": 200, "archive_size": 20, "q": 0.5, "xi": 0.85}
+            "params": {"problem": problem, "num_ants": 50, "iterations": 200, "archive_size": 20, "q": 0.5, "xi": 0.85}
         },
         "Hill Climbing (Restarts)": {
             "class": HillClimbingSchwefel,
-            "params": {"dimensions": dimensions, "max_iterations_per_climb": 150, "num_restarts": 100, "step_size": 5.0}
+            "params": {"problem": problem, "max_iterations_per_climb": 150, "num_restarts": 100, "step_size": 5.0}
         }
     }
 
+    budget = {"max_evaluations": max_evaluations, "time_limit": time_limit, "target": target}
+
     results = {}
 
     # Executa cada algoritmo
@@ -48,19 +60,24 @@ def run_schwefel_optimization():
         print(f"\n--- Executando {name} ---")
         solver_class = config["class"]
         params = config["params"]
-        solver = solver_class(**params)
+        profiler = Profiler() if profile else None
+        solver = solver_class(**params, **budget, profiler=profiler)
         
         try:
             result = solver.solve() # solve() já imprime seus resultados individuais
+            if profiler is not None:
+                result["profile"] = profiler.report()
+                print(profiler.format_report(f"Perfil por fase ({name})"))
             results[name] = result
         except Exception as e:
             print(f"Erro ao executar {name}: {e}")
             results[name] = None # Marca como falha
 
     # Compila e imprime a tabela de comparação
-    print("\n--- Comparação Final dos Algoritmos (Função Schwefel) ---")
-    print("{:<25} {:<20} {:<20} {:<15}".format("Algoritmo", "Melhor Fitness", "Precisão (Dist. Mín)", "Tempo (s)"))
-    print("-"*80)
+    print(f"\n--- Comparação Final dos Algoritmos (Função {problem.name.capitalize()}) ---")
+    print("{:<25} {:<20} {:<20} {:<15} {:<15} {:<15}".format(
+        "Algoritmo", "Melhor Fitness", "Precisão (Dist. Mín)", "Tempo (s)", "Avaliações", "Aval./s"))
+    print("-"*110)
     
     valid_results = {name: res for name, res in results.items() if res is not None}
 
@@ -68,22 +85,47 @@ def run_schwefel_optimization():
     sorted_results = sorted(valid_results.items(), key=lambda item: item[1]["fitness"])
 
     for name, result in sorted_results:
-         print("{:<25} {:<20.4f} {:<20.4f} {:<15.2f}".format(
+         print("{:<25} {:<20.4f} {:<20.4f} {:<15.2f} {:<15} {:<15.0f}".format(
              name, 
              result["fitness"],
              result["precision"],
-             result["time"]
+             result["time"],
+             result["evaluations"],
+             result["evals_per_second"]
          ))
     
-    print("-"*80)
+    print("-"*110)
     
     # Retorna os resultados para possível uso posterior (geração de gráficos)
     return results
 
 if __name__ == "__main__":
-    all_results = run_schwefel_optimization()
-    # Aqui poderíamos salvar os 'all_results' em um arquivo se necessário
-    # para o próximo passo (geração de gráficos), mas por enquanto, 
-    # a execução sequencial no plano manterá os dados disponíveis implicitamente
-    # ou podemos passar 'all_results' para a função de plotagem.
+    parser = argparse.ArgumentParser(description="Compara GA, ACO_R e HC em funções contínuas")
+    parser.add_argument("--function", default="schwefel", help="schwefel, rastrigin, ackley ou rosenbrock")
+    parser.add_argument("--dimensions", type=int, default=5)
+    parser.add_argument("--max-evaluations", type=int, default=None)
+    parser.add_argument("--time-limit", type=float, default=None, help="segundos por algoritmo")
+    parser.add_argument("--target", type=float, default=None)
+    parser.add_argument("--profile", action="store_true", help="imprime o tempo gasto em cada fase dos solvers")
+    parser.add_argument("--cprofile", metavar="ARQUIVO", default=None,
+                        help="executa sob cProfile e grava as estatísticas (pstats) em ARQUIVO")
+    parser.add_argument("--output", metavar="ARQUIVO", default=None,
+                        help="arquivo .npz dos resultados (padrão: schwefel_results/<função>_<dim>d_<data>.npz)")
+    parser.add_argument("--no-save", action="store_true", help="não grava os resultados")
+    args = parser.parse_args()
+
+    run_kwargs = dict(dimensions=args.dimensions, function=args.function,
+                      max_evaluations=args.max_evaluations, time_limit=args.time_limit,
+                      target=args.target, profile=args.profile)
+    if args.cprofile:
+        all_results = run_with_cprofile(run_schwefel_optimization, output=args.cprofile, **run_kwargs)
+    else:
+        all_results = run_schwefel_optimization(**run_kwargs)
+
+    # Os gráficos (plot_schwefel.py) são gerados a partir deste arquivo, sem rodar os algoritmos de novo
+    if not args.no_save:
+        path = args.output or default_results_path(args.function, args.dimensions)
+        metadata = {key: value for key, value in run_kwargs.items() if key != "profile"}
+        save_results(path, all_results, metadata)
+        print(f"\nResultados salvos em: {path}")
 
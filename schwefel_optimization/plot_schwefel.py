@@ -2,35 +2,82 @@
 """
 Script para gerar gráficos de comparação e convergência para os algoritmos
 de otimização da função Schwefel.
+
+Os dados vêm dos arquivos gravados por main_schwefel.py (ver
+results_store.py); com vários arquivos, os gráficos agregam as execuções
+da mesma função e dimensão (mediana e faixa mín-máx da convergência, média
+e desvio padrão nas barras), com um par de gráficos por função e dimensão.
 """
 
+import argparse
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 
-# Importa a função principal que executa os algoritmos e retorna os resultados
-from main_schwefel import run_schwefel_optimization
+from results_store import RESULTS_DIR, find_results, load_results
 
 # Diretório para salvar os gráficos
 output_dir = "schwefel_plots"
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
-def plot_schwefel_convergence(results, filename="schwefel_convergence.png"):
-    """Plota a convergência do melhor fitness para cada algoritmo."""
+def _by_algorithm(runs):
+    """{algoritmo: [resultado de cada execução]} a partir de um resultado ou de uma lista deles"""
+    if isinstance(runs, dict):
+        runs = [runs]
+    grouped = {}
+    for results in runs:
+        for name, result in results.items():
+            if result is not None:
+                grouped.setdefault(name, []).append(result)
+    return grouped
+
+
+def _group_by_problem(loaded):
+    """{(função, dimensões): [resultados de cada execução]} a partir de [(metadados, resultados)]"""
+    groups = {}
+    for metadata, results in loaded:
+        key = (metadata.get("function", "schwefel"), metadata.get("dimensions"))
+        groups.setdefault(key, []).append(results)
+    return groups
+
+
+def _problem_label(function, dimensions, num_runs):
+    """Descrição da função e da dimensão para os títulos, ex.: 'Função Rastrigin, 10 dimensões (3 execuções)'"""
+    label = f"Função {str(function).capitalize()}, {dimensions} dimensões"
+    if num_runs > 1:
+        label += f" ({num_runs} execuções)"
+    return label
+
+
+def plot_schwefel_convergence(runs, filename="schwefel_convergence.png", label="Função Schwefel"):
+    """Plota a convergência do melhor fitness para cada algoritmo (mediana e faixa com várias execuções)."""
     plt.figure(figsize=(12, 7))
-    
-    for name, result in results.items():
-        if result and result.get("convergence"):
-            convergence = result["convergence"]
-            # Extrai iterações/gerações e fitness
-            iterations = [item[0] for item in convergence]
-            fitness_values = [item[1] for item in convergence]
+
+    for name, results in _by_algorithm(runs).items():
+        # Séries (iteração, avaliações, tempo, melhor_fitness) do ConvergenceRecorder
+        series = [np.asarray(result["convergence"], dtype=float) for result in results
+                  if len(result.get("convergence", []))]
+        if not series:
+            continue
+        if len(series) == 1:
+            iterations = series[0][:, 0]
             # Garante que os valores de fitness não sejam infinitos para plotagem
-            fitness_values = [f if np.isfinite(f) else np.nan for f in fitness_values] 
+            fitness_values = np.where(np.isfinite(series[0][:, 3]), series[0][:, 3], np.nan)
             plt.plot(iterations, fitness_values, label=name, marker=".", linestyle="-", markersize=4)
-            
-    plt.title("Convergência dos Algoritmos na Função Schwefel")
+            continue
+        # Várias execuções: interpola cada série numa grade comum de iterações
+        iterations = np.linspace(0, max(s[-1, 0] for s in series), 200)
+        curves = np.array([np.interp(iterations, s[:, 0], np.where(np.isfinite(s[:, 3]), s[:, 3], np.nan))
+                           for s in series])
+        line, = plt.plot(iterations, np.nanmedian(curves, axis=0), label=f"{name} (mediana de {len(series)})")
+        plt.fill_between(iterations, np.nanmin(curves, axis=0), np.nanmax(curves, axis=0),
+                         color=line.get_color(), alpha=0.2)
+
+
+    plt.title(f"Convergência dos Algoritmos - {label}")
     plt.xlabel("Iteração / Geração / Reinício")
     plt.ylabel("Melhor Fitness Encontrado")
     plt.yscale("symlog") # Usar escala logarítmica simétrica pode ajudar com grandes variações
@@ -42,13 +89,17 @@ def plot_schwefel_convergence(results, filename="schwefel_convergence.png"):
     print(f"Gráfico de convergência salvo em: {filepath}")
     plt.close()
 
-def plot_schwefel_comparison(results, filename="schwefel_comparison.png"):
-    """Plota gráficos de barras comparando fitness, precisão e tempo."""
-    valid_results = {name: res for name, res in results.items() if res is not None}
-    names = list(valid_results.keys())
-    fitness = [valid_results[name]["fitness"] for name in names]
-    precision = [valid_results[name]["precision"] for name in names]
-    times = [valid_results[name]["time"] for name in names]
+def plot_schwefel_comparison(runs, filename="schwefel_comparison.png", label="Função Schwefel"):
+    """Plota gráficos de barras comparando fitness, precisão e tempo (média e desvio padrão com várias execuções)."""
+    grouped = _by_algorithm(runs)
+    names = list(grouped.keys())
+
+    def stats(key):
+        values = [np.array([result[key] for result in grouped[name]], dtype=float) for name in names]
+        return [v.mean() for v in values], [v.std() if len(v) > 1 else 0.0 for v in values]
+
+    (fitness, fitness_std), (precision, precision_std), (times, times_std) = (
+        stats("fitness"), stats("precision"), stats("time"))
 
     x = np.arange(len(names))  # Posições das labels
     width = 0.25  # Largura das barras
@@ -56,7 +107,7 @@ def plot_schwefel_comparison(results, filename="schwefel_comparison.png"):
     fig, axs = plt.subplots(1, 3, figsize=(18, 6), sharey=False)
 
     # Gráfico de Fitness
-    rects1 = axs[0].bar(x, fitness, width, label="Fitness Final") # Corrigido: Parêntese fechado
+    rects1 = axs[0].bar(x, fitness, width, yerr=fitness_std, label="Fitness Final") # Corrigido: Parêntese fechado
     axs[0].set_ylabel("Fitness (Menor é Melhor)")
     axs[0].set_title("Comparação de Fitness Final")
     axs[0].set_xticks(x)
@@ -65,7 +116,8 @@ def plot_schwefel_comparison(results, filename="schwefel_comparison.png"):
     axs[0].grid(axis="y", linestyle="--", linewidth=0.5) # Corrigido: Aspas
 
     # Gráfico de Precisão
-    rects2 = axs[1].bar(x, precision, width, label="Precisão (Dist. Mín Global)", color="orange")
+    rects2 = axs[1].bar(x, precision, width, yerr=precision_std, label="Precisão (Dist. Mín Global)",
+                        color="orange")
     axs[1].set_ylabel("Distância Euclidiana (Menor é Melhor)") # Corrigido: Adicionado de volta
     axs[1].set_title("Comparação de Precisão")
     axs[1].set_xticks(x)
@@ -74,7 +126,7 @@ def plot_schwefel_comparison(results, filename="schwefel_comparison.png"):
     axs[1].grid(axis="y", linestyle="--", linewidth=0.5) # Corrigido: Aspas
 
     # Gráfico de Tempo
-    rects3 = axs[2].bar(x, times, width, label="Tempo de Execução", color="green") # Corrigido: Aspas
+    rects3 = axs[2].bar(x, times, width, yerr=times_std, label="Tempo de Execução", color="green") # Corrigido: Aspas
     axs[2].set_ylabel("Tempo (s)")
     axs[2].set_title("Comparação de Tempo de Execução")
     axs[2].set_xticks(x)
@@ -82,7 +134,7 @@ def plot_schwefel_comparison(results, filename="schwefel_comparison.png"):
     axs[2].bar_label(rects3, padding=3, fmt="%.2f")
     axs[2].grid(axis="y", linestyle="--", linewidth=0.5) # Corrigido: Aspas
 
-    fig.suptitle("Comparação de Desempenho dos Algoritmos na Função Schwefel", fontsize=16)
+    fig.suptitle(f"Comparação de Desempenho dos Algoritmos - {label}", fontsize=16)
     fig.tight_layout(rect=[0, 0.03, 1, 0.95]) # Ajusta para o título principal
     
     filepath = os.path.join(output_dir, filename)
@@ -91,13 +143,36 @@ def plot_schwefel_comparison(results, filename="schwefel_comparison.png"):
     plt.close()
 
 if __name__ == "__main__":
-    print("Executando algoritmos para coletar dados...")
-    # Executa a otimização para obter os resultados mais recentes
-    results_data = run_schwefel_optimization()
-    
+    parser = argparse.ArgumentParser(description="Gráficos dos resultados gravados por main_schwefel.py")
+    parser.add_argument("files", nargs="*",
+                        help=f"arquivos de resultados (padrão: o mais recente de {RESULTS_DIR}/)")
+    parser.add_argument("--all", action="store_true",
+                        help=f"agrega todas as execuções de {RESULTS_DIR}/, um par de gráficos por "
+                             "função e dimensão (só da função de --function, se dada)")
+    parser.add_argument("--function", default=None, help="com --all, só as execuções desta função")
+    args = parser.parse_args()
+
+    files = args.files or find_results(function=args.function)
+    if not args.files and not args.all:
+        files = files[-1:]
+    if not files:
+        sys.exit(f"Nenhum resultado encontrado em {RESULTS_DIR}/: execute main_schwefel.py primeiro")
+
+    loaded = []
+    for path in files:
+        metadata, results = load_results(path)
+        print(f"Carregado {path} ({metadata.get('function')}, {metadata.get('dimensions')} dimensões, "
+              f"{metadata.get('saved_at')})")
+        loaded.append((metadata, results))
+
+    # Só agrega execuções da mesma função e dimensão; os arquivos levam o nome da função e, com mais
+    # de um grupo, também a dimensão
+    groups = _group_by_problem(loaded)
     print("\nGerando gráficos...")
-    # Gera os gráficos com base nos resultados obtidos
-    plot_schwefel_convergence(results_data)
-    plot_schwefel_comparison(results_data)
+    for (function, dimensions), runs in groups.items():
+        suffix = f"_{dimensions}d" if len(groups) > 1 else ""
+        label = _problem_label(function, dimensions, len(runs))
+        plot_schwefel_convergence(runs, f"{function}_convergence{suffix}.png", label)
+        plot_schwefel_comparison(runs, f"{function}_comparison{suffix}.png", label)
     print("Geração de gráficos concluída.")
 
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Gravação e leitura dos resultados de main_schwefel.py, para que os gráficos
+sejam gerados a partir de execuções já feitas, sem rodar os algoritmos de novo.
+
+Cada execução vira um arquivo .npz: os arrays de cada algoritmo (solução,
+série de convergência e amostras do tracker) e um JSON com os escalares
+(fitness, precisão, tempo, avaliações, motivo de parada, perfil) e os
+metadados da execução (função, dimensões, orçamentos, data).
+"""
+
+import glob
+import json
+import os
+import time
+
+import numpy as np
+
+RESULTS_DIR = "schwefel_results"
+_SCALARS = ("fitness", "precision", "time", "evaluations", "evals_per_second", "stop_reason", "profile")
+
+
+def default_results_path(function, dimensions, directory=RESULTS_DIR):
+    """Caminho de um arquivo novo: <função>_<dimensões>d_<data e hora>.npz"""
+    return os.path.join(directory, f"{function}_{dimensions}d_{time.strftime('%Y%m%d_%H%M%S')}.npz")
+
+
+def save_results(path, results, metadata=None):
+    """Grava o dicionário {algoritmo: resultado ou None (falha)} de run_schwefel_optimization()"""
+    names = list(results)
+    summary = {"metadata": dict(metadata or {}, saved_at=time.strftime("%Y-%m-%d %H:%M:%S")),
+               "algorithms": names, "results": []}
+    arrays = {}
+    for i, name in enumerate(names):
+        result = results[name]
+        if result is None:
+            summary["results"].append(None)
+            continue
+        summary["results"].append({key: _plain(result[key]) for key in _SCALARS if key in result})
+        arrays[f"solution_{i}"] = np.asarray(result["solution"], dtype=np.float64)
+        arrays[f"convergence_{i}"] = np.asarray(result["convergence"], dtype=np.float64).reshape(-1, 4)
+        arrays[f"samples_{i}"] = np.asarray(result.get("samples", []), dtype=np.float64).reshape(-1, 3)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savez_compressed(path, summary=np.array(json.dumps(summary)), **arrays)
+    return path
+
+
+def _plain(value):
+    """Converte escalares NumPy para tipos do JSON"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def load_results(path):
+    """Lê um arquivo de save_results(); retorna (metadados, {algoritmo: resultado ou None})"""
+    with np.load(path, allow_pickle=False) as data:
+        summary = json.loads(str(data["summary"]))
+        results = {}
+        for i, (name, scalars) in enumerate(zip(summary["algorithms"], summary["results"])):
+            if scalars is None:
+                results[name] = None
+                continue
+            results[name] = dict(scalars,
+                                 solution=data[f"solution_{i}"],
+                                 convergence=data[f"convergence_{i}"],
+                                 samples=[tuple(row) for row in data[f"samples_{i}"].tolist()])
+    return summary["metadata"], results
+
+
+def find_results(directory=RESULTS_DIR, function=None):
+    """Arquivos de resultados do diretório (opcionalmente de uma função), do mais antigo ao mais novo"""
+    pattern = f"{function}_*.npz" if function else "*.npz"
+    return sorted(glob.glob(os.path.join(directory, pattern)), key=os.path.getmtime)
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+from util import TSPProblem
+from util.TSP.generator import generate_geometric_instance, generate_sparse_instance, write_instance
+
+# Os módulos de schwefel_optimization importam uns aos outros pelo nome, como scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'schwefel_optimization'))
+
+
+@pytest.fixture(scope='session')
+def make_problem(tmp_path_factory):
+    """Instâncias geradas (com semente fixa) gravadas num diretório temporário"""
+    directory = tmp_path_factory.mktemp('instances')
+
+    def make(num_cities, kind='sparse', seed=0, degree=None):
+        """`degree`: arestas extras por cidade (esparso) ou vizinhos mais próximos (geométrico)"""
+        if kind == 'geometric':
+            cities, edges, start_city, _ = generate_geometric_instance(num_cities, degree or 6, seed=seed)
+        else:
+            cities, edges, start_city = generate_sparse_instance(num_cities, degree or 2.0, seed=seed)
+        path = directory / f'{kind}_{num_cities}_{seed}_{degree}.txt'
+        write_instance(str(path), cities, edges, start_city)
+        return TSPProblem(str(path))
+
+    return make
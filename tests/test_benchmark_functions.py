@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from benchmark_functions import PROBLEMS, get_problem
+
+
+@pytest.mark.parametrize('name', sorted(PROBLEMS))
+@pytest.mark.parametrize('dimensions', [1, 2, 5, 30])
+def test_optimum(name, dimensions):
+    """optimum_position() está no domínio, vale o mínimo conhecido (0) e nenhum ponto aleatório é melhor"""
+    problem = get_problem(name, dimensions)
+    optimum = problem.optimum_position()
+    assert optimum.shape == (dimensions,)
+    assert problem.optimum_value == pytest.approx(problem.evaluate(optimum))
+    assert problem.optimum_value == pytest.approx(0.0, abs=1e-3 * dimensions)
+
+    np.random.seed(0)
+    values = problem.evaluate_batch(problem.random_solutions(1000))
+    assert np.all(values >= problem.optimum_value)
+    assert problem.precision(optimum) == 0.0
+
+
+def test_outside_bounds_is_infinite():
+    problem = get_problem('rastrigin', 3)
+    assert problem.evaluate([0.0, 0.0, 6.0]) == np.inf
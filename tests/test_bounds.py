@@ -0,0 +1,35 @@
+import math
+import os
+
+import pytest
+
+from algoritimos import HeldKarp
+from algoritimos.TSP.construction import construct
+from util import TSPProblem
+from util.TSP.bounds import held_karp_bound, one_tree_bound
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _check_bounds(problem):
+    optimum = problem.path_distance(HeldKarp(problem).solve())
+    one_tree = one_tree_bound(problem)
+    bound = held_karp_bound(problem)
+    assert one_tree <= bound <= optimum
+    assert bound == math.floor(bound)  # Pesos inteiros: limite arredondado para cima
+    assert bound <= problem.path_distance(problem.to_city_tour(construct(problem)))
+
+
+def test_bounds_on_base_instance():
+    _check_bounds(TSPProblem(os.path.join(ROOT_DIR, 'distancias.txt')))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_bounds_below_optimum(make_problem, seed):
+    _check_bounds(make_problem(12, seed=seed))
+
+
+def test_upper_bound_does_not_change_validity(make_problem):
+    problem = make_problem(12)
+    optimum = problem.path_distance(HeldKarp(problem).solve())
+    assert held_karp_bound(problem, upper_bound=optimum) <= optimum
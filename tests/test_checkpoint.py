@@ -0,0 +1,29 @@
+import pytest
+
+from algoritimos import HillClimbing, SimulatedAnnealing, TabuSearch
+from algoritimos.TSP.tour import TWO_LEVEL_THRESHOLD
+from util.seeding import seed_everything
+
+# (solver, parâmetros, intervalo entre checkpoints): o último checkpoint fica no meio da execução
+SOLVERS = [
+    (HillClimbing, {'max_iterations': 2500}, 1000),
+    (SimulatedAnnealing, {'max_iterations': 5}, 2),
+    (TabuSearch, {'max_iterations': 50}, 20),
+]
+
+
+@pytest.mark.parametrize('solver_class, params, every', SOLVERS)
+def test_resume_large_instance(make_problem, tmp_path, solver_class, params, every):
+    """A partir de TWO_LEVEL_THRESHOLD cidades a rota retomada é uma TwoLevelTour reconstruída"""
+    problem = make_problem(TWO_LEVEL_THRESHOLD, 'geometric')
+    path = str(tmp_path / 'run.ckpt')
+
+    seed_everything(1)
+    uninterrupted = solver_class(problem, checkpoint_path=path, checkpoint_every=every, **params)
+    route = uninterrupted.solve()
+
+    seed_everything(2)  # O estado dos RNGs vem do checkpoint
+    resumed = solver_class(problem, **params)
+    assert resumed.resume(path) == route
+    assert resumed.tracker.evaluations == uninterrupted.tracker.evaluations
+    assert (resumed.convergence.data[:, [0, 1, 3]] == uninterrupted.convergence.data[:, [0, 1, 3]]).all()
@@ -0,0 +1,60 @@
+import random
+
+import numpy as np
+import pytest
+
+from util.convergence import ConvergenceRecorder
+
+
+def _record(recorder, count, seed=0):
+    """Registra `count` pontos com o melhor valor acumulado (como os solvers); retorna as linhas"""
+    rng = random.Random(seed)
+    best = float('inf')
+    rows = []
+    for i in range(count):
+        best = min(best, rng.uniform(0, 1000))
+        row = (i, 3 * i + 1, 0.01 * i, best)
+        recorder.record(*row)
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize('capacity', [2, 4, 16])
+@pytest.mark.parametrize('count', [1, 2, 3, 15, 16, 17, 33, 100, 1000])
+def test_bounded_and_keeps_endpoints(capacity, count):
+    recorder = ConvergenceRecorder(capacity)
+    rows = _record(recorder, count)
+    data = recorder.data
+    assert data.shape[1] == 4
+    assert len(data) == len(recorder) <= capacity
+    assert tuple(data[0]) == rows[0]
+    assert tuple(data[-1]) == rows[-1]
+
+
+def test_keeps_running_best():
+    recorder = ConvergenceRecorder(16)
+    rows = _record(recorder, 5000)
+    data = recorder.data
+    # Subsequência ordenada dos pontos registrados, cobrindo a execução inteira
+    recorded = {row[0]: row for row in rows}
+    assert all(tuple(row) == recorded[row[0]] for row in data)
+    assert np.all(np.diff(data[:, 0]) > 0)
+    assert np.all(np.diff(recorder.column('best')) <= 0)
+    assert recorder.column('best')[-1] == min(row[3] for row in rows)
+    assert np.max(np.diff(data[:, 0])) <= 2 * 5000 / 16
+
+
+def test_state_round_trip():
+    recorder = ConvergenceRecorder(8)
+    _record(recorder, 37)
+    restored = ConvergenceRecorder(8)
+    restored.set_state(recorder.get_state())
+    for i in range(37, 120):
+        recorder.record(i, i, 0.0, -i)
+        restored.record(i, i, 0.0, -i)
+    np.testing.assert_array_equal(restored.data, recorder.data)
+
+
+def test_capacity_must_be_even():
+    with pytest.raises(ValueError):
+        ConvergenceRecorder(3)
@@ -0,0 +1,81 @@
+import itertools
+import math
+import os
+import random
+
+import pytest
+
+from algoritimos import HeldKarp
+from util import TSPProblem
+from util.TSP.generator import write_instance
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _brute_force(problem):
+    """Menor custo de ciclo por enumeração (infinito se não houver ciclo hamiltoniano)"""
+    others = [city for city in problem.cities if city != problem.start_city]
+    return min(problem.path_distance([problem.start_city] + list(order))
+               for order in itertools.permutations(others))
+
+
+def _random_graph(tmp_path, num_cities, density, seed):
+    """Grafo aleatório com cada aresta presente com probabilidade `density` (pode não ter ciclo)"""
+    rng = random.Random(seed)
+    cities = [str(i) for i in range(1, num_cities + 1)]
+    while True:  # TSPProblem recusa cidades isoladas
+        edges = [(a, b, rng.randint(1, 50)) for a, b in itertools.combinations(cities, 2)
+                 if rng.random() < density]
+        if {city for edge in edges for city in edge[:2]} == set(cities):
+            break
+    path = tmp_path / f'random_{num_cities}_{seed}.txt'
+    write_instance(str(path), cities, edges, cities[0])
+    return TSPProblem(str(path))
+
+
+def test_base_instance_optimum():
+    problem = TSPProblem(os.path.join(ROOT_DIR, 'distancias.txt'))
+    solver = HeldKarp(problem)
+    route = solver.solve()
+    assert problem.is_valid_route(route)
+    assert problem.path_distance(route) == solver.optimal_distance == 398
+    assert solver.tracker.stop_reason == 'iterations'
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_matches_brute_force(tmp_path, seed):
+    problem = _random_graph(tmp_path, 5 + seed % 5, 0.6, seed)
+    optimum = _brute_force(problem)
+    if math.isinf(optimum):
+        with pytest.raises(ValueError):
+            HeldKarp(problem).solve()
+    else:
+        route = HeldKarp(problem).solve()
+        assert problem.is_valid_route(route)
+        assert problem.path_distance(route) == optimum
+
+
+def test_matches_brute_force_on_generated_sparse(make_problem):
+    for seed in range(3):
+        problem = make_problem(9, seed=seed)
+        assert problem.path_distance(HeldKarp(problem).solve()) == _brute_force(problem)
+
+
+def test_graph_without_hamiltonian_cycle(tmp_path):
+    # Duas "gravatas" ligadas só pela cidade X: todo ciclo passaria duas vezes por X
+    path = tmp_path / 'bowtie.txt'
+    write_instance(str(path), ['X', 'A', 'B', 'C', 'D'],
+                   [('X', 'A', 1), ('X', 'B', 1), ('A', 'B', 1), ('X', 'C', 1), ('X', 'D', 1), ('C', 'D', 1)], 'X')
+    with pytest.raises(ValueError):
+        HeldKarp(TSPProblem(str(path))).solve()
+
+
+def test_refuses_large_instances(make_problem):
+    problem = make_problem(12)
+    assert HeldKarp.supports(problem)
+    assert not HeldKarp.supports(problem, max_cities=11)
+    with pytest.raises(ValueError):
+        HeldKarp(problem, max_cities=11)
+    with pytest.raises(ValueError):
+        HeldKarp(problem, max_memory_mb=HeldKarp.memory_estimate(12) / 2 ** 20 / 2)
+    assert HeldKarp.memory_estimate(21) > 2 * HeldKarp.memory_estimate(20)
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from algoritimos.TSP.construction import construct
+from algoritimos.TSP.local_search import improve, repair
+from algoritimos.TSP.tour import TwoLevelTour
+
+
+def _cost(tour, weights):
+    return sum(weights[tour[i - 1]].get(tour[i], float('inf')) for i in range(len(tour)))
+
+
+@pytest.mark.parametrize('kind', ['sparse', 'geometric'])
+@pytest.mark.parametrize('seed', range(5))
+def test_improve_never_raises_cost(make_problem, kind, seed):
+    problem = make_problem(150, kind, seed)
+    weights = problem.int_weights
+    tour = construct(problem, 'nearest_neighbor', random.Random(seed))
+    start = tour[0]
+    before = _cost(tour, weights)
+
+    delta, moves = improve(tour, weights, problem.neighbor_lists)
+    after = _cost(tour, weights)
+    assert tour[0] == start
+    assert sorted(tour) == list(range(len(problem.cities)))
+    assert after <= before
+    assert after == pytest.approx(before + delta)
+    assert (moves > 0) == (delta < 0)
+
+
+def test_improve_on_two_level_tour(make_problem):
+    problem = make_problem(300, 'geometric')
+    weights = problem.int_weights
+    order = construct(problem)
+    tour = TwoLevelTour(order, segment_size=4)
+    before = _cost(order, weights)
+
+    delta, _ = improve(tour, weights, problem.neighbor_lists)
+    after = tour.to_list(order[0])
+    assert sorted(after) == list(range(len(problem.cities)))
+    assert _cost(after, weights) == pytest.approx(before + delta)
+    assert delta <= 0
+
+
+def test_improve_respects_max_moves(make_problem):
+    problem = make_problem(150)
+    tour = construct(problem)
+    _, moves = improve(tour, problem.int_weights, problem.neighbor_lists, max_moves=3)
+    assert moves <= 3
+
+
+def _random_tour(problem, rng):
+    start = problem.city_index[problem.start_city]
+    rest = [city for city in range(len(problem.cities)) if city != start]
+    rng.shuffle(rest)
+    return [start] + rest
+
+
+@pytest.mark.parametrize('kind', ['sparse', 'geometric'])
+@pytest.mark.parametrize('seed', range(5))
+def test_repair_gives_valid_permutation(make_problem, kind, seed):
+    problem = make_problem(200, kind, seed)
+    weights = problem.int_weights
+    tour = _random_tour(problem, random.Random(seed))
+    start = tour[0]
+
+    assert repair(tour, weights, problem.neighbor_lists, rng=random.Random(seed)) == 0
+    assert tour[0] == start
+    assert sorted(tour) == list(range(len(problem.cities)))
+    assert _cost(tour, weights) < float('inf')
+
+
+def test_repair_keeps_valid_tour(make_problem):
+    problem = make_problem(100)
+    tour = construct(problem)
+    before = list(tour)
+    assert repair(tour, problem.int_weights, problem.neighbor_lists) == 0
+    assert tour == before
+
+
+def test_repair_respects_max_moves(make_problem):
+    problem = make_problem(100)
+    tour = _random_tour(problem, random.Random(0))
+    missing = sum(tour[i] not in problem.int_weights[tour[i - 1]] for i in range(len(tour)))
+    assert repair(list(tour), problem.int_weights, problem.neighbor_lists, max_moves=0) == missing
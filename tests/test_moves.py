@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from algoritimos.TSP.construction import construct
+from algoritimos.TSP.moves import OPERATORS, move_segment, positions, tour_cost
+from util.TSP.generator import write_instance
+from util import TSPProblem
+
+
+def _check_tour(tour, pos, start):
+    assert tour[0] == start
+    assert sorted(tour) == list(range(len(tour)))
+    assert pos == positions(tour)
+
+
+@pytest.mark.parametrize('name', list(OPERATORS))
+@pytest.mark.parametrize('kind, degree', [('sparse', 2.0), ('sparse', 15.0), ('geometric', 6)])
+def test_delta_matches_cost_change(make_problem, name, kind, degree):
+    problem = make_problem(60, kind, degree=degree)
+    weights, neighbors = problem.int_weights, problem.neighbor_lists
+    operator = OPERATORS[name]
+    rng = random.Random(name)
+    tour = construct(problem)
+    pos = positions(tour)
+    start = tour[0]
+    cost = tour_cost(tour, weights)
+
+    applied = 0
+    for _ in range(500):
+        delta = operator(tour, pos, weights, neighbors, rng)
+        if delta is None:
+            continue
+        applied += 1
+        new_cost = tour_cost(tour, weights)
+        # Movimentos só criam arestas existentes: a rota continua viável
+        assert new_cost < float('inf')
+        assert delta == pytest.approx(new_cost - cost)
+        _check_tour(tour, pos, start)
+        cost = new_cost
+    # Em grafos aleatórios bem esparsos quase não há triângulos, que Or-opt e troca exigem
+    assert applied > 0 or degree == 2.0
+
+
+@pytest.mark.parametrize('name', list(OPERATORS))
+def test_infeasible_moves_are_rejected(tmp_path, name):
+    # Num anel o único ciclo hamiltoniano é o próprio anel: nenhum movimento pode mudá-lo
+    cities = [str(i) for i in range(12)]
+    path = tmp_path / 'ring.txt'
+    write_instance(str(path), cities, [(cities[i - 1], cities[i], i + 1) for i in range(12)], cities[0])
+    problem = TSPProblem(str(path))
+    weights = problem.int_weights
+    tour = construct(problem)
+    pos = positions(tour)
+    cost = tour_cost(tour, weights)
+    edges = {frozenset(edge) for edge in zip(tour, tour[1:] + tour[:1])}
+
+    rng = random.Random(0)
+    for _ in range(200):
+        before = list(tour)
+        delta = OPERATORS[name](tour, pos, weights, problem.neighbor_lists, rng)
+        if delta is None:
+            assert tour == before
+        else:
+            assert delta == 0
+        assert {frozenset(edge) for edge in zip(tour, tour[1:] + tour[:1])} == edges
+        assert tour_cost(tour, weights) == cost
+        _check_tour(tour, pos, before[0])
+
+
+def test_move_segment():
+    rng = random.Random(0)
+    for _ in range(300):
+        n = rng.randint(4, 15)
+        tour = list(range(n))
+        rng.shuffle(tour)
+        pos = positions(tour)
+        i = rng.randint(1, n - 1)
+        k = rng.randint(i, n - 1)
+        q = rng.choice([x for x in range(n) if not i - 1 <= x <= k] or [i - 1])
+        segment, rest = tour[i:k + 1], tour[:i] + tour[k + 1:]
+        after = rest.index(tour[q]) + 1
+        expected = rest[:after] + segment + rest[after:]
+
+        move_segment(tour, pos, i, k, q)
+        assert tour == expected
+        assert pos == positions(tour)
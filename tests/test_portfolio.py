@@ -0,0 +1,58 @@
+import math
+import os
+
+from algoritimos import HeldKarp, HillClimbing
+from util import TSPProblem
+from util.TSP.portfolio import SharedIncumbent, run_cooperative
+from util.seeding import seed_everything
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _problem():
+    return TSPProblem(os.path.join(ROOT_DIR, 'distancias.txt'))
+
+
+def test_incumbent_only_keeps_better_tours():
+    incumbent = SharedIncumbent(4)
+    assert incumbent.read() is None
+    assert incumbent.cost == math.inf
+
+    assert incumbent.publish([0, 1, 2, 3], 10.0, source=1)
+    assert not incumbent.publish([0, 2, 1, 3], 12.0, source=2)
+    assert not incumbent.publish([0, 2, 1, 3], 10.0, source=2)
+    sequence, tour, cost, source = incumbent.read()
+    assert (tour, cost, source) == ([0, 1, 2, 3], 10.0, 1)
+    assert sequence == incumbent.sequence and sequence % 2 == 0
+
+    assert incumbent.publish([0, 3, 2, 1], 8.0, source=3)
+    assert incumbent.sequence > sequence
+    assert incumbent.read()[1:] == ([0, 3, 2, 1], 8.0, 3)
+
+
+def test_run_cooperative_publishes_solver_best():
+    problem = _problem()
+    seed_everything(0)
+    solver = HillClimbing(problem, max_iterations=200)
+    incumbent = SharedIncumbent(len(problem.cities))
+
+    route = run_cooperative(solver, incumbent, source=0, exchange_interval=0)
+    assert problem.is_valid_route(route)
+    _, tour, cost, source = incumbent.read()
+    assert cost == problem.path_distance(route) and source == 0
+    assert problem.to_city_tour(tour) == route
+
+
+def test_run_cooperative_adopts_better_incumbent():
+    problem = _problem()
+    optimal = HeldKarp(problem).solve()
+    optimum = problem.path_distance(optimal)
+    incumbent = SharedIncumbent(len(problem.cities))
+    incumbent.publish(problem.to_int_tour(optimal), optimum, source=1)
+
+    # Uma só iteração: a rota é adotada depois do último snapshot
+    seed_everything(0)
+    solver = HillClimbing(problem, max_iterations=1)
+    route = run_cooperative(solver, incumbent, source=0, exchange_interval=0)
+    assert problem.path_distance(route) == optimum
+    assert incumbent.read()[3] == 1  # A rota do portfólio não foi substituída
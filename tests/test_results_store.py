@@ -0,0 +1,44 @@
+import numpy as np
+
+from results_store import load_results, save_results
+
+
+def test_round_trip(tmp_path):
+    results = {
+        'Hill Climbing': {
+            'solution': np.array([420.9687, -302.5]),
+            'convergence': [(0, 1, 800.0, 800.0), (1, 2, 650.0, 650.0)],
+            'samples': [(0.1, 10, 700.0)],
+            'fitness': np.float64(650.0),
+            'precision': 1e-3,
+            'time': 0.25,
+            'evaluations': np.int64(2),
+            'stop_reason': 'evaluations',
+        },
+        'Ant Colony': None,  # Falhou
+        'Genetic Algorithm': {
+            'solution': [0.0, 0.0],
+            'convergence': [],
+            'fitness': 837.9,
+            'evaluations': 0,
+        },
+    }
+    path = save_results(str(tmp_path / 'run.npz'), results, {'function': 'schwefel', 'dimensions': 2})
+
+    metadata, loaded = load_results(path)
+    assert (metadata['function'], metadata['dimensions']) == ('schwefel', 2)
+    assert 'saved_at' in metadata
+    assert list(loaded) == list(results)
+    assert loaded['Ant Colony'] is None
+
+    hill = loaded['Hill Climbing']
+    np.testing.assert_array_equal(hill['solution'], results['Hill Climbing']['solution'])
+    np.testing.assert_array_equal(hill['convergence'], results['Hill Climbing']['convergence'])
+    assert hill['samples'] == [(0.1, 10.0, 700.0)]
+    assert (hill['fitness'], hill['evaluations'], hill['stop_reason']) == (650.0, 2, 'evaluations')
+    assert type(hill['evaluations']) is int
+
+    genetic = loaded['Genetic Algorithm']
+    assert genetic['convergence'].shape == (0, 4)
+    assert genetic['samples'] == []
+    assert 'stop_reason' not in genetic
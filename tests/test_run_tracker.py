@@ -0,0 +1,38 @@
+from algoritimos import HillClimbing
+from util.run_tracker import RunTracker
+from util.seeding import seed_everything
+
+
+def test_snapshot_converts_solution_on_access():
+    calls = []
+
+    def solution():
+        calls.append(1)
+        return ['a', 'b']
+
+    snapshot = RunTracker().snapshot(3, 10.0, solution)
+    assert snapshot['iteration'] == 3 and snapshot['best_cost'] == 10.0
+    assert not calls
+    assert snapshot['best_solution'] == ['a', 'b']
+    assert snapshot.get('best_solution') == ['a', 'b']
+    assert len(calls) == 1
+    assert snapshot.get('missing', 0) == 0
+
+    plain = RunTracker().snapshot(1, 5.0, ['c'])
+    assert plain['best_solution'] == plain.get('best_solution') == ['c']
+
+
+def test_hill_climbing_converts_only_when_asked(make_problem):
+    problem = make_problem(300, 'geometric')
+    conversions = []
+    to_city_tour = problem.to_city_tour
+    problem.to_city_tour = lambda tour: conversions.append(1) or to_city_tour(tour)
+    try:
+        seed_everything(0)
+        solver = HillClimbing(problem, max_iterations=2000)
+        snapshots = list(solver.solve_iter())
+        assert len(conversions) <= 2  # Rota inicial e, no máximo, a do fim
+        assert snapshots[-1]['best_solution'] == solver.result()
+        assert problem.path_distance(solver.result()) == solver.tracker.best
+    finally:
+        del problem.to_city_tour
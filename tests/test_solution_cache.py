@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from algoritimos.TSP.construction import construct
+from util.TSP.solution_cache import SolutionCache
+
+
+def _route(problem, method='nearest_neighbor'):
+    route = problem.to_city_tour(construct(problem, method))
+    return route, problem.path_distance(route)
+
+
+def test_round_trip(make_problem, tmp_path):
+    problem = make_problem(30)
+    cache = SolutionCache(str(tmp_path / 'cache.sqlite'))
+    assert cache.get(problem) is None
+
+    route, cost = _route(problem)
+    assert cache.put(problem, route, cost, solver='hc', instance='a.txt')
+    cached = cache.get(problem)
+    assert cached.route == route and cached.cost == cost
+    assert (cached.solver, cached.instance, cached.exact) == ('hc', 'a.txt', True)
+    assert len(cache) == 1
+
+    # Outro objeto com o mesmo conteúdo tem o mesmo fingerprint
+    assert SolutionCache(cache.path).get(make_problem(30)).route == route
+
+
+def test_only_stores_better_tours(make_problem, tmp_path):
+    problem = make_problem(30)
+    cache = SolutionCache(str(tmp_path / 'cache.sqlite'))
+    route, cost = _route(problem)
+    assert cache.put(problem, route, cost, solver='first')
+    assert not cache.put(problem, route, cost, solver='same')
+    assert not cache.put(problem, route, cost + 1, solver='worse')
+    assert cache.get(problem).solver == 'first'
+
+    assert cache.put(problem, route, cost - 1, solver='better')
+    assert cache.get(problem).solver == 'better'
+    assert len(cache) == 1
+
+    with pytest.raises(ValueError):
+        cache.put(problem, route[:-1], 1.0)
+
+
+def test_same_cities_fallback_after_edge_change(make_problem, tmp_path):
+    problem = make_problem(30)
+    cache = SolutionCache(str(tmp_path / 'cache.sqlite'))
+    route, cost = _route(problem)
+    cache.put(problem, route, cost, instance='before.txt')
+
+    problem.set_weight(route[0], route[1], problem.distances[route[0]][route[1]] + 5)
+    cached = cache.get(problem)
+    assert cached is not None and not cached.exact
+    assert (cached.route, cached.cost, cached.instance) == (route, cost, 'before.txt')
+
+    # Outra instância (outras cidades) não usa a rota
+    assert cache.get(make_problem(31)) is None
+
+
+def test_lru_eviction(make_problem, tmp_path):
+    cache = SolutionCache(str(tmp_path / 'cache.sqlite'), max_entries=3)
+    problems = [make_problem(20, seed=seed) for seed in range(5)]
+    for problem in problems[:3]:
+        cache.put(problem, *_route(problem))
+        time.sleep(0.01)
+    cache.get(problems[0])  # Usada agora: a menos recente passa a ser a 1
+    time.sleep(0.01)
+    for problem in problems[3:]:
+        cache.put(problem, *_route(problem))
+        time.sleep(0.01)
+
+    assert len(cache) == 3
+    # As instâncias têm as mesmas cidades: as descartadas ainda recebem a rota de outra, mas não a própria
+    assert [cache.get(problem).exact for problem in problems] == [True, False, False, True, True]
+
+    with pytest.raises(ValueError):
+        SolutionCache(str(tmp_path / 'other.sqlite'), max_entries=0)
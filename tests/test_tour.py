@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from algoritimos.TSP.tour import ArrayTour, TwoLevelTour, TWO_LEVEL_THRESHOLD, make_tour
+
+
+def _check(tour, reference):
+    """Mesma rota, no mesmo sentido, que a ArrayTour de referência, com next/prev coerentes com to_list"""
+    order = tour.to_list(0)
+    assert order == reference.to_list(0)
+    for i, city in enumerate(order):
+        assert tour.next(city) == order[(i + 1) % len(order)]
+        assert tour.prev(city) == order[i - 1]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_two_level_matches_array(seed):
+    rng = random.Random(seed)
+    n = rng.choice([5, 8, 17, 64, 150])
+    order = list(range(n))
+    rng.shuffle(order)
+    array = ArrayTour(order)
+    two_level = TwoLevelTour(order, segment_size=rng.choice([None, 2, 3, 5]))
+
+    for _ in range(200):
+        operation = rng.random()
+        if operation < 0.3:
+            a, b = rng.sample(range(n), 2)
+            array.reverse(a, b)
+            two_level.reverse(a, b)
+        elif operation < 0.6:
+            a, c = rng.sample(range(n), 2)
+            b, d = array.next(a), array.next(c)
+            if b == c or d == a:
+                continue
+            array.two_opt_move(a, b, c, d)
+            two_level.two_opt_move(a, b, c, d)
+        elif operation < 0.8 and n >= 5:
+            first = rng.randrange(n)
+            last = first
+            for _ in range(rng.randrange(3)):
+                last = array.next(last)
+            segment = set()
+            city = first
+            while True:
+                segment.add(city)
+                if city == last:
+                    break
+                city = array.next(city)
+            c = rng.randrange(n)
+            d = array.next(c)
+            if c in segment or d == first or array.prev(first) == c:
+                continue
+            array.move_segment(first, last, c, d)
+            two_level.move_segment(first, last, c, d)
+        else:
+            a, b, c = (rng.randrange(n) for _ in range(3))
+            order = array.to_list(a)
+            assert array.between(a, b, c) == two_level.between(a, b, c) == (order.index(b) <= order.index(c))
+            continue
+        _check(two_level, array)
+
+
+def test_orientation_does_not_depend_on_segments():
+    """Uma rota reconstruída com outra divisão em segmentos (como ao retomar um checkpoint) segue igual"""
+    rng = random.Random(0)
+    n = TWO_LEVEL_THRESHOLD + 1000
+    order = list(range(n))
+    rng.shuffle(order)
+    tour = TwoLevelTour(order)
+    for _ in range(500):
+        a, c = rng.sample(range(n), 2)
+        b, d = tour.next(a), tour.next(c)
+        if b != c and d != a:
+            tour.two_opt_move(a, b, c, d)
+    rebuilt = TwoLevelTour(tour.to_list(0), segment_size=7)
+    for _ in range(3000):
+        a, c = rng.sample(range(n), 2)
+        b, d = tour.next(a), tour.next(c)
+        if b == c or d == a:
+            continue
+        assert (rebuilt.next(a), rebuilt.next(c)) == (b, d)
+        tour.two_opt_move(a, b, c, d)
+        rebuilt.two_opt_move(a, b, c, d)
+    assert rebuilt.to_list(0) == tour.to_list(0)
+
+
+def test_make_tour_switches_at_threshold():
+    assert isinstance(make_tour(list(range(TWO_LEVEL_THRESHOLD - 1))), ArrayTour)
+    assert isinstance(make_tour(list(range(TWO_LEVEL_THRESHOLD))), TwoLevelTour)
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from algoritimos.TSP.construction import construct, warm_start
+from algoritimos.TSP.moves import tour_cost
+
+
+def _check_consistent(problem):
+    """distances, adjacency_list, int_weights e neighbor_lists descrevem o mesmo grafo"""
+    index = problem.city_index
+    for city in problem.cities:
+        i = index[city]
+        weights = problem.int_weights[i]
+        assert {index[other]: distance for other, distance in problem.distances[city].items()} == weights
+        assert problem.adjacency_list[city] == set(problem.distances[city])
+        assert sorted(problem.neighbor_lists[i]) == sorted(weights)
+        assert [weights[j] for j in problem.neighbor_lists[i]] == sorted(weights.values())
+        for j, distance in weights.items():
+            assert problem.int_weights[j][i] == distance  # Grafo não direcionado
+
+
+def _edge(problem, rng, present=True):
+    while True:
+        city1, city2 = rng.sample(problem.cities, 2)
+        if (city2 in problem.distances[city1]) == present:
+            return city1, city2
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_edge_updates_keep_views_consistent(make_problem, seed):
+    problem = make_problem(40, seed=seed)
+    rng = random.Random(seed)
+    for step in range(60):
+        fingerprint = problem.fingerprint()
+        operation = step % 3
+        if operation == 0:
+            city1, city2 = _edge(problem, rng)
+            # Peso novo que passa a ser o mais barato ou o mais caro das duas cidades
+            problem.set_weight(city1, city2, rng.choice([step / 100, 1000.0 + step]))
+        elif operation == 1:
+            city1, city2 = _edge(problem, rng, present=False)
+            problem.add_edge(city1, city2, rng.randint(1, 100))
+        else:
+            city1, city2 = _edge(problem, rng)
+            try:
+                problem.remove_edge(city1, city2)
+            except ValueError:
+                continue
+        assert problem.fingerprint() != fingerprint
+        _check_consistent(problem)
+
+
+def test_edge_update_errors(make_problem):
+    problem = make_problem(20)
+    rng = random.Random(0)
+    city1, city2 = _edge(problem, rng, present=False)
+    with pytest.raises(ValueError):
+        problem.set_weight(city1, city2, 1.0)
+    with pytest.raises(ValueError):
+        problem.remove_edge(city1, city2)
+    city1, city2 = _edge(problem, rng)
+    with pytest.raises(ValueError):
+        problem.add_edge(city1, city2, 1.0)
+    with pytest.raises(ValueError):
+        problem.add_edge(city1, city1, 1.0)
+
+
+def test_remove_edge_refuses_isolating_a_city(make_problem):
+    problem = make_problem(20)
+    city = problem.cities[0]
+    neighbors = list(problem.distances[city])
+    for other in neighbors[:-1]:
+        try:
+            problem.remove_edge(city, other)
+        except ValueError:
+            pass  # A outra ponta ficaria sem conexões
+    last = neighbors[-1]
+    assert list(problem.distances[city]) == [last]
+    fingerprint = problem.fingerprint()
+    with pytest.raises(ValueError):
+        problem.remove_edge(city, last)
+    assert list(problem.distances[city]) == [last]
+    assert problem.fingerprint() == fingerprint
+    _check_consistent(problem)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_warm_start_after_removing_a_tour_edge(make_problem, seed):
+    problem = make_problem(200, 'geometric', seed)
+    rng = random.Random(seed)
+    route = problem.to_city_tour(construct(problem))
+    removed = None
+    while removed is None:
+        k = rng.randrange(len(route))
+        city1, city2 = route[k - 1], route[k]
+        try:
+            problem.remove_edge(city1, city2)
+            removed = city1, city2
+        except ValueError:
+            pass
+
+    assert problem.path_distance(route) == float('inf')
+    tour = warm_start(problem, route, changed=removed)
+    assert sorted(tour) == list(range(len(problem.cities)))
+    assert tour[0] == problem.city_index[problem.start_city]
+    assert tour_cost(tour, problem.int_weights) < float('inf')
+
+
+def test_warm_start_rejects_other_cities(make_problem):
+    problem = make_problem(20)
+    with pytest.raises(ValueError):
+        warm_start(problem, problem.cities[:-1])
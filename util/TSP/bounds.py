@@ -0,0 +1,105 @@
+import math
+from typing import Optional
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import minimum_spanning_tree
+
+from util.TSP.tsp_problem import TSPProblem
+
+
+def _edge_arrays(problem: TSPProblem):
+    index = problem.city_index
+    edges = problem.edges()
+    u = np.array([index[a] for a, _, _ in edges], dtype=np.int64)
+    v = np.array([index[b] for _, b, _ in edges], dtype=np.int64)
+    w = np.array([d for _, _, d in edges], dtype=np.float64)
+    return u, v, w
+
+
+def _one_tree(n, u, v, w, special, pi):
+    """
+    1-tree mínima com pesos w + pi[u] + pi[v]: árvore geradora mínima das
+    cidades sem `special` mais as duas arestas mais baratas de `special`.
+    Retorna (custo modificado, graus) ou None se não existir 1-tree.
+    """
+    modified = w + pi[u] + pi[v]
+    at_special = (u == special) | (v == special)
+    special_costs = modified[at_special]
+    if len(special_costs) < 2:
+        return None
+
+    rest = ~at_special
+    ru, rv, rw = u[rest], v[rest], modified[rest]
+    # O MST não muda com um deslocamento constante; garante pesos > 0 (o csgraph ignora zeros)
+    shift = 1.0 - rw.min() if len(rw) else 0.0
+    graph = coo_matrix((rw + shift, (ru, rv)), shape=(n, n)).tocsr()
+    tree = minimum_spanning_tree(graph).tocoo()
+    if tree.nnz != n - 2:
+        return None  # As demais cidades não são conexas: não há ciclo hamiltoniano
+
+    two = np.argpartition(special_costs, 1)[:2]
+    special_edges = np.flatnonzero(at_special)[two]
+    cost = tree.data.sum() - shift * tree.nnz + special_costs[two].sum()
+
+    degrees = (np.bincount(tree.row, minlength=n) + np.bincount(tree.col, minlength=n)
+               + np.bincount(u[special_edges], minlength=n) + np.bincount(v[special_edges], minlength=n))
+    return cost, degrees
+
+
+def one_tree_bound(problem: TSPProblem) -> float:
+    """Limite inferior pela 1-tree mínima (sem penalidades); infinito se não houver ciclo"""
+    return held_karp_bound(problem, iterations=1)
+
+
+def held_karp_bound(problem: TSPProblem, iterations: int = 100,
+                    upper_bound: Optional[float] = None, step: float = 2.0) -> float:
+    """
+    Limite inferior de Held-Karp: maximiza, por subgradiente, o custo da 1-tree
+    com penalidades pi nos vértices (L(pi) = 1-tree(w + pi) - 2·Σpi).
+
+    Funciona sobre a lista de adjacência esparsa (só as arestas existentes).
+    O passo segue Held-Wolfe-Crowder, step · (UB - L) / ||g||², e é reduzido
+    à metade quando o limite não melhora por algumas iterações. Sem
+    `upper_bound`, usa 2 × a primeira 1-tree como estimativa: superestimar só
+    custa algumas reduções de passo, subestimar trava o limite. Com pesos
+    inteiros o limite é arredondado para cima. Retorna infinito se o grafo
+    não admite ciclo hamiltoniano.
+    """
+    n = len(problem.cities)
+    if n < 3:
+        raise ValueError("São necessárias pelo menos 3 cidades")
+    u, v, w = _edge_arrays(problem)
+    special = problem.city_index[problem.start_city]
+    pi = np.zeros(n)
+
+    best = -math.inf
+    stall = 0
+    for _ in range(iterations):
+        result = _one_tree(n, u, v, w, special, pi)
+        if result is None:
+            return math.inf
+        cost, degrees = result
+        bound = cost - 2 * pi.sum()
+        if bound > best + 1e-9:
+            best = bound
+            stall = 0
+        else:
+            stall += 1
+            if stall >= 5:
+                step /= 2
+                stall = 0
+
+        subgradient = degrees - 2
+        norm = float(subgradient @ subgradient)
+        if norm == 0:
+            break  # A 1-tree é um ciclo hamiltoniano: o limite é ótimo
+        if upper_bound is None:
+            upper_bound = 2 * best if best > 0 else best + 1.0
+        pi += step * max(upper_bound - bound, 1e-9) / norm * subgradient
+        if step < 1e-6:
+            break
+
+    if np.all(w == np.round(w)):
+        best = math.ceil(best - 1e-6)
+    return float(best)
@@ -0,0 +1,150 @@
+import argparse
+import random
+import time
+from typing import Dict, List, Tuple
+
+from util.TSP.tsp_problem import TSPProblem, write_binary_instance
+
+
+def generate_sparse_instance(num_cities: int, extra_edges_per_city: float = 2.0,
+                             max_weight: int = 60, seed: int = None
+                             ) -> Tuple[List[str], List[Tuple[str, str, int]], str]:
+    """
+    Gera um grafo esparso aleatório com um ciclo hamiltoniano garantido.
+
+    O ciclo é plantado sobre uma permutação aleatória das cidades; depois são
+    sorteadas arestas extras até atingir aproximadamente `extra_edges_per_city`
+    arestas adicionais por cidade. Retorna (cidades, arestas, cidade_inicial).
+    """
+    if num_cities < 3:
+        raise ValueError("São necessárias pelo menos 3 cidades")
+
+    rng = random.Random(seed)
+    cities = [str(i) for i in range(1, num_cities + 1)]
+    weights: Dict[Tuple[str, str], int] = {}
+
+    def add_edge(a: str, b: str):
+        key = (a, b) if int(a) < int(b) else (b, a)
+        if a != b and key not in weights:
+            weights[key] = rng.randint(1, max_weight)
+
+    # Ciclo hamiltoniano plantado
+    order = cities[:]
+    rng.shuffle(order)
+    for i in range(num_cities):
+        add_edge(order[i], order[(i + 1) % num_cities])
+
+    # Arestas extras aleatórias
+    max_edges = num_cities * (num_cities - 1) // 2
+    target = min(max_edges, num_cities + int(extra_edges_per_city * num_cities / 2))
+    while len(weights) < target:
+        add_edge(rng.choice(cities), rng.choice(cities))
+
+    edges = [(a, b, w) for (a, b), w in weights.items()]
+    return cities, edges, cities[0]
+
+
+def _boustrophedon_order(points):
+    """Ordena os pontos em faixas verticais alternando o sentido (ciclo curto e barato)"""
+    import numpy as np
+
+    n = len(points)
+    strips = max(1, int(np.sqrt(n / 2)))
+    strip = np.minimum((points[:, 0] * strips).astype(int), strips - 1)
+    # Em faixas ímpares o y é percorrido de cima para baixo
+    y_key = np.where(strip % 2 == 0, points[:, 1], -points[:, 1])
+    return np.lexsort((y_key, strip))
+
+
+def generate_geometric_instance(num_cities: int, degree: int = 6, scale: float = 1000.0,
+                                seed: int = None):
+    """
+    Gera um grafo geométrico aleatório esparso com ciclo hamiltoniano garantido.
+
+    As cidades são pontos uniformes em [0, scale]²; cada cidade é ligada aos seus
+    `degree` vizinhos mais próximos (grau médio entre degree e 2*degree, pois a
+    relação é simetrizada) e um ciclo hamiltoniano é plantado percorrendo os
+    pontos em faixas alternadas. Os pesos são as distâncias euclidianas
+    arredondadas (mínimo 1). Complexidade O(N log N), viável até ~100k cidades.
+
+    Retorna (cidades, arestas, cidade_inicial, coordenadas).
+    """
+    import numpy as np
+    from scipy.spatial import cKDTree
+
+    if num_cities < 3:
+        raise ValueError("São necessárias pelo menos 3 cidades")
+
+    rng = np.random.default_rng(seed)
+    unit_points = rng.random((num_cities, 2))
+    points = unit_points * scale
+
+    # k vizinhos mais próximos (a primeira coluna é o próprio ponto)
+    k = min(degree, num_cities - 1)
+    _, neighbors = cKDTree(points).query(points, k=k + 1)
+    sources = np.repeat(np.arange(num_cities), k)
+    knn_pairs = np.column_stack((sources, neighbors[:, 1:].ravel()))
+
+    # Ciclo hamiltoniano plantado
+    order = _boustrophedon_order(unit_points)
+    cycle_pairs = np.column_stack((order, np.roll(order, -1)))
+
+    pairs = np.sort(np.vstack((knn_pairs, cycle_pairs)), axis=1)
+    pairs = np.unique(pairs[pairs[:, 0] != pairs[:, 1]], axis=0)
+    lengths = np.linalg.norm(points[pairs[:, 0]] - points[pairs[:, 1]], axis=1)
+    weights = np.maximum(np.rint(lengths), 1).astype(int)
+
+    cities = [str(i) for i in range(1, num_cities + 1)]
+    edges = [(cities[a], cities[b], w) for (a, b), w in zip(pairs.tolist(), weights.tolist())]
+    return cities, edges, cities[0], points
+
+
+def write_instance(filename: str, cities: List[str], edges: List[Tuple[str, str, float]],
+                   start_city: str):
+    """Grava a instância no formato de distancias.txt (cidades + cidade inicial, depois 'a dist b')"""
+    with open(filename, 'w') as file:
+        file.write(' '.join(cities + [start_city]) + '\n')
+        file.writelines(f"{city1} {distance:.10g} {city2}\n" for city1, city2, distance in edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de instâncias TSP esparsas para testes de escala")
+    parser.add_argument('--cities', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="número de cidades (uma instância por valor)")
+    parser.add_argument('--degree', type=int, default=6, help="vizinhos mais próximos por cidade")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output-dir', default='instances')
+    parser.add_argument('--binary', action='store_true', help="grava também o formato binário (.npz)")
+    parser.add_argument('--measure-load', action='store_true',
+                        help="mede o tempo de carregamento das instâncias geradas com TSPProblem")
+    args = parser.parse_args()
+
+    import os
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    for num_cities in args.cities:
+        start_time = time.perf_counter()
+        cities, edges, start_city, coordinates = generate_geometric_instance(
+            num_cities, args.degree, seed=args.seed)
+        gen_time = time.perf_counter() - start_time
+
+        base = os.path.join(args.output_dir, f"geometric_n{num_cities}_k{args.degree}")
+        paths = [base + '.txt']
+        write_instance(paths[0], cities, edges, start_city)
+        if args.binary:
+            paths.append(base + '.npz')
+            write_binary_instance(paths[1], cities, edges, start_city, coordinates)
+
+        print(f"{num_cities} cidades, {len(edges)} arestas (grau médio {2 * len(edges) / num_cities:.1f}), "
+              f"gerado em {gen_time:.2f}s")
+        for path in paths:
+            if args.measure_load:
+                start_time = time.perf_counter()
+                TSPProblem(path)
+                print(f"  {path}: carregado em {time.perf_counter() - start_time:.2f}s")
+            else:
+                print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
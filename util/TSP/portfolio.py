@@ -0,0 +1,102 @@
+import math
+import multiprocessing
+import time
+from typing import List, Optional, Tuple
+
+
+class SharedIncumbent:
+    """
+    Melhor rota conhecida por um portfólio de solvers em processos separados:
+    um array de inteiros (rota na visão de inteiros do TSPProblem), o custo,
+    o índice do solver que a publicou e um contador de sequência, tudo em
+    memória compartilhada.
+
+    A escrita é protegida por uma trava e incrementa o contador antes e
+    depois (ímpar = escrita em andamento); a leitura não trava, apenas repete
+    a cópia se o contador mudou no meio dela. Quem só quer saber se há
+    novidade compara `sequence` com o último valor visto.
+    """
+
+    def __init__(self, num_cities: int, context=None):
+        context = context or multiprocessing.get_context()
+        self._tour = context.RawArray('i', num_cities)
+        self._cost = context.RawValue('d', math.inf)
+        self._source = context.RawValue('i', -1)
+        self._sequence = context.RawValue('q', 0)
+        self._lock = context.Lock()
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence.value
+
+    @property
+    def cost(self) -> float:
+        return self._cost.value
+
+    def publish(self, tour: List[int], cost: float, source: int = -1) -> bool:
+        """Grava a rota se ela for melhor que a atual; retorna True se gravou"""
+        if cost >= self._cost.value:
+            return False  # Caso comum resolvido sem pegar a trava
+        with self._lock:
+            if cost >= self._cost.value:
+                return False
+            self._sequence.value += 1
+            self._tour[:] = tour
+            self._cost.value = cost
+            self._source.value = source
+            self._sequence.value += 1
+        return True
+
+    def read(self) -> Optional[Tuple[int, List[int], float, int]]:
+        """(sequência, rota, custo, solver de origem), ou None se nada foi publicado"""
+        while True:
+            sequence = self._sequence.value
+            if sequence == 0:
+                return None
+            if sequence & 1:
+                continue  # Escrita em andamento
+            tour, cost, source = self._tour[:], self._cost.value, self._source.value
+            if self._sequence.value == sequence:
+                return sequence, tour, cost, source
+
+
+def run_cooperative(solver, incumbent: SharedIncumbent, source: int = -1,
+                    exchange_interval: float = 0.05, resume: Optional[str] = None) -> List[str]:
+    """
+    Executa solver.solve_iter() trocando rotas com o portfólio: a cada
+    `exchange_interval` segundos (verificado entre iterações) publica a
+    melhor rota do solver, se melhorou, e entrega a do portfólio ao solver
+    (adopt_incumbent) se ela for melhor que a dele. Solvers sem
+    adopt_incumbent só publicam. Retorna a melhor rota do solver ao final
+    (solver.result()), que inclui uma rota adotada depois do último snapshot.
+    """
+    problem = solver.problem
+    adopt = getattr(solver, 'adopt_incumbent', None)
+    published = math.inf
+    seen = 0
+    last_exchange = time.perf_counter()
+
+    def publish(solution, cost):
+        nonlocal published
+        incumbent.publish(problem.to_int_tour(solution), cost, source)
+        published = cost
+
+    for snapshot in (solver.solve_iter(resume=resume) if resume else solver.solve_iter()):
+        best_cost = snapshot['best_cost']
+        now = time.perf_counter()
+        if now - last_exchange < exchange_interval:
+            continue
+        last_exchange = now
+        if best_cost < published:
+            # A rota só é lida (e convertida) para publicar, antes de avançar o iterador (ver Snapshot)
+            publish(snapshot['best_solution'], best_cost)
+        if adopt is not None and incumbent.sequence != seen:
+            seen, tour, cost, _ = incumbent.read()
+            if cost < best_cost:
+                adopt(problem.to_city_tour(tour), cost)
+                solver.profiler.count('incumbent_adoptions')
+    best_solution = solver.result()
+    best_cost = problem.path_distance(best_solution)
+    if best_cost < published:
+        publish(best_solution, best_cost)
+    return best_solution
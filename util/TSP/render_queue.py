@@ -0,0 +1,64 @@
+import multiprocessing
+import sys
+
+
+def _render_loop(problem, jobs):
+    """Laço do processo de renderização: consome jobs até receber None"""
+    import matplotlib
+    matplotlib.use('Agg')  # Sem janela: o processo só salva arquivos
+    from util.TSP import visualization
+
+    renderers = {
+        'solution': lambda *args, **kwargs: visualization.plot_solution(problem, *args, **kwargs),
+        'convergence': visualization.plot_convergence,
+        'comparison': visualization.plot_comparison,
+    }
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        kind, args, kwargs = job
+        try:
+            renderers[kind](*args, **kwargs)
+        except Exception as e:
+            print(f"Erro ao renderizar gráfico '{kind}': {e}", file=sys.stderr)
+
+
+class PlotWorker:
+    """
+    Renderiza gráficos em um processo separado, alimentado por uma fila com os
+    dados das soluções, para que o solver não espere pelo layout/savefig.
+
+    matplotlib e networkx só são importados dentro do processo de renderização.
+    """
+
+    def __init__(self, problem):
+        self._jobs = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_render_loop, args=(problem, self._jobs),
+                                                daemon=True)
+        self._process.start()
+
+    def plot_solution(self, solution, title, save=True):
+        self._jobs.put(('solution', (list(solution), title, save), {}))
+
+    def plot_convergence(self, data, title, save=True):
+        self._jobs.put(('convergence', (data, title), {'save': save}))
+
+    def plot_comparison(self, results, save=True):
+        # Apenas os campos usados no gráfico atravessam a fila
+        summary = {name: {'distance': res['distance'], 'time': res['time']}
+                   for name, res in results.items()}
+        self._jobs.put(('comparison', (summary,), {'save': save}))
+
+    def close(self, timeout=None):
+        """Espera a fila esvaziar e encerra o processo de renderização"""
+        self._jobs.put(None)
+        self._process.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional
+
+from util.TSP.tsp_problem import TSPProblem
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    fingerprint TEXT PRIMARY KEY,
+    cities_key TEXT NOT NULL,
+    route BLOB NOT NULL,
+    cost REAL NOT NULL,
+    solver TEXT,
+    instance TEXT,
+    updated REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_cities ON solutions (cities_key, last_used);
+"""
+
+
+class CachedSolution(NamedTuple):
+    route: List[str]
+    cost: float  # Custo na instância em que foi gravada
+    solver: Optional[str]  # Proveniência: solver que encontrou a rota
+    instance: Optional[str]  # e o arquivo da instância
+    updated: float  # Momento da gravação (time.time())
+    exact: bool  # False: veio de outra instância com as mesmas cidades
+
+
+def _cities_key(problem: TSPProblem) -> str:
+    """Hash só das cidades e da cidade inicial: igual em instâncias que diferem apenas nas arestas"""
+    digest = hashlib.sha256()
+    digest.update(' '.join(sorted(problem.cities)).encode())
+    digest.update(b'|' + problem.start_city.encode())
+    return digest.hexdigest()
+
+
+class SolutionCache:
+    """
+    Melhores rotas conhecidas, guardadas em SQLite e indexadas pelo
+    fingerprint do TSPProblem (cidades, cidade inicial e arestas), com a
+    proveniência (solver, arquivo da instância, data).
+
+    get() procura a instância exata e, se não houver, a rota usada mais
+    recentemente numa instância com as mesmas cidades (pesos ou arestas
+    diferentes), que serve de partida a quente depois de corrigida (ver
+    construction.warm_start). put() só substitui uma rota por outra melhor.
+    Acima de `max_entries` rotas, descarta as usadas há mais tempo (LRU).
+    """
+
+    def __init__(self, path: str, max_entries: int = 100):
+        if max_entries < 1:
+            raise ValueError("O cache precisa comportar pelo menos uma rota")
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Conexão de uma operação: transação confirmada ao sair sem erro, conexão sempre fechada"""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, problem: TSPProblem) -> Optional[CachedSolution]:
+        """Melhor rota da instância (ou de uma com as mesmas cidades); marca a entrada como usada"""
+        fingerprint = problem.fingerprint()
+        columns = "fingerprint, route, cost, solver, instance, updated"
+        with self._connect() as connection:
+            row = connection.execute(f"SELECT {columns} FROM solutions WHERE fingerprint = ?",
+                                     (fingerprint,)).fetchone()
+            if row is None:
+                row = connection.execute(
+                    f"SELECT {columns} FROM solutions WHERE cities_key = ? ORDER BY last_used DESC LIMIT 1",
+                    (_cities_key(problem),)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE solutions SET last_used = ? WHERE fingerprint = ?",
+                               (time.time(), row[0]))
+        route = json.loads(zlib.decompress(row[1]))
+        return CachedSolution(route, row[2], row[3], row[4], row[5], row[0] == fingerprint)
+
+    def put(self, problem: TSPProblem, route: List[str], cost: float,
+            solver: Optional[str] = None, instance: Optional[str] = None) -> bool:
+        """Grava a rota se a instância não tiver uma melhor; retorna True se gravou"""
+        if not problem.is_valid_route(route):
+            raise ValueError("Só rotas válidas podem ser gravadas no cache")
+        fingerprint = problem.fingerprint()
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute("SELECT cost FROM solutions WHERE fingerprint = ?",
+                                     (fingerprint,)).fetchone()
+            if row is not None and row[0] <= cost:
+                return False
+            connection.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (fingerprint, _cities_key(problem), zlib.compress(json.dumps(route).encode()),
+                 cost, solver, instance, now, now))
+            connection.execute(
+                "DELETE FROM solutions WHERE fingerprint NOT IN "
+                "(SELECT fingerprint FROM solutions ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,))
+        return True
+
+    def __len__(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
@@ -1,4 +1,27 @@
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple, Optional
+
+
+def write_binary_instance(filename: str, cities: List[str], edges: List[Tuple[str, str, float]],
+                          start_city: str, coordinates=None):
+    """
+    Grava a instância no formato binário (.npz): nomes das cidades, arestas como
+    pares de índices int32, pesos float64, índice da cidade inicial e, se houver,
+    coordenadas (N x 2).
+    """
+    import numpy as np
+
+    index = {city: i for i, city in enumerate(cities)}
+    edge_array = np.array([(index[a], index[b]) for a, b, _ in edges], dtype=np.int32).reshape(-1, 2)
+    weights = np.array([w for _, _, w in edges], dtype=np.float64)
+    arrays = {
+        'cities': np.array(cities),
+        'edges': edge_array,
+        'weights': weights,
+        'start': np.int32(index[start_city]),
+    }
+    if coordinates is not None:
+        arrays['coordinates'] = np.asarray(coordinates, dtype=np.float64)
+    np.savez_compressed(filename, **arrays)
 
 
 class TSPProblem:
@@ -7,11 +30,20 @@ class TSPProblem:
         self.distances: Dict[str, Dict[str, float]] = {}
         self.start_city: str = None
         self.city_index: Dict[str, int] = {}
+        # Visão indexada por inteiros (posição em self.cities), para operadores de vizinhança
+        self.int_weights: List[Dict[int, float]] = []  # int_weights[i][j] = distância direta i -> j
+        self.neighbor_lists: List[List[int]] = []  # Vizinhos de cada cidade, do mais próximo ao mais distante
         self.adjacency_list: Dict[str, Set[str]] = {}  # Lista de adjacência para conexões diretas
+        self.coordinates = None  # Coordenadas (N x 2) quando o arquivo as fornece
+        self._fingerprint: Optional[str] = None
 
-        self._load_from_file(filename)
+        if filename.endswith('.npz'):
+            self._load_from_binary(filename)
+        else:
+            self._load_from_file(filename)
         self._build_adjacency_list()
         self._validate_graph()
+        self._build_int_view()
 
     def _load_from_file(self, filename: str):
         """Carrega o grafo a partir do arquivo"""
@@ -39,6 +71,52 @@ class TSPProblem:
                 self._add_connection(city1, city2, distance)
                 self._add_connection(city2, city1, distance)
 
+    def _load_from_binary(self, filename: str):
+        """Carrega o grafo do formato binário (.npz) gerado por write_binary_instance"""
+        import numpy as np
+
+        with np.load(filename) as data:
+            self.cities = [str(city) for city in data['cities']]
+            self.start_city = self.cities[int(data['start'])]
+            if 'coordinates' in data:
+                self.coordinates = data['coordinates']
+            edges = data['edges'].tolist()
+            weights = data['weights'].tolist()
+
+        cities = self.cities
+        for (i, j), distance in zip(edges, weights):
+            self._add_connection(cities[i], cities[j], distance)
+            self._add_connection(cities[j], cities[i], distance)
+
+    def edges(self) -> List[Tuple[str, str, float]]:
+        """Lista de arestas não direcionadas (cada par aparece uma vez)"""
+        seen = set()
+        result = []
+        for city1 in self.distances:
+            for city2, distance in self.distances[city1].items():
+                if (city2, city1) not in seen:
+                    seen.add((city1, city2))
+                    result.append((city1, city2, distance))
+        return result
+
+    def fingerprint(self) -> str:
+        """Hash (SHA-256) do conteúdo da instância: cidades, cidade inicial e arestas"""
+        if self._fingerprint is None:
+            import hashlib
+
+            digest = hashlib.sha256()
+            digest.update(' '.join(self.cities).encode())
+            digest.update(b'|' + self.start_city.encode() + b'|')
+            for city1, city2, distance in sorted(
+                    (min(a, b), max(a, b), d) for a, b, d in self.edges()):
+                digest.update(f"{city1} {distance!r} {city2};".encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def save_binary(self, filename: str):
+        """Salva a instância no formato binário (.npz), útil como cache de carregamento"""
+        write_binary_instance(filename, self.cities, self.edges(), self.start_city, self.coordinates)
+
     def _add_connection(self, city1: str, city2: str, distance: float):
         """Adiciona uma conexão direta ao grafo"""
         if city1 not in self.distances:
@@ -52,6 +130,77 @@ class TSPProblem:
             for city2 in self.distances[city1]:
                 self.adjacency_list[city1].add(city2)
 
+    def _build_int_view(self):
+        """Constrói city_index, int_weights e neighbor_lists a partir de self.distances"""
+        self.city_index = {city: i for i, city in enumerate(self.cities)}
+        index = self.city_index
+        self.int_weights = [{index[city2]: distance for city2, distance in self.distances.get(city1, {}).items()}
+                            for city1 in self.cities]
+        self.neighbor_lists = [sorted(weights, key=weights.__getitem__) for weights in self.int_weights]
+
+    def _check_pair(self, city1: str, city2: str) -> Tuple[int, int]:
+        for city in (city1, city2):
+            if city not in self.city_index:
+                raise ValueError(f"Cidade {city} não encontrada na lista de cidades")
+        if city1 == city2:
+            raise ValueError(f"Aresta de {city1} para ela mesma")
+        return self.city_index[city1], self.city_index[city2]
+
+    def _sort_neighbors(self, i: int):
+        weights = self.int_weights[i]
+        self.neighbor_lists[i] = sorted(weights, key=weights.__getitem__)
+
+    def _changed(self, i: int, j: int):
+        """Invalida só o que depende das arestas de i e j: as duas listas de vizinhos e o fingerprint"""
+        self._sort_neighbors(i)
+        self._sort_neighbors(j)
+        self._fingerprint = None
+
+    def set_weight(self, city1: str, city2: str, distance: float):
+        """Altera o peso de uma aresta existente (nos dois sentidos)"""
+        i, j = self._check_pair(city1, city2)
+        if j not in self.int_weights[i]:
+            raise ValueError(f"Não existe aresta entre {city1} e {city2} (use add_edge)")
+        self.distances[city1][city2] = self.distances[city2][city1] = distance
+        self.int_weights[i][j] = self.int_weights[j][i] = distance
+        self._changed(i, j)
+
+    def add_edge(self, city1: str, city2: str, distance: float):
+        """Cria uma aresta nova entre duas cidades (nos dois sentidos)"""
+        i, j = self._check_pair(city1, city2)
+        if j in self.int_weights[i]:
+            raise ValueError(f"Já existe aresta entre {city1} e {city2} (use set_weight)")
+        self._add_connection(city1, city2, distance)
+        self._add_connection(city2, city1, distance)
+        self.adjacency_list[city1].add(city2)
+        self.adjacency_list[city2].add(city1)
+        self.int_weights[i][j] = self.int_weights[j][i] = distance
+        self._changed(i, j)
+
+    def remove_edge(self, city1: str, city2: str):
+        """Remove a aresta entre duas cidades; nenhuma cidade pode ficar sem conexões"""
+        i, j = self._check_pair(city1, city2)
+        if j not in self.int_weights[i]:
+            raise ValueError(f"Não existe aresta entre {city1} e {city2}")
+        for city in (city1, city2):
+            if len(self.int_weights[self.city_index[city]]) == 1:
+                raise ValueError(f"Cidade {city} ficaria sem conexões")
+        del self.distances[city1][city2], self.distances[city2][city1]
+        self.adjacency_list[city1].discard(city2)
+        self.adjacency_list[city2].discard(city1)
+        del self.int_weights[i][j], self.int_weights[j][i]
+        self._changed(i, j)
+
+    def to_int_tour(self, route: List[str]) -> List[int]:
+        """Converte uma rota de nomes de cidades para índices"""
+        index = self.city_index
+        return [index[city] for city in route]
+
+    def to_city_tour(self, tour: List[int]) -> List[str]:
+        """Converte uma rota de índices para nomes de cidades"""
+        cities = self.cities
+        return [cities[i] for i in tour]
+
     def _validate_graph(self):
         """Valida se o grafo está adequado para TSP"""
         if not self.cities:
@@ -1,5 +1,8 @@
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+from matplotlib.collections import LineCollection
+from util.convergence import COLUMNS
 from typing import List, Dict
 import os
 from datetime import datetime
@@ -12,75 +15,222 @@ def create_output_dir():
         os.makedirs(output_dir)
     return output_dir
 
-def plot_solution(problem, solution: List[str], title: str, save: bool = False):
-    """Visualiza a solução com setas direcionais e ordem das cidades"""
-    G = nx.DiGraph()  # Grafo direcionado
 
-    # Adiciona nós e arestas do problema
+LAYOUT_CACHE_DIR = ".layout_cache"
+
+# Acima deste número de cidades o desenho passa ao modo de grafo grande:
+# arestas numa única LineCollection rasterizada, sem setas, rótulos nem ordem
+LARGE_GRAPH_THRESHOLD = 200
+
+# Layouts e fundos já desenhados, por fingerprint do problema
+_layouts: Dict[str, Dict[str, np.ndarray]] = {}
+_backgrounds: Dict[tuple, dict] = {}
+
+
+def _build_graph(problem) -> nx.DiGraph:
+    G = nx.DiGraph()  # Grafo direcionado
     G.add_nodes_from(problem.cities)
     for city1 in problem.distances:
         for city2 in problem.distances[city1]:
             G.add_edge(city1, city2, weight=problem.distances[city1][city2])
+    return G
 
-    # Cria sequência da solução
-    solution_edges = [(solution[i], solution[i + 1]) for i in range(len(solution) - 1)]
-    solution_edges.append((solution[-1], solution[0]))  # Completa o ciclo
 
-    # Layout
-    pos = nx.spring_layout(G, seed=42)  # Layout consistente
+def get_layout(problem, G: nx.DiGraph = None, use_coordinates: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Layout dos nós (spring_layout com seed fixa), calculado uma vez por problema
+    e guardado em memória e em disco (LAYOUT_CACHE_DIR/<fingerprint>.npz).
+    Se o arquivo do problema trouxer coordenadas, elas são usadas diretamente.
+    """
+    if use_coordinates and problem.coordinates is not None:
+        return dict(zip(problem.cities, problem.coordinates))
+
+    key = problem.fingerprint()
+    if key in _layouts:
+        return _layouts[key]
+
+    path = os.path.join(LAYOUT_CACHE_DIR, f"{key}.npz")
+    if os.path.exists(path):
+        with np.load(path) as data:
+            pos = dict(zip(data['cities'].tolist(), data['positions']))
+    else:
+        pos = nx.spring_layout(G if G is not None else _build_graph(problem), seed=42)  # Layout consistente
+        os.makedirs(LAYOUT_CACHE_DIR, exist_ok=True)
+        cities = list(pos)
+        np.savez(path, cities=np.array(cities), positions=np.array([pos[c] for c in cities]))
+
+    _layouts[key] = pos
+    return pos
 
-    plt.figure(figsize=(14, 8))
+
+def _draw_background(problem, figsize=(14, 8), use_coordinates: bool = True) -> dict:
+    """Desenha a parte estática (todas as arestas, nós e rótulos) numa figura nova"""
+    G = _build_graph(problem)
+    pos = get_layout(problem, G, use_coordinates)
+
+    fig = plt.figure(figsize=figsize)
+    ax = fig.gca()
 
     # Desenha todas as arestas do problema (cinza claro)
-    nx.draw_networkx_edges(G, pos, edge_color='lightgray', alpha=0.3, arrows=True,
+    nx.draw_networkx_edges(G, pos, ax=ax, edge_color='lightgray', alpha=0.3, arrows=True,
                            arrowstyle='->', arrowsize=15)
 
-    # Destaca arestas da solução (vermelho)
-    nx.draw_networkx_edges(G, pos, edgelist=solution_edges, edge_color='red',
-                           width=2, arrows=True, arrowstyle='->', arrowsize=20)
-
     # Desenha nós
-    nx.draw_networkx_nodes(G, pos, node_size=700, node_color='lightblue')
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=700, node_color='lightblue')
 
     # Rótulos dos nós
-    nx.draw_networkx_labels(G, pos, font_size=10, font_weight='bold')
+    nx.draw_networkx_labels(G, pos, ax=ax, font_size=10, font_weight='bold')
+
+    ax.axis('off')
+    return {'fig': fig, 'ax': ax, 'graph': G, 'pos': pos}
+
+
+def _draw_large_background(problem, figsize=(14, 8), use_coordinates: bool = True) -> dict:
+    """
+    Fundo para grafos grandes: todas as arestas numa única LineCollection e os
+    nós num único scatter, ambos rasterizados (o PNG/PDF não guarda um objeto
+    vetorial por aresta)
+    """
+    pos = get_layout(problem, use_coordinates=use_coordinates)
+    index = {city: i for i, city in enumerate(problem.cities)}
+    points = np.array([pos[city] for city in problem.cities])
+
+    fig = plt.figure(figsize=figsize)
+    ax = fig.gca()
+
+    pairs = np.array([(index[city1], index[city2]) for city1, city2, _ in problem.edges()])
+    ax.add_collection(LineCollection(points[pairs], colors='lightgray', linewidths=0.3,
+                                     alpha=0.5, rasterized=True))
+    ax.scatter(points[:, 0], points[:, 1], s=2, c='steelblue', linewidths=0, rasterized=True)
+
+    start = points[index[problem.start_city]]
+    ax.scatter([start[0]], [start[1]], s=40, c='green', marker='*', zorder=3)
+
+    ax.autoscale_view()
+    ax.set_aspect('equal')
+    ax.axis('off')
+    return {'fig': fig, 'ax': ax, 'index': index, 'points': points}
+
+
+def _draw_large_overlay(problem, background: dict, solution: List[str], title: str) -> list:
+    """Rota como uma única LineCollection; sem setas, rótulos de arestas nem ordem das cidades"""
+    index, points, ax = background['index'], background['points'], background['ax']
+
+    route = np.array([index[city] for city in solution])
+    pairs = np.column_stack((route, np.roll(route, -1)))
+    connected = [problem.are_connected(solution[i], solution[(i + 1) % len(solution)])
+                 for i in range(len(solution))]
+    lines = LineCollection(points[pairs[connected]], colors='red', linewidths=0.6, rasterized=True)
+    ax.add_collection(lines)
+
+    ax.set_title(f"{title}\nDistância Total: {problem.path_distance(solution):.2f}", fontsize=14)
+    return [lines]
+
+
+def _draw_overlay(problem, background: dict, solution: List[str], title: str) -> list:
+    """Desenha a solução sobre o fundo e retorna os artistas criados (para removê-los depois)"""
+    G, pos, ax, fig = background['graph'], background['pos'], background['ax'], background['fig']
+
+    # Cria sequência da solução
+    solution_edges = [(solution[i], solution[i + 1]) for i in range(len(solution) - 1)]
+    solution_edges.append((solution[-1], solution[0]))  # Completa o ciclo
+    drawable = [edge for edge in solution_edges if G.has_edge(*edge)]
+
+    artists = []
+
+    # Destaca arestas da solução (vermelho)
+    edges = nx.draw_networkx_edges(G, pos, ax=ax, edgelist=drawable, edge_color='red',
+                                   width=2, arrows=True, arrowstyle='->', arrowsize=20,
+                                   node_size=700)
+    artists.extend(edges if isinstance(edges, list) else [edges])
 
     # Rótulos das arestas da solução com distância e ordem
     edge_labels = {}
     for i, (city1, city2) in enumerate(solution_edges):
-        distance = problem.get_direct_distance(city1, city2)
-        edge_labels[(city1, city2)] = f"{distance:.1f} (#{i + 1})"
+        if G.has_edge(city1, city2):
+            distance = problem.get_direct_distance(city1, city2)
+            edge_labels[(city1, city2)] = f"{distance:.1f} (#{i + 1})"
 
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels,
-                                 font_color='red', font_size=9)
+    labels = nx.draw_networkx_edge_labels(G, pos, ax=ax, edge_labels=edge_labels,
+                                          font_color='red', font_size=9)
+    artists.extend(labels.values())
 
     # Legenda
-    plt.title(f"{title}\nDistância Total: {problem.path_distance(solution):.2f}", fontsize=14)
+    ax.set_title(f"{title}\nDistância Total: {problem.path_distance(solution):.2f}", fontsize=14)
 
     # Ordem das cidades em baixo
     city_order = " → ".join(f"{city}({i + 1})" for i, city in enumerate(solution))
-    plt.figtext(0.5, 0.01, f"Ordem: {city_order} → {solution[0]}(1)",
-                ha="center", fontsize=10, bbox={"facecolor": "white", "alpha": 0.8, "pad": 5})
+    artists.append(fig.text(0.5, 0.01, f"Ordem: {city_order} → {solution[0]}(1)",
+                            ha="center", fontsize=10, bbox={"facecolor": "white", "alpha": 0.8, "pad": 5}))
+    return artists
 
-    plt.axis('off')
 
-    if save:
+def plot_solution(problem, solution: List[str], title: str, save: bool = False,
+                  large: bool = None, use_coordinates: bool = True):
+    """
+    Visualiza a solução com setas direcionais e ordem das cidades.
+
+    O layout é calculado uma vez por problema e, ao salvar, o fundo estático é
+    desenhado uma única vez e reaproveitado: cada chamada só desenha a rota por
+    cima, salva e remove a sobreposição.
+
+    Com `large` (padrão: mais de LARGE_GRAPH_THRESHOLD cidades) usa o modo de
+    grafo grande, sem setas nem rótulos. `use_coordinates` usa as coordenadas do
+    arquivo do problema, quando existem, em vez do layout por forças.
+    """
+    if large is None:
+        large = len(problem.cities) > LARGE_GRAPH_THRESHOLD
+    draw_background, draw_overlay = ((_draw_large_background, _draw_large_overlay) if large
+                                     else (_draw_background, _draw_overlay))
+
+    if not save:
+        background = draw_background(problem, use_coordinates=use_coordinates)
+        draw_overlay(problem, background, solution, title)
+        plt.show()
+        return
+
+    key = (problem.fingerprint(), large, use_coordinates)
+    if key not in _backgrounds:
+        _backgrounds[key] = draw_background(problem, use_coordinates=use_coordinates)
+    background = _backgrounds[key]
+
+    artists = draw_overlay(problem, background, solution, title)
+    try:
         os.makedirs("plots", exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"plots/{title.replace(' ', '_')}_{timestamp}.png"
-        plt.savefig(filename, bbox_inches='tight', dpi=300)
-        plt.close()
-    else:
-        plt.show()
+        background['fig'].savefig(filename, bbox_inches='tight', dpi=300)
+    finally:
+        for artist in artists:
+            artist.remove()
+
+
+def release_figures():
+    """Fecha as figuras de fundo mantidas em cache"""
+    for background in _backgrounds.values():
+        plt.close(background['fig'])
+    _backgrounds.clear()
+
 
+def plot_convergence(data, title, save=False, x='iteration'):
+    """
+    Curvas de convergência. `data` mapeia o nome do algoritmo para a série
+    (n x 4) de um ConvergenceRecorder; `x` escolhe a coluna do eixo horizontal
+    ('iteration', 'evaluations' ou 'time').
+    """
+    x_labels = {'iteration': 'Iteração', 'evaluations': 'Avaliações', 'time': 'Tempo (s)'}
+    if x not in x_labels:
+        raise ValueError(f"Eixo x inválido: {x}")
+    x_index = COLUMNS.index(x)
 
-def plot_convergence(data, title, save=False):
     plt.figure(figsize=(10, 6))
     for algo, values in data.items():
-        plt.plot(values, label=algo)
+        values = np.asarray(values, dtype=float)
+        best = np.where(np.isfinite(values[:, 3]), values[:, 3], np.nan)
+        plt.plot(values[:, x_index], best, label=algo)
 
     plt.title(title)
-    plt.xlabel('Iteração')
+    plt.xlabel(x_labels[x])
     plt.ylabel('Distância')
     plt.legend()
     plt.grid(True)
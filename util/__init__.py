@@ -1 +1,2 @@
-from util.TSP.tsp_problem import TSPProblem
\ No newline at end of file
+from util.TSP.tsp_problem import TSPProblem
+from util.run_tracker import RunTracker
\ No newline at end of file
@@ -0,0 +1,86 @@
+import os
+import pickle
+import random
+import zlib
+from typing import Callable, Optional
+
+CHECKPOINT_VERSION = 1
+
+
+def rng_state() -> dict:
+    """Estado dos geradores globais usados pelos solvers (random e numpy)"""
+    state = {'random': random.getstate()}
+    try:
+        import numpy as np
+        state['numpy'] = np.random.get_state()
+    except ImportError:
+        pass
+    return state
+
+
+def restore_rng_state(state: dict):
+    random.setstate(state['random'])
+    if 'numpy' in state:
+        import numpy as np
+        np.random.set_state(state['numpy'])
+
+
+def save_checkpoint(path: str, solver: str, state: dict):
+    """
+    Grava o estado do solver (mais o estado dos RNGs) em formato binário
+    compacto: pickle comprimido com zlib. A escrita é atômica (arquivo
+    temporário + os.replace), então um processo morto no meio da gravação
+    não corrompe o checkpoint anterior.
+    """
+    payload = {'version': CHECKPOINT_VERSION, 'solver': solver, 'state': state, 'rng': rng_state()}
+    data = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str, solver: str) -> dict:
+    """Lê um checkpoint gravado por save_checkpoint e confere versão e solver"""
+    with open(path, 'rb') as file:
+        payload = pickle.loads(zlib.decompress(file.read()))
+    if payload.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Versão de checkpoint não suportada: {payload.get('version')}")
+    if payload['solver'] != solver:
+        raise ValueError(f"Checkpoint de '{payload['solver']}' não pode ser retomado por '{solver}'")
+    return payload
+
+
+class Checkpointer:
+    """
+    Gravação periódica de checkpoints de um solver: a cada `every` iterações
+    completas, se `path` foi configurado.
+
+    O solver fornece o próprio estado (população, feromônios, arquivo, melhor
+    solução, convergência, tracker) por meio de uma função; o estado dos RNGs
+    é incluído automaticamente. Retomar reproduz a execução sem interrupção
+    bit a bit.
+    """
+
+    def __init__(self, path: Optional[str] = None, every: int = 10):
+        if every < 1:
+            raise ValueError("O intervalo entre checkpoints deve ser de pelo menos 1 iteração")
+        self.path = path
+        self.every = every
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def maybe_save(self, solver: str, iteration: int, get_state: Callable[[], dict]) -> bool:
+        """Grava um checkpoint se `iteration` for múltiplo do intervalo"""
+        if self.path is None or iteration % self.every:
+            return False
+        save_checkpoint(self.path, solver, get_state())
+        return True
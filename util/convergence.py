@@ -0,0 +1,81 @@
+import numpy as np
+
+COLUMNS = ('iteration', 'evaluations', 'time', 'best')
+
+
+class ConvergenceRecorder:
+    """
+    Série de convergência com memória limitada: linhas (iteração, avaliações,
+    tempo, melhor valor) num array NumPy pré-alocado de `capacity` linhas.
+
+    Todas as chamadas a record() são aceitas, mas só uma a cada `stride` é
+    guardada. Quando o array enche, descarta-se uma linha sim outra não e o
+    stride dobra, de modo que a série continua cobrindo a execução inteira de
+    forma uniforme. O primeiro e o último ponto registrados estão sempre
+    presentes em `data`, que nunca passa de `capacity` linhas.
+    """
+
+    def __init__(self, capacity: int = 2048):
+        if capacity < 2 or capacity % 2:
+            raise ValueError("A capacidade deve ser um número par maior ou igual a 2")
+        self.capacity = capacity
+        self._rows = np.empty((capacity, len(COLUMNS)))
+        self._size = 0
+        self._stride = 1
+        self._seen = 0
+        self._last = None
+
+    def record(self, iteration: int, evaluations: int, elapsed: float, best: float):
+        row = (iteration, evaluations, elapsed, best)
+        self._last = row
+        index = self._seen
+        self._seen += 1
+        if index % self._stride:
+            return
+
+        if self._size == self.capacity:
+            # Mantém as linhas pares e passa a guardar metade dos pontos
+            half = self.capacity // 2
+            self._rows[:half] = self._rows[0:self.capacity:2]
+            self._size = half
+            self._stride *= 2
+            if index % self._stride:
+                return
+
+        self._rows[self._size] = row
+        self._size += 1
+
+    @property
+    def data(self) -> np.ndarray:
+        """Cópia (n x 4) da série, incluindo o último ponto registrado"""
+        rows = self._rows[:self._size]
+        if self._last is not None and (self._seen - 1) % self._stride:
+            # Com o array cheio, o último ponto ocupa o lugar da linha guardada mais recente
+            keep = self._size if self._size < self.capacity else self._size - 1
+            rows = np.vstack((rows[:keep], self._last))
+        return rows.copy()
+
+    def column(self, name: str) -> np.ndarray:
+        return self.data[:, COLUMNS.index(name)]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get_state(self) -> dict:
+        """Estado serializável para checkpoints"""
+        return {
+            'rows': self._rows[:self._size].copy(),
+            'stride': self._stride,
+            'seen': self._seen,
+            'last': self._last,
+            'capacity': self.capacity,
+        }
+
+    def set_state(self, state: dict):
+        self.capacity = state['capacity']
+        self._rows = np.empty((self.capacity, len(COLUMNS)))
+        self._size = len(state['rows'])
+        self._rows[:self._size] = state['rows']
+        self._stride = state['stride']
+        self._seen = state['seen']
+        self._last = state['last']
@@ -0,0 +1,129 @@
+import cProfile
+import io
+import pstats
+from collections import defaultdict
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional
+
+
+class _Phase:
+    """Context manager que acumula o tempo (ns) de uma fase no profiler"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.totals[self.name] += perf_counter_ns() - self.start
+        self.profiler.calls[self.name] += 1
+        return False
+
+
+class _NullPhase:
+    """Context manager vazio usado quando o profiling está desligado"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Profiler:
+    """
+    Temporizadores por fase (perf_counter_ns) e contadores leves para os solvers.
+
+    Uso:
+        with profiler.phase('evaluation'):
+            ...
+        profiler.count('invalid_children')
+    """
+    enabled = True
+
+    def __init__(self):
+        self.totals: Dict[str, int] = defaultdict(int)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def merge(self, other: 'Profiler'):
+        """Soma os tempos e contadores de outro profiler a este"""
+        for name, total in other.totals.items():
+            self.totals[name] += total
+            self.calls[name] += other.calls[name]
+        for name, value in other.counters.items():
+            self.counters[name] += value
+
+    def report(self) -> dict:
+        """Quebra por fase: chamadas, tempo total (ms), tempo médio (µs) e % do tempo medido"""
+        measured = sum(self.totals.values()) or 1
+        phases = []
+        for name, total in sorted(self.totals.items(), key=lambda item: -item[1]):
+            calls = self.calls[name]
+            phases.append({
+                'phase': name,
+                'calls': calls,
+                'total_ms': total / 1e6,
+                'mean_us': total / calls / 1e3 if calls else 0.0,
+                'percent': 100.0 * total / measured,
+            })
+        return {'phases': phases, 'counters': dict(self.counters)}
+
+    def format_report(self, title: str = "Profile") -> str:
+        return format_profile(self.report(), title)
+
+
+def format_profile(report: dict, title: str = "Profile") -> str:
+    """Formata como tabela o dicionário retornado por Profiler.report()"""
+    lines = [f"{title}:",
+             "  {:<22} {:>10} {:>12} {:>12} {:>8}".format("Phase", "Calls", "Total (ms)", "Mean (us)", "%")]
+    for row in report['phases']:
+        lines.append("  {:<22} {:>10} {:>12.2f} {:>12.2f} {:>7.1f}%".format(
+            row['phase'], row['calls'], row['total_ms'], row['mean_us'], row['percent']))
+    for name, value in sorted(report['counters'].items()):
+        lines.append(f"  {name}: {value}")
+    return '\n'.join(lines)
+
+
+class NullProfiler(Profiler):
+    """Profiler desligado: todas as operações são no-ops de custo quase zero"""
+    enabled = False
+    _null_phase = _NullPhase()
+
+    def phase(self, name: str) -> _NullPhase:
+        return self._null_phase
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def run_with_cprofile(func: Callable, *args, output: Optional[str] = None, top: int = 25, **kwargs):
+    """
+    Executa func sob cProfile, imprime as `top` funções por tempo acumulado e,
+    se `output` for dado, grava as estatísticas brutas (pstats) nesse arquivo.
+    """
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func, *args, **kwargs)
+    finally:
+        if output:
+            profile.dump_stats(output)
+            print(f"cProfile stats written to {output}")
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(top)
+        print(stream.getvalue())
@@ -0,0 +1,143 @@
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class Snapshot(dict):
+    """
+    Progresso de uma iteração. Se `best_solution` foi dada como função, ela
+    só é chamada no primeiro acesso a snapshot['best_solution'] (ou .get):
+    quem não lê a rota não paga a conversão. Nesse caso o valor é o do estado
+    do solver no momento do acesso, então deve ser lido antes de avançar o
+    iterador.
+    """
+
+    def __init__(self, fields: dict, best_solution: Optional[Callable[[], list]] = None):
+        super().__init__(fields)
+        self._best_solution = best_solution
+
+    def __missing__(self, key):
+        if key != 'best_solution' or self._best_solution is None:
+            raise KeyError(key)
+        self['best_solution'] = value = self._best_solution()
+        return value
+
+    def get(self, key, default=None):
+        if key in self or (key == 'best_solution' and self._best_solution is not None):
+            return self[key]
+        return default
+
+
+class RunTracker:
+    """
+    Contabiliza avaliações da função objetivo de um solver e registra amostras
+    (avaliações, tempo decorrido, melhor valor até o momento) a cada melhoria.
+
+    Também concentra os critérios de parada comuns a todos os solvers:
+    orçamento de avaliações, orçamento de tempo (segundos), valor alvo e gap
+    relativo (best - lower_bound) / lower_bound em relação a um limite inferior.
+    """
+
+    def __init__(self, max_evaluations: Optional[int] = None,
+                 time_limit: Optional[float] = None,
+                 target: Optional[float] = None,
+                 gap: Optional[float] = None,
+                 lower_bound: Optional[float] = None):
+        self.max_evaluations = max_evaluations
+        self.time_limit = time_limit
+        self.target = target
+        self.gap = gap
+        self.lower_bound = lower_bound
+        self.start()
+
+    def start(self):
+        """Zera os contadores e inicia o relógio"""
+        self.evaluations = 0
+        self.best = float('inf')
+        self.samples: List[Tuple[int, float, float]] = []
+        self.stop_reason: Optional[str] = None
+        self._start_time = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start_time
+
+    def count(self, n: int = 1):
+        """Registra n avaliações da função objetivo"""
+        self.evaluations += n
+
+    def update(self, value: float) -> bool:
+        """Atualiza o melhor valor; retorna True se houve melhoria"""
+        if value < self.best:
+            self.best = value
+            self.samples.append((self.evaluations, self.elapsed, value))
+            return True
+        return False
+
+    def should_stop(self, upcoming: int = 1) -> bool:
+        """
+        Verifica os critérios de parada configurados (chamado entre iterações).
+        `upcoming` é quantas avaliações a próxima iteração fará, para solvers
+        que sabem de antemão e não devem passar do orçamento
+        """
+        if self.target is not None and self.best <= self.target:
+            self.stop_reason = 'target'
+        elif (self.gap is not None and self.lower_bound is not None and self.lower_bound > 0 and
+              (self.best - self.lower_bound) / self.lower_bound <= self.gap):
+            self.stop_reason = 'gap'
+        elif self.max_evaluations is not None and self.evaluations + upcoming > self.max_evaluations:
+            self.stop_reason = 'evaluations'
+        elif self.time_limit is not None and self.elapsed >= self.time_limit:
+            self.stop_reason = 'time'
+        return self.stop_reason is not None
+
+    def finish(self):
+        """Fecha a execução registrando uma amostra final"""
+        self.samples.append((self.evaluations, self.elapsed, self.best))
+        if self.stop_reason is None:
+            self.stop_reason = 'iterations'
+
+    def snapshot(self, iteration: int, best_cost: float, best_solution) -> dict:
+        """
+        Progresso de uma iteração, como produzido por solve_iter() dos solvers;
+        `best_solution` pode ser uma função, chamada só se a rota for lida (ver Snapshot)
+        """
+        fields = {'iteration': iteration, 'best_cost': best_cost,
+                  'evaluations': self.evaluations, 'elapsed': self.elapsed}
+        if callable(best_solution):
+            return Snapshot(fields, best_solution)
+        return Snapshot(dict(fields, best_solution=best_solution))
+
+    def get_state(self) -> dict:
+        """Estado serializável para checkpoints (guarda o tempo decorrido, não o relógio)"""
+        return {
+            'evaluations': self.evaluations,
+            'best': self.best,
+            'samples': list(self.samples),
+            'stop_reason': self.stop_reason,
+            'elapsed': self.elapsed,
+        }
+
+    def set_state(self, state: dict):
+        """Restaura um estado de get_state(); o relógio continua do tempo já decorrido"""
+        self.evaluations = state['evaluations']
+        self.best = state['best']
+        self.samples = list(state['samples'])
+        self.stop_reason = state['stop_reason']
+        self._start_time = time.perf_counter() - state['elapsed']
+
+    def time_to_target(self, target: float) -> Optional[Tuple[int, float]]:
+        """Avaliações e tempo até atingir `target`, ou None se nunca atingiu"""
+        for evaluations, elapsed, best in self.samples:
+            if best <= target:
+                return evaluations, elapsed
+        return None
+
+    def summary(self) -> dict:
+        """Métricas de throughput e a série de amostras da execução"""
+        elapsed = self.samples[-1][1] if self.samples else self.elapsed
+        return {
+            'evaluations': self.evaluations,
+            'evals_per_second': self.evaluations / elapsed if elapsed > 0 else 0.0,
+            'samples': list(self.samples),
+            'stop_reason': self.stop_reason,
+        }
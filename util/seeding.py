@@ -0,0 +1,12 @@
+import random
+from typing import Optional
+
+
+def seed_everything(seed: Optional[int]):
+    """Semeia os geradores globais usados pelos solvers (random e numpy)"""
+    random.seed(seed)
+    try:
+        import numpy as np
+        np.random.seed(None if seed is None else seed % 2 ** 32)
+    except ImportError:
+        pass
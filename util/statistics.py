@@ -0,0 +1,39 @@
+from typing import Dict, Sequence
+
+import numpy as np
+from scipy import stats
+
+
+def describe(values: Sequence[float]) -> Dict[str, float]:
+    """
+    Estatísticas resumidas de uma amostra de execuções independentes:
+    média, desvio, mediana, quartis/IQR e intervalo de confiança de 95%
+    para a média (t de Student).
+    """
+    data = np.asarray([v for v in values if v is not None], dtype=float)
+    data = data[np.isfinite(data)]
+    n = len(data)
+    if n == 0:
+        return {'n': 0}
+
+    mean = float(np.mean(data))
+    std = float(np.std(data, ddof=1)) if n > 1 else 0.0
+    q1, median, q3 = (float(q) for q in np.percentile(data, [25, 50, 75]))
+    if n > 1 and std > 0:
+        half_width = float(stats.t.ppf(0.975, n - 1) * std / np.sqrt(n))
+    else:
+        half_width = 0.0
+
+    return {
+        'n': n,
+        'mean': mean,
+        'std': std,
+        'min': float(np.min(data)),
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'max': float(np.max(data)),
+        'iqr': q3 - q1,
+        'ci95_low': mean - half_width,
+        'ci95_high': mean + half_width,
+    }